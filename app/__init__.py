@@ -1,20 +1,40 @@
 import os
+import threading
 from app.config import Config
 from app.utils.logging_setup import setup_logging
 from app.database import init_db
+from app.utils.metrics import start_metrics_server
+
+_initialized = False
+_init_lock = threading.Lock()
 
 # Ensure necessary directories exist
 def init_app():
-    """Initialize application by creating required directories and database"""
-    # Create directories if they don't exist
-    os.makedirs(os.path.dirname(Config.DATABASE_PATH), exist_ok=True)
-    os.makedirs(Config.LOG_DIR, exist_ok=True)
-    
-    # Initialize logging
-    setup_logging()
-    
-    # Initialize database
-    init_db()
-
-# Initialize the application when imported
-init_app() 
\ No newline at end of file
+    """Initialize application by creating required directories and database
+
+    Entry points call it at start-up, from code that only runs in the main
+    process: the worker processes of process pools import the app package
+    (and re-run the entry script as __mp_main__) without initializing it.
+    Only the first call in a process does anything.
+    """
+    global _initialized
+
+    with _init_lock:
+        if _initialized:
+            return
+
+        # Create directories if they don't exist
+        os.makedirs(os.path.dirname(Config.DATABASE_PATH), exist_ok=True)
+        os.makedirs(Config.LOG_DIR, exist_ok=True)
+
+        # Initialize logging
+        setup_logging()
+
+        # Initialize database
+        init_db()
+
+        # Start the Prometheus metrics endpoint if enabled
+        if Config.APP.METRICS_ENABLED:
+            start_metrics_server()
+
+        _initialized = True
\ No newline at end of file
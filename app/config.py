@@ -17,9 +17,15 @@ class DatabaseConfig:
     # SQLite specific
     SQLITE_PATH = os.path.join(BASE_DIR, "data", DB_NAME)
     
-    # Table names
+    # Write-ahead logging lets readers keep using the last committed state
+    # while an import transaction is open
+    JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+    
+    # Table names (views over the store tables, see app.repositories.dimensions)
     ESG_TABLE = "esg_data"
     SHARIAH_TABLE = "shariah_datafeed"
+    ESG_STORE_TABLE = "esg_data_store"
+    SHARIAH_STORE_TABLE = "shariah_datafeed_store"
     
     @classmethod
     def get_connection_string(cls):
@@ -43,7 +49,56 @@ class AppConfig:
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE = os.path.join(BASE_DIR, "logs", "app.log")
+    LOG_FILE = os.getenv("LOG_FILE", os.path.join(BASE_DIR, "logs", "app.log"))
+
+    # Prometheus metrics endpoint (served from a background thread)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").lower() in ("true", "1", "t")
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
+    # Worker processes for multi-sheet workbook parsing (0 = one per CPU)
+    WORKBOOK_MAX_WORKERS = int(os.getenv("WORKBOOK_MAX_WORKERS", "0"))
+
+    # Parsed uploads kept in memory (by file hash) across page reruns, and rows shown in previews
+    UPLOAD_CACHE_ENTRIES = int(os.getenv("UPLOAD_CACHE_ENTRIES", "4"))
+    PREVIEW_ROWS = int(os.getenv("PREVIEW_ROWS", "20"))
+
+    # Background import jobs
+    IMPORT_JOBS_DIR = os.getenv("IMPORT_JOBS_DIR", os.path.join(BASE_DIR, "data", "import_jobs"))
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+    IMPORT_JOB_POLL_SECONDS = float(os.getenv("IMPORT_JOB_POLL_SECONDS", "1.0"))
+    # A running job without progress for this long is treated as interrupted and requeued
+    IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "120"))
+
+    # Drop-folder ingestion daemon (ingest.py): files are read from <INGEST_DIR>/esg and
+    # <INGEST_DIR>/shariah and moved to <INGEST_DIR>/archive or <INGEST_DIR>/quarantine
+    INGEST_DIR = os.getenv("INGEST_DIR", os.path.join(BASE_DIR, "data", "inbox"))
+    INGEST_MODE = os.getenv("INGEST_MODE", "upsert")
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+    INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", "10"))
+    # Files modified more recently than this are assumed to still be being written
+    INGEST_SETTLE_SECONDS = float(os.getenv("INGEST_SETTLE_SECONDS", "5"))
+
+    # Similarity (0-1) at which two client names are proposed as variants of one client
+    CLIENT_MATCH_THRESHOLD = float(os.getenv("CLIENT_MATCH_THRESHOLD", "0.85"))
+
+    # AAOIFI-style screening limits: debt and cash over market cap, impermissible income over revenue
+    SCREEN_DEBT_LIMIT = float(os.getenv("SCREEN_DEBT_LIMIT", "0.30"))
+    SCREEN_CASH_LIMIT = float(os.getenv("SCREEN_CASH_LIMIT", "0.30"))
+    SCREEN_INCOME_LIMIT = float(os.getenv("SCREEN_INCOME_LIMIT", "0.05"))
+
+    # Client delivery files: output folder, format (csv or xlsx) and worker processes (0 = one per CPU)
+    DELIVERY_DIR = os.getenv("DELIVERY_DIR", os.path.join(BASE_DIR, "data", "deliveries"))
+    DELIVERY_FORMAT = os.getenv("DELIVERY_FORMAT", "csv")
+    DELIVERY_MAX_WORKERS = int(os.getenv("DELIVERY_MAX_WORKERS", "0"))
+
+    # Days ahead the delivery calendar is planned for
+    CALENDAR_HORIZON_DAYS = int(os.getenv("CALENDAR_HORIZON_DAYS", "365"))
+
+    # Import error reports: rows shown inline, where full reports are spilled and for how long
+    ERROR_SAMPLE_SIZE = int(os.getenv("ERROR_SAMPLE_SIZE", "20"))
+    ERROR_REPORTS_DIR = os.getenv("ERROR_REPORTS_DIR", os.path.join(BASE_DIR, "data", "error_reports"))
+    ERROR_REPORT_RETENTION_DAYS = int(os.getenv("ERROR_REPORT_RETENTION_DAYS", "7"))
 
 # Load environment variables from .env file if it exists
 try:
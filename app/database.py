@@ -2,6 +2,14 @@ import sqlite3
 import os
 import logging
 from app.config import Config
+from app.utils.metrics import connection_factory
+from app.repositories.upsert import ensure_upsert_schema, backfill_fingerprints
+from app.repositories.clients import ensure_client_schema, backfill_client_ids
+from app.repositories.dimensions import ensure_dimension_tables, migrate_to_store, create_view
+from app.repositories.identifiers import purge_orphan_sets
+from app.repositories.screening import purge_orphan_runs
+from app.repositories.carbon import purge_orphan_portfolios
+from app.repositories.client_profiles import ensure_profile_triggers
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +25,7 @@ def get_connection():
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=connection_factory())
         return conn
     except sqlite3.Error as e:
         logger.error(f"Error connecting to database: {e}")
@@ -34,38 +42,48 @@ def init_db():
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # Create ESG table
+        # Persistent setting stored in the database file
+        cursor.execute(f"PRAGMA journal_mode={Config.DB.JOURNAL_MODE}")
+        
+        # Lookup tables of the enumerated columns, which the store tables hold as integer keys
+        ensure_dimension_tables(conn)
+        
+        # Tables created by older versions keep the values as text: move them to the store tables
+        for table in (Config.DB.ESG_TABLE, Config.DB.SHARIAH_TABLE):
+            migrate_to_store(conn, table)
+        
+        # Create ESG store table
         cursor.execute(f'''
-            CREATE TABLE IF NOT EXISTS {Config.DB.ESG_TABLE} (
+            CREATE TABLE IF NOT EXISTS {Config.DB.ESG_STORE_TABLE} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 client TEXT NOT NULL,
                 fields TEXT NOT NULL,
-                data_type TEXT,
-                data_source TEXT,
+                data_type_id INTEGER REFERENCES dim_data_type (id),
+                data_source_id INTEGER REFERENCES dim_data_source (id),
                 sedol_count INTEGER,
                 isin_count INTEGER,
                 cusip_count INTEGER,
-                compliance TEXT,
+                compliance_id INTEGER REFERENCES dim_compliance (id),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
-        # Create Shariah DataFeed table
+        # Create Shariah DataFeed store table
         cursor.execute(f'''
-            CREATE TABLE IF NOT EXISTS {Config.DB.SHARIAH_TABLE} (
+            CREATE TABLE IF NOT EXISTS {Config.DB.SHARIAH_STORE_TABLE} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 client TEXT NOT NULL,
                 fields TEXT,
-                data_type TEXT,
-                data_source TEXT,
+                data_type_id INTEGER REFERENCES dim_data_type (id),
+                data_source_id INTEGER REFERENCES dim_data_source (id),
                 sedol_count INTEGER,
                 isin_count INTEGER,
                 cusip_count INTEGER,
-                compliance TEXT,
-                frequency TEXT,
-                current_source TEXT,
-                after_migration TEXT,
+                compliance_id INTEGER REFERENCES dim_compliance (id),
+                frequency_id INTEGER REFERENCES dim_frequency (id),
+                current_source_id INTEGER REFERENCES dim_current_source (id),
+                after_migration_id INTEGER REFERENCES dim_after_migration (id),
                 delivery_name TEXT, 
                 universe TEXT,
                 universe_count INTEGER,
@@ -75,6 +93,255 @@ def init_db():
             )
         ''')
         
+        # Client dimension: one row per client, with every spelling variant of its
+        # name under its normalized key (see app.repositories.clients)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS clients (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS client_names (
+                name_key TEXT PRIMARY KEY,
+                client_id INTEGER NOT NULL REFERENCES clients (id),
+                name TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_client_names_client ON client_names (client_id)")
+        
+        # Version of the client names, raised by every added or merged name (read by the typeahead)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS client_names_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO client_names_version (id, version) VALUES (1, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS client_names_{event.lower()}_version AFTER {event} ON client_names
+                BEGIN UPDATE client_names_version SET version = version + 1 WHERE id = 1; END
+            ''')
+        
+        # Background import jobs (progress and checkpoint per job)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS import_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dataset TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                file_name TEXT,
+                payload_path TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                total_rows INTEGER NOT NULL DEFAULT 0,
+                rows_processed INTEGER NOT NULL DEFAULT 0,
+                checkpoint_offset INTEGER NOT NULL DEFAULT 0,
+                records_added INTEGER NOT NULL DEFAULT 0,
+                records_updated INTEGER NOT NULL DEFAULT 0,
+                records_unchanged INTEGER NOT NULL DEFAULT 0,
+                records_deleted INTEGER NOT NULL DEFAULT 0,
+                records_skipped INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                error_report TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_import_jobs_status ON import_jobs (status, id)")
+        # Files picked up by the drop-folder ingestion daemon (deduplicated by content hash)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ingested_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                dataset TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                status TEXT NOT NULL,
+                records_added INTEGER NOT NULL DEFAULT 0,
+                records_updated INTEGER NOT NULL DEFAULT 0,
+                records_unchanged INTEGER NOT NULL DEFAULT 0,
+                records_skipped INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                error_report TEXT,
+                moved_to TEXT,
+                seconds REAL,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ingested_files_hash ON ingested_files (content_hash, status)")
+        # Identifiers delivered per record and type, as sorted int64 codes
+        # (see app.repositories.identifiers); the records' counts are derived from them
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS identifier_sets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                record_id INTEGER NOT NULL,
+                id_type TEXT NOT NULL,
+                identifier_count INTEGER NOT NULL,
+                codes BLOB NOT NULL,
+                file_name TEXT,
+                version INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (table_name, record_id, id_type)
+            )
+        ''')
+        # Shariah screening runs per delivery and the per-security results of
+        # each delivery's latest run (see app.repositories.screening)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS screening_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                record_id INTEGER NOT NULL,
+                file_name TEXT,
+                securities INTEGER NOT NULL,
+                passed INTEGER NOT NULL,
+                failed INTEGER NOT NULL,
+                no_data INTEGER NOT NULL,
+                debt_limit REAL NOT NULL,
+                cash_limit REAL NOT NULL,
+                income_limit REAL NOT NULL,
+                seconds REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_screening_runs_record ON screening_runs (record_id, id)")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS screening_results (
+                run_id INTEGER NOT NULL,
+                identifier TEXT NOT NULL,
+                debt_ratio REAL,
+                cash_ratio REAL,
+                income_ratio REAL,
+                purification_ratio REAL,
+                debt_pass INTEGER,
+                cash_pass INTEGER,
+                income_pass INTEGER,
+                status TEXT NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_screening_results_run ON screening_results (run_id)")
+        # Issuer emissions and the holdings of ESG client portfolios (see app.repositories.carbon)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS issuer_emissions (
+                identifier TEXT PRIMARY KEY,
+                scope1_emissions REAL,
+                scope2_emissions REAL,
+                revenue REAL,
+                evic REAL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS emissions_uploads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_name TEXT,
+                issuers INTEGER NOT NULL,
+                uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS portfolios (
+                record_id INTEGER PRIMARY KEY,
+                file_name TEXT,
+                holdings INTEGER NOT NULL,
+                market_value REAL,
+                version INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS portfolio_holdings (
+                record_id INTEGER NOT NULL,
+                identifier TEXT NOT NULL,
+                market_value REAL
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_holdings_record ON portfolio_holdings (record_id)")
+        # Delivery file build runs and the outcome per delivery (see app.repositories.deliveries)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivery_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_format TEXT NOT NULL,
+                output_dir TEXT NOT NULL,
+                workers INTEGER,
+                built INTEGER,
+                skipped INTEGER,
+                failed INTEGER,
+                seconds REAL,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivery_builds (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                record_id INTEGER NOT NULL,
+                client TEXT,
+                delivery_name TEXT,
+                status TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                file_path TEXT,
+                rows INTEGER,
+                columns INTEGER,
+                missing_fields TEXT,
+                seconds REAL,
+                error TEXT
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_delivery_builds_record ON delivery_builds (record_id, status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_delivery_builds_run ON delivery_builds (run_id)")
+        # Scheduled Shariah deliveries over the planning horizon (see app.repositories.delivery_calendar)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivery_calendar (
+                record_id INTEGER NOT NULL,
+                delivery_date TEXT NOT NULL,
+                current_source TEXT,
+                planned_source TEXT,
+                universe_count INTEGER
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_delivery_calendar_date ON delivery_calendar (delivery_date)")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS delivery_calendar_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                inputs_hash TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Materialized client profiles (JSON), marked stale by triggers on the store tables
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS client_profiles (
+                client_id INTEGER PRIMARY KEY,
+                profile TEXT NOT NULL,
+                stale INTEGER NOT NULL DEFAULT 0,
+                built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Summary of the rejected rows (JSON), added after the table was introduced
+        job_columns = {row[1] for row in cursor.execute("PRAGMA table_info(import_jobs)")}
+        if 'error_report' not in job_columns:
+            cursor.execute("ALTER TABLE import_jobs ADD COLUMN error_report TEXT")
+        
+        # Natural keys, content hashes and client IDs (migrates existing databases),
+        # then the views the rest of the application reads the datasets through
+        for table in (Config.DB.ESG_TABLE, Config.DB.SHARIAH_TABLE):
+            ensure_upsert_schema(conn, table)
+            ensure_client_schema(conn, table)
+            create_view(conn, table)
+            backfill_fingerprints(conn, table)
+            backfill_client_ids(conn, table)
+            ensure_profile_triggers(conn, table)
+            purge_orphan_sets(conn, table)
+        purge_orphan_runs(conn)
+        purge_orphan_portfolios(conn)
+        
         conn.commit()
         logger.info("Database initialized successfully")
     except sqlite3.Error as e:
@@ -121,6 +388,8 @@ def load_sample_esg_data():
             INSERT INTO {Config.DB.ESG_TABLE} (client, fields, data_type, data_source, sedol_count, isin_count, cusip_count, compliance)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, esg_data)
+        backfill_fingerprints(conn, Config.DB.ESG_TABLE)
+        backfill_client_ids(conn, Config.DB.ESG_TABLE)
         conn.commit()
         logger.info(f"Added {len(esg_data)} sample ESG records")
         
@@ -158,6 +427,8 @@ def load_sample_shariah_data():
             INSERT INTO {Config.DB.SHARIAH_TABLE} (client, current_source, after_migration, delivery_name, fields, universe, universe_count, frequency, migration_plan, sedol_count, isin_count, cusip_count)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, shariah_data)
+        backfill_fingerprints(conn, Config.DB.SHARIAH_TABLE)
+        backfill_client_ids(conn, Config.DB.SHARIAH_TABLE)
         conn.commit()
         logger.info(f"Added {len(shariah_data)} sample Shariah records")
         
@@ -15,10 +15,14 @@ if not logger.handlers:
     )
 
 # Local imports
+from app import init_app
 from app.ui.pages.dashboard_page import render_dashboard_page
 from app.ui.pages.view_page import render_view_page
+from app.ui.pages.client_page import render_client_page
 from app.ui.pages.inputs_page import render_inputs_page
 from app.auth.auth import login_required, logout
+from app.utils.metrics import PAGE_RENDER_SECONDS, PAGE_RENDER_ERRORS
+from app.services.import_jobs import start_import_worker
 
 # Streamlit logging level
 logging.getLogger("streamlit").setLevel(logging.WARNING)
@@ -45,6 +49,12 @@ st.markdown("""
 def main():
     """Main application entry point"""
     
+    # Logging and the database (once per process)
+    init_app()
+    
+    # Background imports run (and resume after a restart) independently of sessions
+    start_import_worker()
+    
     # Check if user is logged in, if not, show login form and exit
     if not login_required():
         return
@@ -57,6 +67,7 @@ def main():
     pages = {
         "Dashboard": render_dashboard_page,
         "View Data": render_view_page,
+        "Client 360": render_client_page,
         "Input Data": render_inputs_page
     }
     
@@ -73,8 +84,10 @@ def main():
     
     # Render the selected page
     try:
-        pages[selection]()
+        with PAGE_RENDER_SECONDS.time(page=selection):
+            pages[selection]()
     except Exception as e:
+        PAGE_RENDER_ERRORS.inc(page=selection)
         st.error(f"Error rendering page: {str(e)}")
         logger.exception("Error rendering page")
 
@@ -0,0 +1,225 @@
+import gc
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Tuple, Type, TypeVar
+
+from app.models.schema import INTEGER, COUNT, TOTAL
+
+M = TypeVar("M", bound="Model")
+
+# Schema kinds coerced to int by the converters
+_INTEGER_KINDS = (INTEGER, COUNT, TOTAL)
+
+# Marker for fields without a default (required constructor arguments)
+_REQUIRED = object()
+
+
+def _to_int(value: Any, default: Any) -> Any:
+    """Convert a scalar to int, falling back to the field default"""
+    if value is None or pd.isna(value):  # None, NaN, NA or NaT
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
+        return default
+
+
+def _to_object(value: Any, default: Any) -> Any:
+    """Pass a scalar through, using the field default for NaN, NA or NaT"""
+    if value is not None and pd.isna(value):
+        return default
+    return value
+
+
+def _int_column(series: pd.Series, default: Any) -> List[Any]:
+    """Convert a whole column to Python ints, using the default for missing/invalid values"""
+    numeric = pd.to_numeric(series, errors="coerce")
+    missing = numeric.isna().to_numpy()
+    values = np.trunc(numeric.to_numpy(dtype="float64", na_value=np.nan))
+    if not missing.any():
+        return values.astype(np.int64).tolist()
+    result = np.where(missing, 0, values).astype(np.int64).astype(object)
+    result[missing] = default
+    return result.tolist()
+
+
+def _object_column(series: pd.Series, default: Any) -> List[Any]:
+    """Convert a whole column to Python objects, using the default for missing values"""
+    values = series.astype(object)
+    return values.where(values.notna(), default).tolist()
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while building a batch of models
+
+    Models hold no reference cycles, but every allocation counts towards a
+    collection, so large batches would otherwise trigger repeated full scans
+    of the growing result list.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class Model:
+    """Base class for compact record models
+
+    Subclasses declare their fields through ``__slots__`` (in constructor
+    order), the column schema that types them and the defaults of optional
+    fields. ``__init__``, ``from_dict`` and ``to_dict`` are compiled once per
+    class from that declaration, so no per-instance loops or ``asdict`` deep
+    copies are involved.
+    """
+
+    __slots__ = ()
+
+    # Declared by subclasses
+    _columns: Dict[str, str] = {}
+    _defaults: Dict[str, Any] = {}
+    _drop_none = False
+
+    # Compiled by __init_subclass__
+    _fields: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(cls.__slots__)
+        cls._compile()
+
+    @classmethod
+    def _field_default(cls, name: str) -> Any:
+        """Get the default of a field (_REQUIRED if it has none)"""
+        return cls._defaults.get(name, _REQUIRED)
+
+    @classmethod
+    def _compile(cls):
+        """Generate the constructor and converters for the declared fields"""
+        names = cls._fields
+        namespace: Dict[str, Any] = {"_to_int": _to_int, "_to_object": _to_object, "_new": object.__new__, "_cls": cls}
+
+        # __init__(self, client, fields, data_type=_d_data_type, ...)
+        params = []
+        for name in names:
+            default = cls._field_default(name)
+            if default is _REQUIRED:
+                params.append(name)
+            else:
+                namespace[f"_d_{name}"] = default
+                params.append(f"{name}=_d_{name}")
+        body = [f"    self.{name} = {name}" for name in names] or ["    pass"]
+        source = [f"def __init__(self, {', '.join(params)}):"] + body
+
+        # from_dict(data): one attribute assignment per field, no loops over the schema
+        source.append("def from_dict(data):")
+        source.append("    get = data.get")
+        source.append("    obj = _new(_cls)")
+        for name in names:
+            default = cls._field_default(name)
+            # Required text fields fall back to '' like the previous dataclass converters
+            fallback = f"_d_{name}" if default is not _REQUIRED else "''"
+            if cls._columns.get(name) in _INTEGER_KINDS:
+                # Values that already are ints skip the converter call
+                source.append(f"    value = get('{name}')")
+                source.append(f"    obj.{name} = value if value.__class__ is int else _to_int(value, {fallback})")
+            else:
+                # Missing values of typed frames' records (NaN, NA) become the default
+                source.append(f"    value = get('{name}', {fallback})")
+                source.append(f"    obj.{name} = value if value.__class__ is str else _to_object(value, {fallback})")
+        source.append("    return obj")
+
+        # to_dict(self)
+        items = ", ".join(f"'{name}': self.{name}" for name in names)
+        source.append("def to_dict(self):")
+        source.append(f"    return {{{items}}}")
+
+        exec("\n".join(source), namespace)
+
+        cls.__init__ = namespace["__init__"]
+        cls._from_dict = staticmethod(namespace["from_dict"])
+        cls._to_dict = namespace["to_dict"]
+
+    @classmethod
+    def from_dict(cls: Type[M], data: Dict[str, Any]) -> M:
+        """Create an instance from a dictionary (the input is not modified)
+
+        Args:
+            data: Field values keyed by name; unknown keys are ignored
+
+        Returns:
+            Model instance
+        """
+        return cls._from_dict(data)
+
+    @classmethod
+    def from_frame(cls: Type[M], df: pd.DataFrame) -> List[M]:
+        """Create instances from a DataFrame, coercing whole columns at once
+
+        Args:
+            df: DataFrame with columns named after the fields
+
+        Returns:
+            List of model instances in row order
+        """
+        n = len(df)
+        if n == 0:
+            return []
+
+        columns = []
+        for name in cls._fields:
+            default = cls._field_default(name)
+            if default is _REQUIRED:
+                default = ''
+            if name not in df.columns:
+                columns.append([default] * n)
+            elif cls._columns.get(name) in _INTEGER_KINDS:
+                columns.append(_int_column(df[name], default))
+            else:
+                columns.append(_object_column(df[name], default))
+
+        with _gc_paused():
+            return list(map(cls, *columns))
+
+    @classmethod
+    def from_records(cls: Type[M], records: Iterable[Dict[str, Any]]) -> List[M]:
+        """Create instances from an iterable of dictionaries
+
+        Uses the compiled per-class converter; building a DataFrame first
+        would cost more than the conversion itself.
+
+        Args:
+            records: Dictionaries keyed by field name (not modified)
+
+        Returns:
+            List of model instances in input order
+        """
+        from_dict = cls._from_dict
+        with _gc_paused():
+            return [from_dict(record) for record in records]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        data = self._to_dict()
+        if self._drop_none:
+            return {k: v for k, v in data.items() if v is not None}
+        return data
+
+    def astuple(self) -> Tuple[Any, ...]:
+        """Field values in declaration order"""
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{self.__class__.__name__}({values})"
\ No newline at end of file
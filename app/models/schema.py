@@ -0,0 +1,91 @@
+from typing import Dict, Tuple
+
+# Column kinds. Every loaded column is described once here; the DataFrame
+# dtype policy and the model converters are both derived from these maps.
+INTEGER = "integer"       # non-null integer (primary keys, row counts)
+COUNT = "count"           # nullable per-record identifier counts
+TOTAL = "total"           # nullable aggregated sums of counts
+ENUM = "enum"             # low-cardinality text (sources, statuses, frequencies)
+TEXT = "text"             # free text
+TIMESTAMP = "timestamp"   # SQLite timestamp text
+
+ESG_COLUMNS: Dict[str, str] = {
+    'id': INTEGER,
+    'client': TEXT,
+    'fields': TEXT,
+    'data_type': ENUM,
+    'data_source': ENUM,
+    'sedol_count': COUNT,
+    'isin_count': COUNT,
+    'cusip_count': COUNT,
+    'compliance': ENUM,
+    'created_at': TIMESTAMP,
+    'updated_at': TIMESTAMP
+}
+
+SHARIAH_COLUMNS: Dict[str, str] = {
+    'id': INTEGER,
+    'client': TEXT,
+    'fields': TEXT,
+    'data_type': ENUM,
+    'data_source': ENUM,
+    'sedol_count': COUNT,
+    'isin_count': COUNT,
+    'cusip_count': COUNT,
+    'compliance': ENUM,
+    'frequency': ENUM,
+    'current_source': ENUM,
+    'after_migration': ENUM,
+    'delivery_name': TEXT,
+    'universe': TEXT,
+    'universe_count': COUNT,
+    'migration_plan': TEXT,
+    'created_at': TIMESTAMP,
+    'updated_at': TIMESTAMP
+}
+
+ESG_AGGREGATED_COLUMNS: Dict[str, str] = {
+    'client': TEXT,
+    'fields': TEXT,
+    'data_types': TEXT,
+    'data_sources': TEXT,
+    'total_sedol_count': TOTAL,
+    'total_isin_count': TOTAL,
+    'total_cusip_count': TOTAL,
+    'compliance_status': TEXT,
+    'record_count': INTEGER
+}
+
+SHARIAH_AGGREGATED_COLUMNS: Dict[str, str] = {
+    'client': TEXT,
+    'sources': TEXT,
+    'fields': TEXT,
+    'universe': TEXT,
+    'total_universe_count': TOTAL,
+    'total_sedol_count': TOTAL,
+    'total_isin_count': TOTAL,
+    'total_cusip_count': TOTAL,
+    'frequencies': TEXT,
+    'record_count': INTEGER
+}
+
+# Natural keys: the columns identifying the same record across imports
+ESG_NATURAL_KEY = ('client', 'fields', 'data_source')
+SHARIAH_NATURAL_KEY = ('client', 'delivery_name')
+
+# Import validation: fields every record needs and the values accepted for
+# enumerated columns (matched case-insensitively, stored in this spelling)
+ESG_REQUIRED = ('client', 'fields')
+SHARIAH_REQUIRED = ('client',)
+
+COMPLIANCE_VALUES = ('Yes', 'No', 'Pass', 'Fail', 'Compliant', 'Non-Compliant', 'Partial', 'Pending', 'Unknown')
+FREQUENCY_VALUES = ('Daily', 'Weekly', 'Monthly', 'Quarterly', 'Semi-Annually', 'Annually')
+
+ESG_ALLOWED_VALUES: Dict[str, Tuple[str, ...]] = {
+    'compliance': COMPLIANCE_VALUES
+}
+
+SHARIAH_ALLOWED_VALUES: Dict[str, Tuple[str, ...]] = {
+    'compliance': COMPLIANCE_VALUES,
+    'frequency': FREQUENCY_VALUES
+}
\ No newline at end of file
@@ -0,0 +1,154 @@
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional
+
+from app.config import Config
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# Issuer emissions are one shared dataset, upserted by identifier; every
+# upload is logged in emissions_uploads and the highest upload ID is the
+# dataset's version. Holdings are stored per ESG record (the client portfolio
+# the delivery covers); portfolios.version changes whenever they are replaced.
+
+ISSUER_COLUMNS = ['identifier', 'scope1_emissions', 'scope2_emissions', 'revenue', 'evic']
+
+
+def save_issuer_emissions(conn: sqlite3.Connection, issuers: pd.DataFrame, file_name: Optional[str] = None) -> int:
+    """Add or update issuer emissions and log the upload
+
+    Args:
+        conn: Database connection (the caller commits)
+        issuers: ISSUER_COLUMNS with normalized identifiers and float values
+        file_name: File the emissions were uploaded from
+
+    Returns:
+        int: ID of the upload (the new version of the dataset)
+    """
+    rows = issuers[ISSUER_COLUMNS].astype(object).where(issuers[ISSUER_COLUMNS].notna(), None)
+    conn.executemany("""
+        INSERT INTO issuer_emissions (identifier, scope1_emissions, scope2_emissions, revenue, evic)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (identifier) DO UPDATE SET
+            scope1_emissions = excluded.scope1_emissions,
+            scope2_emissions = excluded.scope2_emissions,
+            revenue = excluded.revenue,
+            evic = excluded.evic,
+            updated_at = CURRENT_TIMESTAMP
+    """, rows.itertuples(index=False, name=None))
+    return conn.execute("INSERT INTO emissions_uploads (file_name, issuers) VALUES (?, ?)",
+                        (file_name, len(issuers))).lastrowid
+
+
+def load_issuer_emissions(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get the issuer emissions dataset
+
+    Returns:
+        pd.DataFrame: ISSUER_COLUMNS, one row per issuer
+    """
+    return pd.read_sql(f"SELECT {', '.join(ISSUER_COLUMNS)} FROM issuer_emissions", conn)
+
+
+def emissions_version(conn: sqlite3.Connection) -> int:
+    """Get the version of the issuer emissions (0 before the first upload)"""
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM emissions_uploads").fetchone()[0]
+
+
+def emissions_summary(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Describe the issuer emissions dataset
+
+    Returns:
+        Dict[str, Any]: issuers, uploads and the file_name and uploaded_at of the last upload
+    """
+    issuers = conn.execute("SELECT COUNT(*) FROM issuer_emissions").fetchone()[0]
+    uploads, file_name, uploaded_at = conn.execute("""
+        SELECT (SELECT COUNT(*) FROM emissions_uploads), file_name, uploaded_at
+        FROM emissions_uploads ORDER BY id DESC LIMIT 1
+    """).fetchone() or (0, None, None)
+    return {"issuers": issuers, "uploads": uploads, "file_name": file_name, "uploaded_at": uploaded_at}
+
+
+def save_holdings(conn: sqlite3.Connection, record_id: int, identifiers: np.ndarray,
+                  market_values: np.ndarray, file_name: Optional[str] = None) -> int:
+    """Store (or replace) the holdings of a portfolio
+
+    Args:
+        conn: Database connection (the caller commits)
+        record_id: ESG record (delivery) the portfolio belongs to
+        identifiers: Normalized identifier of each holding
+        market_values: Value of each holding (NaN where unknown)
+        file_name: File the holdings were uploaded from
+
+    Returns:
+        int: Number of holdings stored
+    """
+    record_id = int(record_id)
+    conn.execute("DELETE FROM portfolio_holdings WHERE record_id = ?", (record_id,))
+    values = [None if np.isnan(value) else float(value) for value in market_values]
+    conn.executemany("INSERT INTO portfolio_holdings (record_id, identifier, market_value) VALUES (?, ?, ?)",
+                     zip([record_id] * len(identifiers), identifiers.tolist(), values))
+    conn.execute("""
+        INSERT INTO portfolios (record_id, file_name, holdings, market_value, version)
+        VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(version), 0) + 1 FROM portfolios))
+        ON CONFLICT (record_id) DO UPDATE SET
+            file_name = excluded.file_name,
+            holdings = excluded.holdings,
+            market_value = excluded.market_value,
+            version = excluded.version,
+            updated_at = CURRENT_TIMESTAMP
+    """, (record_id, file_name, len(identifiers), float(np.nansum(market_values))))
+    return len(identifiers)
+
+
+def list_portfolios(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get the portfolios of existing ESG records
+
+    Returns:
+        pd.DataFrame: record_id, client, data_source, file_name, holdings,
+        market_value, version and updated_at, by record
+    """
+    store = store_table(Config.DB.ESG_TABLE)
+    return pd.read_sql(f"""
+        SELECT p.record_id, t.client, t.data_source, p.file_name, p.holdings, p.market_value,
+               p.version, p.updated_at
+        FROM portfolios p
+        JOIN {Config.DB.ESG_TABLE} t ON t.id = p.record_id
+        WHERE p.record_id IN (SELECT id FROM {store})
+        ORDER BY p.record_id
+    """, conn)
+
+
+def load_holdings(conn: sqlite3.Connection, record_ids: Iterable[int]) -> pd.DataFrame:
+    """Get the holdings of some portfolios
+
+    Returns:
+        pd.DataFrame: record_id, identifier and market_value, by record
+    """
+    record_ids = [int(record_id) for record_id in record_ids]
+    if not record_ids:
+        return pd.DataFrame(columns=['record_id', 'identifier', 'market_value'])
+    return pd.read_sql(f"""
+        SELECT record_id, identifier, market_value FROM portfolio_holdings
+        WHERE record_id IN ({', '.join(['?'] * len(record_ids))})
+        ORDER BY record_id
+    """, conn, params=record_ids)
+
+
+def purge_orphan_portfolios(conn: sqlite3.Connection) -> int:
+    """Delete the portfolios (and holdings) of ESG records that no longer exist
+
+    Args:
+        conn: Database connection (the caller commits)
+
+    Returns:
+        int: Number of portfolios deleted
+    """
+    store = store_table(Config.DB.ESG_TABLE)
+    conn.execute(f"DELETE FROM portfolio_holdings WHERE record_id NOT IN (SELECT id FROM {store})")
+    deleted = conn.execute(f"DELETE FROM portfolios WHERE record_id NOT IN (SELECT id FROM {store})").rowcount
+    if deleted:
+        logger.info(f"Deleted {deleted} portfolios of removed ESG records")
+    return deleted
\ No newline at end of file
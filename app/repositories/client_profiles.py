@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import logging
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.repositories.clients import CLIENT_TABLES
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# client_profiles holds one JSON document per client (see
+# app.utils.profiles.build_profiles()). Triggers on the store tables mark
+# the profiles of the clients a write touches as stale in the same
+# transaction; stale or missing profiles are rebuilt when next read. The
+# migration statuses in a profile depend on the day it was built, so a
+# profile built before today (UTC, like numpy's 'today') is outdated too.
+_OUTDATED = "stale = 1 OR built_at IS NULL OR date(built_at) < date('now')"
+
+# Clients looked up per query (below SQLite's bound parameter limit)
+_LOOKUP_BATCH = 500
+
+
+def ensure_profile_triggers(conn: sqlite3.Connection, table: str):
+    """Create the triggers that mark client profiles stale on every write to a dataset
+
+    Args:
+        conn: Database connection
+        table: Dataset table name (the triggers are on its store table)
+    """
+    store = store_table(table)
+    stale = "UPDATE client_profiles SET stale = 1 WHERE client_id"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {store}_profile_insert AFTER INSERT ON {store}
+        WHEN NEW.client_id IS NOT NULL
+        BEGIN {stale} = NEW.client_id; END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {store}_profile_update AFTER UPDATE ON {store}
+        BEGIN {stale} IN (OLD.client_id, NEW.client_id); END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {store}_profile_delete AFTER DELETE ON {store}
+        WHEN OLD.client_id IS NOT NULL
+        BEGIN {stale} = OLD.client_id; END
+    """)
+
+
+def load_profile(conn: sqlite3.Connection, client_id: int) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """Get the stored profile of a client
+
+    Returns:
+        Optional[Tuple[Dict[str, Any], bool]]: The profile and whether it is
+        stale or was built before today (None if never built)
+    """
+    row = conn.execute(
+        f"SELECT profile, {_OUTDATED} FROM client_profiles WHERE client_id = ?", (int(client_id),)
+    ).fetchone()
+    return (json.loads(row[0]), bool(row[1])) if row else None
+
+
+def stale_profile_ids(conn: sqlite3.Connection) -> List[int]:
+    """Get the clients whose stored profile is stale or was built before today"""
+    return [row[0] for row in conn.execute(f"SELECT client_id FROM client_profiles WHERE {_OUTDATED} ORDER BY client_id")]
+
+
+def profile_inputs(conn: sqlite3.Connection, client_ids: Iterable[int]) -> Tuple[pd.DataFrame, ...]:
+    """Read what the profiles of clients are built from, one query per table
+
+    Args:
+        conn: Database connection
+        client_ids: Client IDs (looked up _LOOKUP_BATCH at a time)
+
+    Returns:
+        Tuple of the clients (client_id, name, variant), their ESG records
+        and their Shariah records (view columns, over the client_id index)
+    """
+    client_ids = [int(client_id) for client_id in client_ids]
+    frames: List[List[pd.DataFrame]] = [[] for _ in range(1 + len(CLIENT_TABLES))]
+    for start in range(0, len(client_ids), _LOOKUP_BATCH):
+        batch = client_ids[start:start + _LOOKUP_BATCH]
+        placeholders = ', '.join(['?'] * len(batch))
+        frames[0].append(pd.read_sql(f"""
+            SELECT c.id AS client_id, c.name, n.name AS variant
+            FROM clients c LEFT JOIN client_names n ON n.client_id = c.id
+            WHERE c.id IN ({placeholders})
+        """, conn, params=batch))
+        for position, table in enumerate(CLIENT_TABLES, start=1):
+            frames[position].append(pd.read_sql(
+                f"SELECT * FROM {table} WHERE client_id IN ({placeholders}) ORDER BY id", conn, params=batch
+            ))
+    return tuple(pd.concat(parts, ignore_index=True) for parts in frames)
+
+
+def save_profiles(conn: sqlite3.Connection, profiles: Dict[int, Dict[str, Any]], client_ids: Iterable[int]):
+    """Store the profiles of clients, dropping those of clients that no longer exist
+
+    Args:
+        conn: Database connection (the caller commits)
+        profiles: Profile by client ID
+        client_ids: Clients the profiles were built for
+    """
+    conn.executemany("""
+        INSERT INTO client_profiles (client_id, profile, stale, built_at) VALUES (?, ?, 0, CURRENT_TIMESTAMP)
+        ON CONFLICT (client_id) DO UPDATE SET
+            profile = excluded.profile, stale = 0, built_at = excluded.built_at
+    """, ((client_id, json.dumps(profile, default=str)) for client_id, profile in profiles.items()))
+    gone = [int(client_id) for client_id in client_ids if int(client_id) not in profiles]
+    if gone:
+        conn.execute(f"DELETE FROM client_profiles WHERE client_id IN ({', '.join(['?'] * len(gone))})", gone)
@@ -0,0 +1,291 @@
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Config
+from app.utils.data_helpers import client_key
+from app.utils.name_index import NameIndex
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows point at the clients table through client_id
+CLIENT_TABLES = (Config.DB.ESG_TABLE, Config.DB.SHARIAH_TABLE)
+
+# Keys looked up per query (below SQLite's bound parameter limit)
+_LOOKUP_BATCH = 500
+
+
+def name_key(name: Any) -> str:
+    """Get the key a client name is stored under in client_names
+
+    Names without letters or digits fall back to their trimmed lowercase
+    text so they still get a key of their own.
+    """
+    text = str(name).strip()
+    return client_key(text) or text.lower()
+
+
+def ensure_client_schema(conn: sqlite3.Connection, table: str):
+    """Add the client_id column and its index to a data table
+
+    Args:
+        conn: Database connection
+        table: Table name (the store table is migrated)
+    """
+    store = store_table(table)
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({store})")}
+    if 'client_id' not in existing:
+        conn.execute(f"ALTER TABLE {store} ADD COLUMN client_id INTEGER REFERENCES clients (id)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_client_id ON {store} (client_id)")
+
+
+def _known_keys(conn: sqlite3.Connection, keys: List[str]) -> Dict[str, int]:
+    """Look up the client IDs of name keys"""
+    known = {}
+    for start in range(0, len(keys), _LOOKUP_BATCH):
+        batch = keys[start:start + _LOOKUP_BATCH]
+        known.update(conn.execute(
+            f"SELECT name_key, client_id FROM client_names WHERE name_key IN ({', '.join(['?'] * len(batch))})",
+            batch
+        ).fetchall())
+    return known
+
+
+def resolve_client_ids(conn: sqlite3.Connection, names: pd.Series) -> pd.Series:
+    """Map client names to client IDs, registering new clients
+
+    Each distinct name is normalized once (pd.factorize) and looked up by
+    its key, so every spelling variant of a known client resolves to the
+    same ID. Keys seen for the first time create a client named after the
+    first spelling met.
+
+    Args:
+        conn: Database connection (the caller commits)
+        names: Client names (missing values resolve to None)
+
+    Returns:
+        pd.Series: Client IDs (object dtype, None where the name is missing),
+        same index as names
+    """
+    codes, uniques = pd.factorize(names)
+    keys = [name_key(name) for name in uniques]
+    known = _known_keys(conn, sorted(set(keys)))
+
+    for name, key in zip(uniques, keys):
+        if key in known:
+            continue
+        client_id = conn.execute("INSERT INTO clients (name) VALUES (?)", (str(name).strip(),)).lastrowid
+        conn.execute("INSERT INTO client_names (name_key, client_id, name) VALUES (?, ?, ?)",
+                     (key, client_id, str(name).strip()))
+        known[key] = client_id
+
+    # Code -1 (missing) takes the extra last slot
+    ids = np.array([known[key] for key in keys] + [None], dtype=object)
+    return pd.Series(ids[codes], index=names.index)
+
+
+def backfill_client_ids(conn: sqlite3.Connection, table: str) -> int:
+    """Resolve the client of rows written without a client_id
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Table name
+
+    Returns:
+        int: Number of rows updated
+    """
+    df = pd.read_sql(f"SELECT id, client FROM {store_table(table)} WHERE client_id IS NULL AND client IS NOT NULL", conn)
+    if df.empty:
+        return 0
+
+    client_ids = resolve_client_ids(conn, df['client'])
+    conn.executemany(f"UPDATE {store_table(table)} SET client_id = ? WHERE id = ?",
+                     zip(client_ids.tolist(), df['id'].tolist()))
+    logger.info(f"Linked {len(df)} rows in {table} to the clients table")
+    return len(df)
+
+
+def client_names_version(conn: sqlite3.Connection) -> int:
+    """Get the version of the client names
+
+    Triggers on client_names raise it whenever a name is added or moved to
+    another client (merges), so it is read in constant time.
+
+    Returns:
+        int: Version (0 before the first name)
+    """
+    row = conn.execute("SELECT version FROM client_names_version WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def client_name_keys(conn: sqlite3.Connection) -> List[Tuple[str, int, str]]:
+    """Get every name key with its client and the client's name
+
+    Returns:
+        List[Tuple[str, int, str]]: (name key, client ID, client name) rows
+    """
+    return conn.execute(
+        "SELECT n.name_key, c.id, c.name FROM client_names n JOIN clients c ON c.id = n.client_id"
+    ).fetchall()
+
+
+def build_name_index(conn: sqlite3.Connection) -> NameIndex:
+    """Build a blocking index over every known client name key
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        NameIndex: Index of name keys to client IDs
+    """
+    index = NameIndex()
+    for key, client_id in conn.execute("SELECT name_key, client_id FROM client_names"):
+        index.add(key, client_id)
+    return index
+
+
+def client_record_counts(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get every client with its number of records
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        pd.DataFrame: id, name and records (over all client tables), by id
+    """
+    counts = ' + '.join(
+        f"(SELECT COUNT(*) FROM {store} WHERE {store}.client_id = clients.id)"
+        for store in map(store_table, CLIENT_TABLES)
+    )
+    return pd.read_sql(f"SELECT id, name, {counts} AS records FROM clients ORDER BY id", conn)
+
+
+def client_cross_reference(conn: sqlite3.Connection, both_only: bool = False) -> pd.DataFrame:
+    """Get the ESG and Shariah aggregates of every client side by side
+
+    Each dataset is aggregated over its client_id index (every spelling of
+    a client's name resolves to one client_id) and the two are joined to
+    the clients table in a single query.
+
+    Args:
+        conn: Database connection
+        both_only: Only clients with records in both datasets
+
+    Returns:
+        pd.DataFrame: client_id, client, datasets ("Both", "ESG only" or
+        "Shariah only"), the records, sources and identifier counts of each
+        dataset (esg_* and shariah_* columns, plus shariah_universe_count)
+        and the combined total_isin_count, total_sedol_count and
+        total_cusip_count, by client name
+    """
+    where = ("e.client_id IS NOT NULL AND s.client_id IS NOT NULL" if both_only
+             else "e.client_id IS NOT NULL OR s.client_id IS NOT NULL")
+    return pd.read_sql(f"""
+        WITH e AS (
+            SELECT client_id, COUNT(*) AS records, GROUP_CONCAT(DISTINCT data_source) AS sources,
+                   COALESCE(SUM(isin_count), 0) AS isin_count, COALESCE(SUM(sedol_count), 0) AS sedol_count,
+                   COALESCE(SUM(cusip_count), 0) AS cusip_count
+            FROM {Config.DB.ESG_TABLE} WHERE client_id IS NOT NULL GROUP BY client_id
+        ), s AS (
+            SELECT client_id, COUNT(*) AS records, GROUP_CONCAT(DISTINCT current_source) AS sources,
+                   COALESCE(SUM(universe_count), 0) AS universe_count,
+                   COALESCE(SUM(isin_count), 0) AS isin_count, COALESCE(SUM(sedol_count), 0) AS sedol_count,
+                   COALESCE(SUM(cusip_count), 0) AS cusip_count
+            FROM {Config.DB.SHARIAH_TABLE} WHERE client_id IS NOT NULL GROUP BY client_id
+        )
+        SELECT c.id AS client_id, c.name AS client,
+               CASE WHEN e.client_id IS NULL THEN 'Shariah only'
+                    WHEN s.client_id IS NULL THEN 'ESG only' ELSE 'Both' END AS datasets,
+               COALESCE(e.records, 0) AS esg_records, COALESCE(e.sources, '') AS esg_sources,
+               COALESCE(e.isin_count, 0) AS esg_isin_count, COALESCE(e.sedol_count, 0) AS esg_sedol_count,
+               COALESCE(e.cusip_count, 0) AS esg_cusip_count,
+               COALESCE(s.records, 0) AS shariah_records, COALESCE(s.sources, '') AS shariah_sources,
+               COALESCE(s.universe_count, 0) AS shariah_universe_count,
+               COALESCE(s.isin_count, 0) AS shariah_isin_count, COALESCE(s.sedol_count, 0) AS shariah_sedol_count,
+               COALESCE(s.cusip_count, 0) AS shariah_cusip_count,
+               COALESCE(e.isin_count, 0) + COALESCE(s.isin_count, 0) AS total_isin_count,
+               COALESCE(e.sedol_count, 0) + COALESCE(s.sedol_count, 0) AS total_sedol_count,
+               COALESCE(e.cusip_count, 0) + COALESCE(s.cusip_count, 0) AS total_cusip_count
+        FROM clients c
+        LEFT JOIN e ON e.client_id = c.id
+        LEFT JOIN s ON s.client_id = c.id
+        WHERE {where}
+        ORDER BY c.name, c.id
+    """, conn)
+
+
+def find_duplicate_clients(conn: sqlite3.Connection, threshold: Optional[float] = None) -> List[pd.DataFrame]:
+    """Find groups of clients whose names look like variants of each other
+
+    Each name key is compared only with the candidates of the blocking
+    index; pairs scoring at least threshold are joined into groups
+    (transitively, so "A ~ B" and "B ~ C" form one group).
+
+    Args:
+        conn: Database connection
+        threshold: Minimum similarity (default: Config.APP.CLIENT_MATCH_THRESHOLD)
+
+    Returns:
+        List[pd.DataFrame]: One frame per group (id, name, records), the
+        client to keep first: the one with the most records, then the oldest
+    """
+    threshold = threshold if threshold is not None else Config.APP.CLIENT_MATCH_THRESHOLD
+    index = build_name_index(conn)
+
+    # Union-find over client IDs
+    parent: Dict[int, int] = {}
+
+    def root(client_id: int) -> int:
+        while parent.get(client_id, client_id) != client_id:
+            client_id = parent[client_id]
+        return client_id
+
+    for key, client_id in index.ids.items():
+        for _, other_id, _ in index.matches(key, threshold):
+            a, b = root(client_id), root(other_id)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    if not parent:
+        return []
+
+    clients = client_record_counts(conn)
+    clients['group'] = [root(client_id) for client_id in clients['id']]
+    groups = []
+    for _, group in clients[clients.duplicated('group', keep=False)].groupby('group', sort=True):
+        group = group.sort_values(['records', 'id'], ascending=[False, True])
+        groups.append(group.drop(columns='group').reset_index(drop=True))
+    return groups
+
+
+def merge_clients(conn: sqlite3.Connection, keep_id: int, merge_ids: Iterable[int]) -> int:
+    """Merge clients into one
+
+    Every name variant and record of the merged clients is moved to the
+    kept client, so later writes with those spellings resolve to it too.
+
+    Args:
+        conn: Database connection (the caller commits)
+        keep_id: Client that remains
+        merge_ids: Clients merged into it (and deleted)
+
+    Returns:
+        int: Number of records moved
+    """
+    merge_ids = [int(client_id) for client_id in merge_ids if int(client_id) != int(keep_id)]
+    if not merge_ids:
+        return 0
+
+    placeholders = ', '.join(['?'] * len(merge_ids))
+    moved = 0
+    for table in CLIENT_TABLES:
+        moved += conn.execute(
+            f"UPDATE {store_table(table)} SET client_id = ? WHERE client_id IN ({placeholders})", [keep_id] + merge_ids
+        ).rowcount
+    conn.execute(f"UPDATE client_names SET client_id = ? WHERE client_id IN ({placeholders})", [keep_id] + merge_ids)
+    conn.execute(f"DELETE FROM clients WHERE id IN ({placeholders})", merge_ids)
+    logger.info(f"Merged clients {merge_ids} into client {keep_id} ({moved} records moved)")
+    return moved
\ No newline at end of file
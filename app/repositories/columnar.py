@@ -0,0 +1,119 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Rows pulled from the cursor per fetchmany() call
+DEFAULT_BATCH_SIZE = 5000
+
+T = TypeVar("T")
+
+
+def _build_column(values: List[Any], dtype: Optional[str]) -> Any:
+    """Build a column array with the declared dtype
+
+    Args:
+        values: Column values as returned by sqlite3 (None for NULL)
+        dtype: Declared pandas dtype, or None to keep Python objects
+
+    Returns:
+        Array-like suitable for the DataFrame constructor
+    """
+    if dtype is None:
+        return np.array(values, dtype=object)
+    if dtype == "category":
+        return pd.Categorical(values)
+    try:
+        return pd.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # SQLite columns are loosely typed; coerce stray text or fractional
+        # values in numeric columns instead of failing the whole load
+        logger.debug(f"Coercing column values to {dtype}")
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        return pd.array(np.trunc(numeric), dtype=dtype)
+
+
+def fetch_frame(cursor: sqlite3.Cursor, dtypes: Optional[Dict[str, str]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """Build a DataFrame from an executed cursor without per-row dicts
+
+    Rows are read in fetchmany() batches as plain tuples and transposed
+    straight into per-column lists, which are then converted once into
+    typed arrays. Columns without a declared dtype keep object values.
+
+    Args:
+        cursor: Cursor on which a SELECT has been executed
+        dtypes: Optional mapping of column name to pandas dtype
+            (e.g. "Int64", "category", "int64")
+        batch_size: Number of rows per fetchmany() call
+
+    Returns:
+        pd.DataFrame: Query results
+    """
+    if cursor.description is None:
+        return pd.DataFrame()
+
+    dtypes = dtypes or {}
+    columns = [description[0] for description in cursor.description]
+    values: List[List[Any]] = [[] for _ in columns]
+
+    # Plain tuples are much cheaper to build than sqlite3.Row objects
+    cursor.row_factory = None
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for column_values, batch_values in zip(values, zip(*batch)):
+            column_values.extend(batch_values)
+
+    data = {
+        column: _build_column(column_values, dtypes.get(column))
+        for column, column_values in zip(columns, values)
+    }
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+def query_frame(cursor: sqlite3.Cursor, query: str, params: Sequence[Any] = (),
+                dtypes: Optional[Dict[str, str]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """Execute a query and return the results through the columnar fetch path
+
+    Args:
+        cursor: Database cursor
+        query: SQL query string
+        params: Parameters for the query
+        dtypes: Optional mapping of column name to pandas dtype
+        batch_size: Number of rows per fetchmany() call
+
+    Returns:
+        pd.DataFrame: Query results
+    """
+    cursor.execute(query, params)
+    return fetch_frame(cursor, dtypes, batch_size)
+
+
+def iter_models(cursor: sqlite3.Cursor, factory: Callable[..., T],
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[T]:
+    """Yield one model per row of an executed cursor
+
+    Rows are fetched in batches as plain tuples and passed positionally to
+    the factory, so the SELECT column order must match its parameters.
+
+    Args:
+        cursor: Cursor on which a SELECT has been executed
+        factory: Callable building a model from a row's values
+        batch_size: Number of rows per fetchmany() call
+
+    Yields:
+        Model instances in cursor order
+    """
+    cursor.row_factory = None
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for row in batch:
+            yield factory(*row)
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 import pandas as pd
 import logging
 from config.config import Config
+from app.utils.metrics import connection_factory
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ class DatabaseManager:
     def connect(self):
         """Connect to the SQLite database"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            self.connection = sqlite3.connect(self.db_path, factory=connection_factory())
             self.cursor = self.connection.cursor()
             return self.connection
         except sqlite3.Error as e:
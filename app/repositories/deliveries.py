@@ -0,0 +1,125 @@
+import sqlite3
+import logging
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.config import Config
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# Every build of the delivery files is a run in delivery_runs (the manifest);
+# delivery_builds has one row per delivery and run with the hash of the
+# inputs the file was built from, so unchanged deliveries can be skipped.
+
+# Outcome of a delivery in a run
+BUILT = "built"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def delivery_inputs(conn: sqlite3.Connection, record_ids: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """Get what each Shariah delivery file is built from
+
+    Args:
+        conn: Database connection
+        record_ids: Only these records (default: all)
+
+    Returns:
+        pd.DataFrame: record_id, client, delivery_name, fields, universe,
+        frequency, content_hash, identifier_versions ("type:version" list)
+        and screening_run (latest run ID or NULL), by record
+    """
+    store = store_table(Config.DB.SHARIAH_TABLE)
+    params = [Config.DB.SHARIAH_TABLE]
+    only = ""
+    if record_ids is not None:
+        record_ids = [int(record_id) for record_id in record_ids]
+        only = f"WHERE t.id IN ({', '.join(['?'] * len(record_ids))})" if record_ids else "WHERE 0"
+        params += record_ids
+    return pd.read_sql(f"""
+        SELECT t.id AS record_id, t.client, t.delivery_name, t.fields, t.universe, t.frequency,
+               s.content_hash,
+               (SELECT GROUP_CONCAT(id_type || ':' || version, ',') FROM (
+                    SELECT id_type, version FROM identifier_sets
+                    WHERE table_name = ? AND record_id = t.id ORDER BY id_type
+               )) AS identifier_versions,
+               (SELECT MAX(r.id) FROM screening_runs r WHERE r.record_id = t.id) AS screening_run
+        FROM {Config.DB.SHARIAH_TABLE} t
+        JOIN {store} s ON s.id = t.id
+        {only}
+        ORDER BY t.id
+    """, conn, params=params)
+
+
+def last_builds(conn: sqlite3.Connection) -> Dict[int, Tuple[str, str]]:
+    """Get the latest successful build of each delivery
+
+    Returns:
+        Dict[int, Tuple[str, str]]: (input hash, file path) by record ID
+    """
+    rows = conn.execute("""
+        SELECT record_id, input_hash, file_path FROM delivery_builds
+        WHERE id IN (SELECT MAX(id) FROM delivery_builds WHERE status = ? GROUP BY record_id)
+    """, (BUILT,)).fetchall()
+    return {record_id: (input_hash, file_path) for record_id, input_hash, file_path in rows}
+
+
+def start_run(conn: sqlite3.Connection, file_format: str, output_dir: str, workers: int) -> int:
+    """Record the start of a build run
+
+    Returns:
+        int: ID of the run
+    """
+    return conn.execute(
+        "INSERT INTO delivery_runs (file_format, output_dir, workers) VALUES (?, ?, ?)",
+        (file_format, output_dir, workers)
+    ).lastrowid
+
+
+def record_build(conn: sqlite3.Connection, run_id: int, build: Dict[str, Any]):
+    """Record the outcome of one delivery in a run
+
+    Args:
+        conn: Database connection (the caller commits)
+        run_id: Run ID
+        build: record_id, client, delivery_name, status, input_hash and
+            optionally file_path, rows, columns, missing_fields, seconds and error
+    """
+    conn.execute("""
+        INSERT INTO delivery_builds (run_id, record_id, client, delivery_name, status, input_hash,
+                                     file_path, rows, columns, missing_fields, seconds, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (run_id, build['record_id'], build['client'], build['delivery_name'], build['status'],
+          build['input_hash'], build.get('file_path'), build.get('rows'), build.get('columns'),
+          build.get('missing_fields'), build.get('seconds'), build.get('error')))
+
+
+def finish_run(conn: sqlite3.Connection, run_id: int, counts: Dict[str, int], seconds: float):
+    """Record the totals and duration of a run
+
+    Args:
+        conn: Database connection (the caller commits)
+        run_id: Run ID
+        counts: Deliveries per outcome (BUILT, SKIPPED, FAILED)
+        seconds: Wall-clock duration of the run
+    """
+    conn.execute("""
+        UPDATE delivery_runs SET finished_at = CURRENT_TIMESTAMP, seconds = ?,
+            built = ?, skipped = ?, failed = ?
+        WHERE id = ?
+    """, (seconds, counts.get(BUILT, 0), counts.get(SKIPPED, 0), counts.get(FAILED, 0), run_id))
+
+
+def list_runs(conn: sqlite3.Connection, limit: int = 20) -> pd.DataFrame:
+    """Get the latest build runs, newest first"""
+    return pd.read_sql("SELECT * FROM delivery_runs ORDER BY id DESC LIMIT ?", conn, params=(limit,))
+
+
+def run_builds(conn: sqlite3.Connection, run_id: int) -> pd.DataFrame:
+    """Get the deliveries of a run (its manifest), by record"""
+    return pd.read_sql("""
+        SELECT record_id, client, delivery_name, status, rows, columns, missing_fields, seconds,
+               file_path, input_hash, error
+        FROM delivery_builds WHERE run_id = ? ORDER BY record_id
+    """, conn, params=(int(run_id),))
\ No newline at end of file
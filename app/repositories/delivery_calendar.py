@@ -0,0 +1,120 @@
+import sqlite3
+import logging
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# delivery_calendar holds one row per scheduled Shariah delivery over the
+# horizon in delivery_calendar_state, rebuilt whenever the records it was
+# expanded from change (see app.utils.schedule). Dates are ISO strings so the
+# index on delivery_date serves range queries.
+
+# Scenarios of the projected source load
+CURRENT_SOURCES = "Current sources"
+MIGRATION_PLAN = "Migration plan"
+
+
+def calendar_records(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get the scheduling columns of the Shariah records
+
+    Returns:
+        pd.DataFrame: record_id, frequency, current_source, after_migration,
+        migration_plan and universe_count, by record
+    """
+    return pd.read_sql(f"""
+        SELECT id AS record_id, frequency, current_source, after_migration, migration_plan, universe_count
+        FROM {Config.DB.SHARIAH_TABLE} ORDER BY id
+    """, conn)
+
+
+def calendar_state(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+    """Get the inputs hash and horizon the calendar was built for
+
+    Returns:
+        Optional[Dict[str, Any]]: inputs_hash, start_date, end_date and
+        built_at (None before the first build)
+    """
+    row = conn.execute(
+        "SELECT inputs_hash, start_date, end_date, built_at FROM delivery_calendar_state WHERE id = 1"
+    ).fetchone()
+    return dict(zip(('inputs_hash', 'start_date', 'end_date', 'built_at'), row)) if row else None
+
+
+def save_calendar(conn: sqlite3.Connection, calendar: pd.DataFrame, inputs_hash: str,
+                  start_date: str, end_date: str) -> int:
+    """Replace the calendar
+
+    Args:
+        conn: Database connection (the caller commits)
+        calendar: Output of build_calendar()
+        inputs_hash: Hash of the records and horizon it was built from
+        start_date: First day of the horizon (ISO)
+        end_date: Day after the last one (ISO)
+
+    Returns:
+        int: Number of deliveries stored
+    """
+    conn.execute("DELETE FROM delivery_calendar")
+    rows = zip(
+        calendar['record_id'].tolist(),
+        calendar['delivery_date'].to_numpy(dtype='datetime64[D]').astype(str).tolist(),
+        calendar['current_source'].tolist(),
+        calendar['planned_source'].tolist(),
+        calendar['universe_count'].tolist()
+    )
+    conn.executemany("""
+        INSERT INTO delivery_calendar (record_id, delivery_date, current_source, planned_source, universe_count)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
+    conn.execute("""
+        INSERT INTO delivery_calendar_state (id, inputs_hash, start_date, end_date) VALUES (1, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            inputs_hash = excluded.inputs_hash,
+            start_date = excluded.start_date,
+            end_date = excluded.end_date,
+            built_at = CURRENT_TIMESTAMP
+    """, (inputs_hash, start_date, end_date))
+    return len(calendar)
+
+
+def upcoming_deliveries(conn: sqlite3.Connection, start_date: str, end_date: str) -> pd.DataFrame:
+    """Get the deliveries scheduled within [start_date, end_date)
+
+    Returns:
+        pd.DataFrame: delivery_date, record_id, client, delivery_name,
+        frequency, source (the planned one) and universe_count, by date
+        then client
+    """
+    return pd.read_sql(f"""
+        SELECT c.delivery_date, c.record_id, t.client, t.delivery_name, t.frequency,
+               c.planned_source AS source, c.universe_count
+        FROM delivery_calendar c
+        JOIN {Config.DB.SHARIAH_TABLE} t ON t.id = c.record_id
+        WHERE c.delivery_date >= ? AND c.delivery_date < ?
+        ORDER BY c.delivery_date, t.client
+    """, conn, params=(start_date, end_date))
+
+
+def source_load(conn: sqlite3.Connection, start_date: str, end_date: str) -> pd.DataFrame:
+    """Project the monthly load on each data source, without and with the migrations
+
+    Returns:
+        pd.DataFrame: month ("YYYY-MM"), scenario (CURRENT_SOURCES or
+        MIGRATION_PLAN), source, deliveries and securities (sum of the
+        universe counts delivered)
+    """
+    return pd.read_sql("""
+        SELECT month, scenario, source, COUNT(*) AS deliveries, SUM(universe_count) AS securities
+        FROM (
+            SELECT substr(delivery_date, 1, 7) AS month, ? AS scenario, current_source AS source, universe_count
+            FROM delivery_calendar WHERE delivery_date >= ? AND delivery_date < ?
+            UNION ALL
+            SELECT substr(delivery_date, 1, 7), ?, planned_source, universe_count
+            FROM delivery_calendar WHERE delivery_date >= ? AND delivery_date < ?
+        )
+        GROUP BY month, scenario, source
+        ORDER BY month, scenario, source
+    """, conn, params=(CURRENT_SOURCES, start_date, end_date, MIGRATION_PLAN, start_date, end_date))
\ No newline at end of file
@@ -0,0 +1,275 @@
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+from app.config import Config
+from app.models.schema import ESG_COLUMNS, SHARIAH_COLUMNS, ENUM
+
+logger = logging.getLogger(__name__)
+
+# Rows live in a store table where every enumerated (ENUM) column is an
+# integer key into a small dim_<column> lookup table. The configured table
+# names are views joining the values back in, so reads keep using them; the
+# views' INSTEAD OF triggers keep simple writes working too, but loaders and
+# writes that need lastrowid or rowcount go to the store table directly.
+_SCHEMAS = {
+    Config.DB.ESG_TABLE: (ESG_COLUMNS, Config.DB.ESG_STORE_TABLE),
+    Config.DB.SHARIAH_TABLE: (SHARIAH_COLUMNS, Config.DB.SHARIAH_STORE_TABLE)
+}
+
+# Columns kept next to the schema columns (maintained by imports)
+_EXTRA_COLUMNS = ('client_id', 'natural_key', 'content_hash')
+
+# Values looked up per query (below SQLite's bound parameter limit)
+_LOOKUP_BATCH = 500
+
+
+def store_table(table: str) -> str:
+    """Get the table that stores the rows of a dataset
+
+    Args:
+        table: Dataset table name (Config.DB.ESG_TABLE or SHARIAH_TABLE)
+
+    Returns:
+        str: Store table name
+    """
+    try:
+        return _SCHEMAS[table][1]
+    except KeyError:
+        raise ValueError(f"Table {table} has no store table")
+
+
+def dimension_columns(table: str) -> List[str]:
+    """Get the columns of a dataset that are dictionary-encoded
+
+    Args:
+        table: Dataset table name
+
+    Returns:
+        List[str]: Enumerated column names in schema order
+    """
+    columns, _ = _SCHEMAS[table]
+    return [col for col, kind in columns.items() if kind == ENUM]
+
+
+def dimension_table(column: str) -> str:
+    """Get the lookup table of an encoded column"""
+    return f"dim_{column}"
+
+
+def key_column(column: str) -> str:
+    """Get the store column holding the key of an encoded column"""
+    return f"{column}_id"
+
+
+def store_column(table: str, column: str) -> str:
+    """Get the store column a dataset column is written to"""
+    return key_column(column) if column in dimension_columns(table) else column
+
+
+def ensure_dimension_tables(conn: sqlite3.Connection):
+    """Create the lookup table of every encoded column
+
+    Args:
+        conn: Database connection
+    """
+    for table in _SCHEMAS:
+        for col in dimension_columns(table):
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {dimension_table(col)} (
+                    id INTEGER PRIMARY KEY,
+                    value TEXT NOT NULL UNIQUE
+                )
+            """)
+
+
+def encode_values(conn: sqlite3.Connection, column: str, values: pd.Series) -> pd.Series:
+    """Map the values of an encoded column to their keys, adding new values
+
+    Each distinct value is looked up once (pd.factorize).
+
+    Args:
+        conn: Database connection (the caller commits)
+        column: Encoded column name
+        values: Column values (missing values map to None)
+
+    Returns:
+        pd.Series: Keys (object dtype, None where the value is missing), same
+        index as values
+    """
+    dim = dimension_table(column)
+    codes, uniques = pd.factorize(values)
+    uniques = [str(value) for value in uniques]
+
+    known = {}
+    for start in range(0, len(uniques), _LOOKUP_BATCH):
+        batch = uniques[start:start + _LOOKUP_BATCH]
+        known.update(conn.execute(
+            f"SELECT value, id FROM {dim} WHERE value IN ({', '.join(['?'] * len(batch))})", batch
+        ).fetchall())
+    for value in uniques:
+        if value not in known:
+            known[value] = conn.execute(f"INSERT INTO {dim} (value) VALUES (?)", (value,)).lastrowid
+
+    # Code -1 (missing) takes the extra last slot
+    keys = np.array([known[value] for value in uniques] + [None], dtype=object)
+    return pd.Series(keys[codes], index=values.index)
+
+
+def encode_frame(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Replace the encoded columns of rows by their keys
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+        df: Rows with dataset column names
+
+    Returns:
+        pd.DataFrame: Copy of df with store column names
+    """
+    encoded = {key_column(col): encode_values(conn, col, df[col])
+               for col in dimension_columns(table) if col in df.columns}
+    if not encoded:
+        return df
+    return df.drop(columns=[col for col in dimension_columns(table) if col in df.columns]).assign(**encoded)
+
+
+def encode_record(conn: sqlite3.Connection, table: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the encoded fields of one record by their keys
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+        record: Field values with dataset column names
+
+    Returns:
+        Dict[str, Any]: Field values with store column names (empty values
+        of encoded fields become None)
+    """
+    encoded = {}
+    for col, value in record.items():
+        if col in dimension_columns(table):
+            value = encode_values(conn, col, pd.Series([value or None], dtype=object)).iloc[0]
+        encoded[store_column(table, col)] = value
+    return encoded
+
+
+def _table_type(conn: sqlite3.Connection, name: str) -> str:
+    """Get whether a name is a "table", a "view" or missing ("")"""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else ""
+
+
+def migrate_to_store(conn: sqlite3.Connection, table: str) -> bool:
+    """Move a dataset table created by an older version into its store table
+
+    The table is renamed, its encoded columns are replaced by keys into the
+    lookup tables, and the text columns are dropped. Tables already
+    migrated (or not created yet) are left alone.
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+
+    Returns:
+        bool: True if the table was migrated
+    """
+    if _table_type(conn, table) != "table":
+        return False
+
+    store = store_table(table)
+    conn.execute(f"ALTER TABLE {table} RENAME TO {store}")
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({store})")}
+    encoded = [col for col in dimension_columns(table) if col in existing]
+
+    df = pd.read_sql(f"SELECT id, {', '.join(encoded)} FROM {store}", conn) if encoded else pd.DataFrame()
+    for col in encoded:
+        conn.execute(f"ALTER TABLE {store} ADD COLUMN {key_column(col)} "
+                     f"INTEGER REFERENCES {dimension_table(col)} (id)")
+        conn.executemany(f"UPDATE {store} SET {key_column(col)} = ? WHERE id = ?",
+                         zip(encode_values(conn, col, df[col]).tolist(), df['id'].tolist()))
+        conn.execute(f"ALTER TABLE {store} DROP COLUMN {col}")
+
+    logger.info(f"Moved {len(df)} rows of {table} to {store} ({len(encoded)} columns encoded)")
+    return True
+
+
+def create_view(conn: sqlite3.Connection, table: str):
+    """(Re)create the compatibility view of a dataset and its write triggers
+
+    The view has the columns the dataset table used to have, so existing
+    queries run unchanged. INSERT, UPDATE and DELETE statements on the view
+    are applied to the store table by INSTEAD OF triggers (SQLite then
+    reports neither lastrowid nor rowcount).
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+    """
+    schema, store = _SCHEMAS[table]
+    dims = dimension_columns(table)
+    stored = {row[1] for row in conn.execute(f"PRAGMA table_info({store})")}
+    columns = [col for col in schema if store_column(table, col) in stored]
+    columns += [col for col in _EXTRA_COLUMNS if col in stored]
+
+    select = ', '.join(f"d_{col}.value AS {col}" if col in dims else f"s.{col}" for col in columns)
+    joins = ' '.join(
+        f"LEFT JOIN {dimension_table(col)} d_{col} ON d_{col}.id = s.{key_column(col)}" for col in dims if col in columns
+    )
+    conn.execute(f"DROP VIEW IF EXISTS {table}")
+    conn.execute(f"CREATE VIEW {table} AS SELECT {select} FROM {store} s {joins}")
+
+    def value_key(col: str, row: str) -> str:
+        return f"(SELECT id FROM {dimension_table(col)} WHERE value = {row}.{col})"
+
+    def new_value(col: str) -> str:
+        if col in dims:
+            return value_key(col, 'NEW')
+        if col in ('created_at', 'updated_at'):
+            return f"COALESCE(NEW.{col}, CURRENT_TIMESTAMP)"
+        return f"NEW.{col}"
+
+    register = ' '.join(
+        f"INSERT OR IGNORE INTO {dimension_table(col)} (value) SELECT NEW.{col} WHERE NEW.{col} IS NOT NULL;"
+        for col in dims if col in columns
+    )
+    targets = ', '.join(store_column(table, col) for col in columns)
+    values = ', '.join(new_value(col) for col in columns)
+    assignments = ', '.join(f"{store_column(table, col)} = {new_value(col)}" for col in columns)
+    conn.execute(f"""
+        CREATE TRIGGER {table}_insert INSTEAD OF INSERT ON {table}
+        BEGIN {register} INSERT INTO {store} ({targets}) VALUES ({values}); END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {table}_update INSTEAD OF UPDATE ON {table}
+        BEGIN {register} UPDATE {store} SET {assignments} WHERE id = OLD.id; END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {table}_delete INSTEAD OF DELETE ON {table}
+        BEGIN DELETE FROM {store} WHERE id = OLD.id; END
+    """)
+
+
+def category_counts(conn: sqlite3.Connection, table: str, column: str) -> Dict[Any, int]:
+    """Count the records per value of an encoded column
+
+    The rows are grouped on the integer key; values are looked up once per
+    group.
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+        column: Encoded column name
+
+    Returns:
+        Dict[Any, int]: Records per value (None for records without one)
+    """
+    key = key_column(column)
+    rows = conn.execute(f"""
+        SELECT d.value, counts.count
+        FROM (SELECT {key}, COUNT(*) AS count FROM {store_table(table)} GROUP BY {key}) counts
+        LEFT JOIN {dimension_table(column)} d ON d.id = counts.{key}
+    """).fetchall()
+    return {value: count for value, count in rows}
\ No newline at end of file
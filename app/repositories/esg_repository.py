@@ -1,14 +1,24 @@
 import sqlite3
 import pandas as pd
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from app.config import Config
+from app.utils.metrics import connection_factory
+from app.repositories.columnar import DEFAULT_BATCH_SIZE, query_frame, iter_models
+from app.models.esg_model import ESGData, ESGAggregatedData
+from app.models.schema import ESG_COLUMNS, ESG_AGGREGATED_COLUMNS
+from app.utils.dtypes import dtypes_for
+from app.repositories.dimensions import encode_record, encode_frame, category_counts
 
 logger = logging.getLogger(__name__)
 
 class ESGRepository:
     """Repository for ESG data operations"""
     
+    # Declared dtypes for the columnar fetch path
+    COLUMN_DTYPES = dtypes_for(ESG_COLUMNS)
+    AGGREGATED_DTYPES = dtypes_for(ESG_AGGREGATED_COLUMNS)
+    
     def __init__(self, db_path: Optional[str] = None):
         """Initialize the ESG repository
         
@@ -17,6 +27,10 @@ class ESGRepository:
         """
         self.db_path = db_path or Config.DATABASE_PATH
         self.table_name = Config.DB.ESG_TABLE
+        # Writes go to the store table (table_name is a view; see app.repositories.dimensions)
+        self.store_table = Config.DB.ESG_STORE_TABLE
+        # Explicit column list keeps the upsert bookkeeping columns out of loaded frames
+        self.select_columns = ', '.join(ESG_COLUMNS)
         
     def _get_connection(self) -> Tuple[sqlite3.Connection, sqlite3.Cursor]:
         """Get a database connection and cursor
@@ -25,7 +39,7 @@ class ESGRepository:
             Tuple[sqlite3.Connection, sqlite3.Cursor]: Connection and cursor
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, factory=connection_factory())
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             return conn, cursor
@@ -41,9 +55,7 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"SELECT * FROM {self.table_name}")
-            rows = cursor.fetchall()
-            return pd.DataFrame([dict(row) for row in rows])
+            return query_frame(cursor, f"SELECT {self.select_columns} FROM {self.table_name}", dtypes=self.COLUMN_DTYPES)
         except sqlite3.Error as e:
             logger.error(f"Error getting all ESG data: {e}")
             return pd.DataFrame()
@@ -62,9 +74,7 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"SELECT * FROM {self.table_name} WHERE id = ?", (record_id,))
-            rows = cursor.fetchall()
-            return pd.DataFrame([dict(row) for row in rows])
+            return query_frame(cursor, f"SELECT {self.select_columns} FROM {self.table_name} WHERE id = ?", (record_id,), dtypes=self.COLUMN_DTYPES)
         except sqlite3.Error as e:
             logger.error(f"Error getting ESG data by ID {record_id}: {e}")
             return pd.DataFrame()
@@ -83,9 +93,7 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"SELECT * FROM {self.table_name} WHERE client = ?", (client,))
-            rows = cursor.fetchall()
-            return pd.DataFrame([dict(row) for row in rows])
+            return query_frame(cursor, f"SELECT {self.select_columns} FROM {self.table_name} WHERE client = ?", (client,), dtypes=self.COLUMN_DTYPES)
         except sqlite3.Error as e:
             logger.error(f"Error getting ESG data for client {client}: {e}")
             return pd.DataFrame()
@@ -105,13 +113,14 @@ class ESGRepository:
         try:
             conn, cursor = self._get_connection()
             
-            # Extract column names and values
+            # Extract column names and values (enumerated values as lookup keys)
+            data = encode_record(conn, self.table_name, data)
             columns = list(data.keys())
             placeholders = ', '.join(['?'] * len(columns))
             values = [data[col] for col in columns]
             
             # Build and execute query
-            query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            query = f"INSERT INTO {self.store_table} ({', '.join(columns)}) VALUES ({placeholders})"
             cursor.execute(query, values)
             conn.commit()
             
@@ -137,12 +146,12 @@ class ESGRepository:
             conn, cursor = self._get_connection()
             
             # Extract column names and values, excluding ID
-            update_data = {k: v for k, v in data.items() if k != 'id'}
+            update_data = encode_record(conn, self.table_name, {k: v for k, v in data.items() if k != 'id'})
             set_clause = ', '.join([f"{col} = ?" for col in update_data.keys()])
             values = list(update_data.values()) + [record_id]
             
             # Build and execute query
-            query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?"
+            query = f"UPDATE {self.store_table} SET {set_clause} WHERE id = ?"
             cursor.execute(query, values)
             conn.commit()
             
@@ -165,7 +174,7 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"DELETE FROM {self.table_name} WHERE id = ?", (record_id,))
+            cursor.execute(f"DELETE FROM {self.store_table} WHERE id = ?", (record_id,))
             conn.commit()
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -187,9 +196,7 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"SELECT * FROM {self.table_name} WHERE {field_name} LIKE ?", (f"%{search_term}%",))
-            rows = cursor.fetchall()
-            return pd.DataFrame([dict(row) for row in rows])
+            return query_frame(cursor, f"SELECT {self.select_columns} FROM {self.table_name} WHERE {field_name} LIKE ?", (f"%{search_term}%",), dtypes=self.COLUMN_DTYPES)
         except sqlite3.Error as e:
             logger.error(f"Error searching ESG data in field {field_name} for term {search_term}: {e}")
             return pd.DataFrame()
@@ -223,9 +230,9 @@ class ESGRepository:
         """
         try:
             conn, cursor = self._get_connection()
-            cursor.execute(f"SELECT compliance, COUNT(*) as count FROM {self.table_name} GROUP BY compliance")
-            rows = cursor.fetchall()
-            return {row['compliance'] or 'Unknown': row['count'] for row in rows}
+            # Grouped on the integer keys of the compliance lookup table
+            counts = category_counts(conn, self.table_name, 'compliance')
+            return {value or 'Unknown': count for value, count in counts.items()}
         except sqlite3.Error as e:
             logger.error(f"Error getting ESG compliance summary: {e}")
             return {}
@@ -233,32 +240,42 @@ class ESGRepository:
             if conn:
                 conn.close()
                 
-    def get_aggregated_data(self) -> pd.DataFrame:
-        """Get aggregated ESG data by client
+    def _aggregated_query(self) -> str:
+        """Build the per-client aggregation query
+        
+        Rows are grouped by client_id, so every spelling of a client's name
+        falls into one group shown under the client's canonical name.
         
         Returns:
-            pd.DataFrame: Aggregated ESG data
+            str: SQL query whose column order matches ESGAggregatedData
         """
-        try:
-            conn, cursor = self._get_connection()
-            query = f"""
+        return f"""
                 SELECT 
-                    client,
-                    GROUP_CONCAT(DISTINCT fields) AS fields,
-                    GROUP_CONCAT(DISTINCT data_type) AS data_types,
-                    GROUP_CONCAT(DISTINCT data_source) AS data_sources,
-                    SUM(sedol_count) AS total_sedol_count,
-                    SUM(isin_count) AS total_isin_count,
-                    SUM(cusip_count) AS total_cusip_count,
-                    GROUP_CONCAT(DISTINCT compliance) AS compliance_status,
+                    COALESCE(c.name, t.client) AS client,
+                    COALESCE(GROUP_CONCAT(DISTINCT fields), '') AS fields,
+                    COALESCE(GROUP_CONCAT(DISTINCT data_type), '') AS data_types,
+                    COALESCE(GROUP_CONCAT(DISTINCT data_source), '') AS data_sources,
+                    COALESCE(SUM(sedol_count), 0) AS total_sedol_count,
+                    COALESCE(SUM(isin_count), 0) AS total_isin_count,
+                    COALESCE(SUM(cusip_count), 0) AS total_cusip_count,
+                    COALESCE(GROUP_CONCAT(DISTINCT compliance), '') AS compliance_status,
                     COUNT(*) AS record_count
-                FROM {self.table_name}
-                GROUP BY client
+                FROM {self.table_name} t
+                LEFT JOIN clients c ON c.id = t.client_id
+                -- Spelling variants share a client_id; rows not linked yet fall back to their name
+                GROUP BY t.client_id, CASE WHEN t.client_id IS NULL THEN t.client END
                 ORDER BY client
             """
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            return pd.DataFrame([dict(row) for row in rows])
+    
+    def get_aggregated_data(self) -> pd.DataFrame:
+        """Get aggregated ESG data by client as a DataFrame
+        
+        Returns:
+            pd.DataFrame: Aggregated ESG data
+        """
+        try:
+            conn, cursor = self._get_connection()
+            return query_frame(cursor, self._aggregated_query(), dtypes=self.AGGREGATED_DTYPES)
         except sqlite3.Error as e:
             logger.error(f"Error getting aggregated ESG data: {e}")
             return pd.DataFrame()
@@ -266,6 +283,47 @@ class ESGRepository:
             if conn:
                 conn.close()
                 
+    def iter_aggregated(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ESGAggregatedData]:
+        """Stream aggregated ESG data by client as models
+        
+        Args:
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            ESGAggregatedData: One model per client, straight from the cursor
+        """
+        conn = None
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute(self._aggregated_query())
+            yield from iter_models(cursor, ESGAggregatedData, batch_size)
+        except sqlite3.Error as e:
+            logger.error(f"Error streaming aggregated ESG data: {e}")
+        finally:
+            if conn:
+                conn.close()
+                
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ESGData]:
+        """Stream all ESG records as models
+        
+        Args:
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            ESGData: One model per record, straight from the cursor
+        """
+        conn = None
+        try:
+            conn, cursor = self._get_connection()
+            columns = ', '.join(ESGData._fields)
+            cursor.execute(f"SELECT {columns} FROM {self.table_name} ORDER BY id")
+            yield from iter_models(cursor, ESGData, batch_size)
+        except sqlite3.Error as e:
+            logger.error(f"Error streaming ESG data: {e}")
+        finally:
+            if conn:
+                conn.close()
+                
     def bulk_add(self, data: pd.DataFrame) -> bool:
         """Add multiple ESG data records
         
@@ -281,12 +339,13 @@ class ESGRepository:
         try:
             conn, cursor = self._get_connection()
             
-            # Get column names from the data
+            # Get column names from the data (enumerated values as lookup keys)
+            data = encode_frame(conn, self.table_name, data)
             columns = list(data.columns)
             placeholders = ', '.join(['?'] * len(columns))
             
             # Build the query
-            query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            query = f"INSERT INTO {self.store_table} ({', '.join(columns)}) VALUES ({placeholders})"
             
             # Execute for each row
             for _, row in data.iterrows():
@@ -0,0 +1,229 @@
+import sqlite3
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import Config
+from app.utils.identifiers import ID_TYPES, pack_codes, unpack_codes
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# Datasets whose records (one per client delivery) can have identifier sets
+IDENTIFIER_TABLES = (Config.DB.ESG_TABLE, Config.DB.SHARIAH_TABLE)
+
+# Each row of identifier_sets holds the identifiers of one type delivered by
+# one record, as a sorted array of unique int64 codes (see
+# app.utils.identifiers). The record's <type>_count column is derived from
+# it and acts as the cached count the rest of the application reads.
+
+
+def _live_sets(table: str) -> str:
+    """SQL condition keeping the sets of records that still exist"""
+    return f"table_name = ? AND record_id IN (SELECT id FROM {store_table(table)})"
+
+
+def save_identifier_set(conn: sqlite3.Connection, table: str, record_id: int, id_type: str,
+                        codes: np.ndarray, file_name: Optional[str] = None) -> int:
+    """Store (or replace) the identifiers of one type delivered by a record
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+        record_id: Record (delivery) ID
+        id_type: Identifier type ("sedol", "isin" or "cusip")
+        codes: Sorted unique codes from encode_identifiers()
+        file_name: File the identifiers were uploaded from
+
+    Returns:
+        int: Number of identifiers stored
+    """
+    if id_type not in ID_TYPES:
+        raise ValueError(f"Unknown identifier type: {id_type}")
+    conn.execute("""
+        INSERT INTO identifier_sets (table_name, record_id, id_type, identifier_count, codes, file_name, version)
+        VALUES (?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(version), 0) + 1 FROM identifier_sets))
+        ON CONFLICT (table_name, record_id, id_type) DO UPDATE SET
+            identifier_count = excluded.identifier_count,
+            codes = excluded.codes,
+            file_name = excluded.file_name,
+            version = excluded.version,
+            updated_at = CURRENT_TIMESTAMP
+    """, (table, int(record_id), id_type, len(codes), pack_codes(codes), file_name))
+    return len(codes)
+
+
+def load_identifier_set(conn: sqlite3.Connection, table: str, record_id: int, id_type: str) -> np.ndarray:
+    """Get the codes of one type delivered by a record
+
+    Returns:
+        np.ndarray: Sorted unique int64 codes (empty if none were uploaded)
+    """
+    row = conn.execute(
+        "SELECT codes FROM identifier_sets WHERE table_name = ? AND record_id = ? AND id_type = ?",
+        (table, int(record_id), id_type)
+    ).fetchone()
+    return unpack_codes(row[0] if row else b'')
+
+
+def list_identifier_sets(conn: sqlite3.Connection, table: str) -> pd.DataFrame:
+    """Get the identifier sets of a dataset, without their codes
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+
+    Returns:
+        pd.DataFrame: record_id, id_type, identifier_count, file_name and
+        updated_at of the sets of existing records
+    """
+    return pd.read_sql(f"""
+        SELECT record_id, id_type, identifier_count, file_name, updated_at
+        FROM identifier_sets WHERE {_live_sets(table)}
+        ORDER BY record_id, id_type
+    """, conn, params=(table,))
+
+
+def sync_identifier_counts(conn: sqlite3.Connection, table: str,
+                           record_ids: Optional[Iterable[int]] = None) -> int:
+    """Write the size of each identifier set to its record's count column
+
+    Records without a set of a type keep the count they were given. The
+    content hash is not refreshed, so re-importing a file that still carries
+    hand-typed counts leaves the derived counts alone.
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+        record_ids: Only sync these records (default: every record with a set)
+
+    Returns:
+        int: Number of counts written
+    """
+    store = store_table(table)
+    params = []
+    only = ""
+    if record_ids is not None:
+        record_ids = [int(record_id) for record_id in record_ids]
+        if not record_ids:
+            return 0
+        only = f"AND record_id IN ({', '.join(['?'] * len(record_ids))})"
+        params = record_ids
+
+    written = 0
+    for id_type in ID_TYPES:
+        written += conn.execute(f"""
+            UPDATE {store} SET {id_type}_count = (
+                SELECT identifier_count FROM identifier_sets s
+                WHERE s.table_name = ? AND s.record_id = {store}.id AND s.id_type = ?
+            )
+            WHERE id IN (SELECT record_id FROM identifier_sets WHERE table_name = ? AND id_type = ? {only})
+              AND {id_type}_count IS NOT (
+                SELECT identifier_count FROM identifier_sets s
+                WHERE s.table_name = ? AND s.record_id = {store}.id AND s.id_type = ?
+            )
+        """, [table, id_type, table, id_type] + params + [table, id_type]).rowcount
+    return written
+
+
+def identifier_sets_version(conn: sqlite3.Connection, table: str) -> Tuple[int, int]:
+    """Get a value that changes whenever the live sets of a dataset change
+
+    Saving a set raises the highest version; deleting a record (or its set)
+    lowers the number of sets.
+
+    Returns:
+        Tuple[int, int]: Number of live sets and their highest version
+    """
+    count, version = conn.execute(
+        f"SELECT COUNT(*), COALESCE(MAX(version), 0) FROM identifier_sets WHERE {_live_sets(table)}", (table,)
+    ).fetchone()
+    return count, version
+
+
+def distinct_identifier_counts(conn: sqlite3.Connection, table: str) -> Dict[str, int]:
+    """Count the distinct identifiers of each type over all deliveries
+
+    Securities delivered to several clients count once. The sets are
+    merged one at a time so memory stays bounded by the union.
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+
+    Returns:
+        Dict[str, int]: Distinct identifiers per type (0 for types without sets)
+    """
+    union = {id_type: np.empty(0, dtype=np.int64) for id_type in ID_TYPES}
+    rows = conn.execute(f"SELECT id_type, codes FROM identifier_sets WHERE {_live_sets(table)}", (table,))
+    for id_type, blob in rows:
+        if id_type in union:
+            union[id_type] = np.union1d(union[id_type], unpack_codes(blob))
+    return {id_type: len(codes) for id_type, codes in union.items()}
+
+
+def purge_orphan_sets(conn: sqlite3.Connection, table: str) -> int:
+    """Delete the identifier sets of records that no longer exist
+
+    Args:
+        conn: Database connection (the caller commits)
+        table: Dataset table name
+
+    Returns:
+        int: Number of sets deleted
+    """
+    deleted = conn.execute(f"""
+        DELETE FROM identifier_sets
+        WHERE table_name = ? AND record_id NOT IN (SELECT id FROM {store_table(table)})
+    """, (table,)).rowcount
+    if deleted:
+        logger.info(f"Deleted {deleted} identifier sets of removed {table} records")
+    return deleted
+
+def client_set_owners(conn: sqlite3.Connection, table: str, id_type: str) -> pd.DataFrame:
+    """Get the client of every live identifier set of a type
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+        id_type: Identifier type
+
+    Returns:
+        pd.DataFrame: record_id, client_id and client (canonical name), by
+        client name then record
+    """
+    store = store_table(table)
+    return pd.read_sql(f"""
+        SELECT s.record_id, t.client_id, COALESCE(c.name, t.client) AS client
+        FROM identifier_sets s
+        JOIN {store} t ON t.id = s.record_id
+        LEFT JOIN clients c ON c.id = t.client_id
+        WHERE s.table_name = ? AND s.id_type = ?
+        ORDER BY client, s.record_id
+    """, conn, params=(table, id_type))
+
+
+def client_universes(conn: sqlite3.Connection, table: str, id_type: str,
+                     owners: Optional[pd.DataFrame] = None) -> Dict[str, np.ndarray]:
+    """Merge the identifier sets of each client's deliveries
+
+    Args:
+        conn: Database connection
+        table: Dataset table name
+        id_type: Identifier type
+        owners: client_set_owners() result, if already loaded
+
+    Returns:
+        Dict[str, np.ndarray]: Sorted unique codes per client name, in name order
+    """
+    owners = owners if owners is not None else client_set_owners(conn, table, id_type)
+    clients = dict(zip(owners['record_id'], owners['client']))
+    universes: Dict[str, np.ndarray] = {client: np.empty(0, dtype=np.int64) for client in owners['client']}
+    rows = conn.execute(f"SELECT record_id, codes FROM identifier_sets WHERE {_live_sets(table)} AND id_type = ?",
+                        (table, id_type))
+    for record_id, blob in rows:
+        if record_id in clients:
+            client = clients[record_id]
+            universes[client] = np.union1d(universes[client], unpack_codes(blob))
+    return universes
\ No newline at end of file
@@ -0,0 +1,118 @@
+import sqlite3
+import logging
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from app.config import Config
+from app.repositories.dimensions import store_table
+
+logger = logging.getLogger(__name__)
+
+# A screening run screens the financials of one Shariah delivery's universe.
+# Every run is kept in screening_runs; screening_results holds the
+# per-security results of the latest run of each delivery only.
+
+RESULT_COLUMNS = ['identifier', 'debt_ratio', 'cash_ratio', 'income_ratio', 'purification_ratio',
+                  'debt_pass', 'cash_pass', 'income_pass', 'status']
+
+
+def save_screening_run(conn: sqlite3.Connection, record_id: int, run: Dict[str, Any],
+                       results: pd.DataFrame) -> int:
+    """Store a screening run and its results, replacing the delivery's previous results
+
+    Args:
+        conn: Database connection (the caller commits)
+        record_id: Shariah record (delivery) ID
+        run: file_name, securities, passed, failed, no_data, debt_limit,
+            cash_limit, income_limit and seconds of the run
+        results: Output of screen_financials()
+
+    Returns:
+        int: ID of the run
+    """
+    run_id = conn.execute("""
+        INSERT INTO screening_runs (record_id, file_name, securities, passed, failed, no_data,
+                                    debt_limit, cash_limit, income_limit, seconds)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (int(record_id), run['file_name'], run['securities'], run['passed'], run['failed'], run['no_data'],
+          run['debt_limit'], run['cash_limit'], run['income_limit'], run['seconds'])).lastrowid
+
+    conn.execute("""
+        DELETE FROM screening_results
+        WHERE run_id IN (SELECT id FROM screening_runs WHERE record_id = ? AND id <> ?)
+    """, (int(record_id), run_id))
+
+    # Ratios become NULL where they could not be computed, screens 1/0/NULL
+    rows = results[RESULT_COLUMNS].astype(object).where(results[RESULT_COLUMNS].notna(), None)
+    conn.executemany(f"""
+        INSERT INTO screening_results (run_id, {', '.join(RESULT_COLUMNS)})
+        VALUES (?, {', '.join(['?'] * len(RESULT_COLUMNS))})
+    """, ((run_id, *row) for row in rows.itertuples(index=False, name=None)))
+    return run_id
+
+
+def latest_screening_run(conn: sqlite3.Connection, record_id: int) -> Optional[Dict[str, Any]]:
+    """Get the latest screening run of a delivery
+
+    Returns:
+        Optional[Dict[str, Any]]: The run's columns, or None if the delivery
+        was never screened
+    """
+    runs = pd.read_sql("SELECT * FROM screening_runs WHERE record_id = ? ORDER BY id DESC LIMIT 1",
+                       conn, params=(int(record_id),))
+    return runs.iloc[0].to_dict() if not runs.empty else None
+
+
+def load_screening_results(conn: sqlite3.Connection, run_id: int) -> pd.DataFrame:
+    """Get the per-security results of a run
+
+    Returns:
+        pd.DataFrame: RESULT_COLUMNS, by identifier (empty once a later run of
+        the delivery replaced them)
+    """
+    results = pd.read_sql(f"""
+        SELECT {', '.join(RESULT_COLUMNS)} FROM screening_results
+        WHERE run_id = ? ORDER BY identifier
+    """, conn, params=(int(run_id),))
+    for column in ('debt_pass', 'cash_pass', 'income_pass'):
+        results[column] = results[column].astype('boolean')
+    return results
+
+
+def list_screening_runs(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get the screening runs of existing Shariah deliveries, latest first
+
+    Returns:
+        pd.DataFrame: The runs with the client and delivery_name of their record
+    """
+    store = store_table(Config.DB.SHARIAH_TABLE)
+    return pd.read_sql(f"""
+        SELECT r.id, r.record_id, t.client, t.delivery_name, r.file_name, r.securities,
+               r.passed, r.failed, r.no_data, r.debt_limit, r.cash_limit, r.income_limit,
+               r.seconds, r.created_at
+        FROM screening_runs r
+        JOIN {Config.DB.SHARIAH_TABLE} t ON t.id = r.record_id
+        WHERE r.record_id IN (SELECT id FROM {store})
+        ORDER BY r.id DESC
+    """, conn)
+
+
+def purge_orphan_runs(conn: sqlite3.Connection) -> int:
+    """Delete the screening runs (and results) of Shariah records that no longer exist
+
+    Args:
+        conn: Database connection (the caller commits)
+
+    Returns:
+        int: Number of runs deleted
+    """
+    store = store_table(Config.DB.SHARIAH_TABLE)
+    conn.execute(f"""
+        DELETE FROM screening_results WHERE run_id IN (
+            SELECT id FROM screening_runs WHERE record_id NOT IN (SELECT id FROM {store})
+        )
+    """)
+    deleted = conn.execute(f"DELETE FROM screening_runs WHERE record_id NOT IN (SELECT id FROM {store})").rowcount
+    if deleted:
+        logger.info(f"Deleted {deleted} screening runs of removed Shariah records")
+    return deleted
\ No newline at end of file
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+from app.database import get_connection
+from app.config import Config
+from app.utils.schedule import normalize_frequency, build_calendar
+from app.repositories.delivery_calendar import (
+    calendar_records, calendar_state, save_calendar, upcoming_deliveries, source_load
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _horizon(days: Optional[int] = None) -> Tuple[np.datetime64, np.datetime64]:
+    """Get [today, today + days) as datetime64[D]"""
+    start = np.datetime64('today', 'D')
+    return start, start + (days or Config.APP.CALENDAR_HORIZON_DAYS)
+
+
+def _inputs_hash(records: pd.DataFrame, start: np.datetime64, end: np.datetime64) -> str:
+    """Hash the scheduling columns of the records and the horizon"""
+    digest = hashlib.sha256(pd.util.hash_pandas_object(records, index=False).to_numpy().tobytes())
+    digest.update(f"{start}:{end}".encode())
+    return digest.hexdigest()
+
+
+class DeliveryCalendarService:
+    """Service class for the calendar of Shariah deliveries
+
+    The frequency and migration plan of every Shariah record are expanded
+    into delivery dates over the next Config.APP.CALENDAR_HORIZON_DAYS days
+    (see build_calendar()). The calendar is stored with the hash of the
+    records it was built from and only rebuilt when they change or the
+    horizon moves on.
+    """
+
+    def refresh(self, force: bool = False) -> Dict[str, Any]:
+        """Rebuild the calendar if the records or the horizon changed
+
+        Args:
+            force: Rebuild even if nothing changed
+
+        Returns:
+            Dictionary with "success", "rebuilt", the number of "deliveries"
+            (when rebuilt), "start_date", "end_date" and "errors"
+        """
+        conn = None
+        start, end = _horizon()
+        result = {"success": False, "rebuilt": False, "deliveries": None,
+                  "start_date": str(start), "end_date": str(end), "errors": []}
+        try:
+            conn = get_connection()
+            records = calendar_records(conn)
+            inputs_hash = _inputs_hash(records, start, end)
+            state = calendar_state(conn)
+            if not force and state is not None and state['inputs_hash'] == inputs_hash:
+                result["success"] = True
+                return result
+
+            calendar = build_calendar(records, start, end)
+            result["deliveries"] = save_calendar(conn, calendar, inputs_hash, str(start), str(end))
+            conn.commit()
+            result["success"] = True
+            result["rebuilt"] = True
+            logger.info(f"Delivery calendar rebuilt: {result['deliveries']} deliveries from {start} to {end}")
+            return result
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            result["errors"].append(str(e))
+            logger.error(f"Error building the delivery calendar: {str(e)}")
+            return result
+        finally:
+            if conn:
+                conn.close()
+
+    def get_upcoming(self, days: int = 30) -> pd.DataFrame:
+        """Get the deliveries of the coming days
+
+        Args:
+            days: Number of days from today
+
+        Returns:
+            pd.DataFrame: One row per delivery, by date (empty if unavailable)
+        """
+        self.refresh()
+        conn = None
+        try:
+            conn = get_connection()
+            start, end = _horizon(days)
+            return upcoming_deliveries(conn, str(start), str(end))
+        except Exception as e:
+            logger.error(f"Error reading upcoming deliveries: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def get_source_load(self) -> pd.DataFrame:
+        """Get the projected monthly load on each data source over the horizon
+
+        Returns:
+            pd.DataFrame: month, scenario (current sources or migration plan),
+            source, deliveries and securities (empty if unavailable)
+        """
+        self.refresh()
+        conn = None
+        try:
+            conn = get_connection()
+            start, end = _horizon()
+            return source_load(conn, str(start), str(end))
+        except Exception as e:
+            logger.error(f"Error projecting the source load: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def get_unscheduled(self) -> pd.DataFrame:
+        """Get the Shariah records whose frequency is not understood
+
+        Returns:
+            pd.DataFrame: record_id and frequency of the records left out of
+            the calendar (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            records = calendar_records(conn)
+            return records.loc[normalize_frequency(records['frequency']).isna(), ['record_id', 'frequency']]
+        except Exception as e:
+            logger.error(f"Error reading Shariah frequencies: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
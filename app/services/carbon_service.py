@@ -0,0 +1,221 @@
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Tuple
+
+from app.database import get_connection
+from app.config import Config
+from app.utils.metrics import record_cache_lookup
+from app.utils.validation import parse_numbers
+from app.utils.carbon import (
+    METRIC_COLUMNS, map_emissions_columns, map_holdings_columns, normalize_identifiers,
+    issuer_arrays, portfolio_metrics
+)
+from app.repositories.dimensions import store_table
+from app.repositories.carbon import (
+    save_issuer_emissions, load_issuer_emissions, emissions_version, emissions_summary,
+    save_holdings, list_portfolios, load_holdings
+)
+
+logger = logging.getLogger(__name__)
+
+# Metrics label of the result cache
+CACHE_NAME = "carbon_metrics"
+
+# Metrics per portfolio (ESG record ID) with the (holdings version, emissions
+# version) they were computed from, and the issuer arrays of the emissions version
+_metrics: Dict[int, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_issuers: Dict[str, Any] = {"version": None, "arrays": None}
+_lock = threading.Lock()
+
+
+def _issuer_arrays(conn, version: int) -> Dict[str, np.ndarray]:
+    """Get the issuer arrays of an emissions version, loading them once per version"""
+    with _lock:
+        if _issuers["version"] == version:
+            return _issuers["arrays"]
+    arrays = issuer_arrays(load_issuer_emissions(conn))
+    with _lock:
+        _issuers["version"] = version
+        _issuers["arrays"] = arrays
+    return arrays
+
+
+class CarbonService:
+    """Service class for the carbon metrics of ESG client portfolios"""
+
+    def upload_emissions(self, emissions: pd.DataFrame, file_name: str) -> Dict[str, Any]:
+        """Add or update issuer emissions from an uploaded file
+
+        Issuers already on file are updated, others are added. Rows without
+        an identifier are skipped; for duplicated identifiers the last row
+        wins.
+
+        Args:
+            emissions: Emissions as read from the file (see EMISSIONS_COLUMNS)
+            file_name: Uploaded file name
+
+        Returns:
+            Dictionary with "success", the number of "issuers" stored, the
+            number of rows "skipped" and "errors"
+        """
+        conn = None
+        result = {"success": False, "issuers": 0, "skipped": 0, "errors": []}
+        try:
+            df, missing = map_emissions_columns(emissions)
+            if missing:
+                result["errors"].append(f"Missing columns: {', '.join(missing)}")
+                return result
+
+            identifiers = normalize_identifiers(df['identifier'])
+            issuers = pd.DataFrame({'identifier': identifiers})
+            for column in ('scope1_emissions', 'scope2_emissions', 'revenue', 'evic'):
+                issuers[column] = parse_numbers(df[column])[0]
+            keep = identifiers != ''
+            result["skipped"] = int((~keep).sum())
+            issuers = issuers[keep].drop_duplicates('identifier', keep='last')
+            if issuers.empty:
+                result["errors"].append("The file contains no issuers")
+                return result
+
+            conn = get_connection()
+            version = save_issuer_emissions(conn, issuers, file_name)
+            conn.commit()
+
+            logger.info(f"Stored emissions of {len(issuers)} issuers from {file_name} (version {version})")
+            result["issuers"] = len(issuers)
+            result["success"] = True
+            return result
+        except Exception as e:
+            logger.error(f"Error uploading issuer emissions: {str(e)}")
+            result["errors"].append(str(e))
+            return result
+        finally:
+            if conn:
+                conn.close()
+
+    def upload_holdings(self, record_id: int, holdings: pd.DataFrame, file_name: str) -> Dict[str, Any]:
+        """Store the holdings of a client portfolio, replacing earlier ones
+
+        Args:
+            record_id: ESG record (delivery) the portfolio belongs to
+            holdings: Holdings as read from the file (see HOLDINGS_COLUMNS)
+            file_name: Uploaded file name
+
+        Returns:
+            Dictionary with "success", the number of "holdings" stored, the
+            number of rows "skipped" (no identifier), the number of
+            "invalid" market values (stored as unknown) and "errors"
+        """
+        conn = None
+        result = {"success": False, "holdings": 0, "skipped": 0, "invalid": 0, "errors": []}
+        try:
+            df, missing = map_holdings_columns(holdings)
+            if missing:
+                result["errors"].append(f"Missing columns: {', '.join(missing)}")
+                return result
+
+            identifiers = normalize_identifiers(df['identifier'])
+            market_values, invalid = parse_numbers(df['market_value'])
+            keep = identifiers != ''
+            result["skipped"] = int((~keep).sum())
+            result["invalid"] = int((invalid & keep).sum())
+            if not keep.any():
+                result["errors"].append("The file contains no holdings")
+                return result
+
+            conn = get_connection()
+            exists = conn.execute(f"SELECT 1 FROM {store_table(Config.DB.ESG_TABLE)} WHERE id = ?",
+                                  (int(record_id),)).fetchone()
+            if not exists:
+                result["errors"].append(f"Record {record_id} does not exist")
+                return result
+
+            result["holdings"] = save_holdings(conn, record_id, identifiers[keep], market_values[keep], file_name)
+            conn.commit()
+
+            logger.info(f"Stored {result['holdings']} holdings of ESG record {record_id} from {file_name}")
+            result["success"] = True
+            return result
+        except Exception as e:
+            logger.error(f"Error uploading holdings for ESG record {record_id}: {str(e)}")
+            result["errors"].append(str(e))
+            return result
+        finally:
+            if conn:
+                conn.close()
+
+    def get_emissions_summary(self) -> Optional[Dict[str, Any]]:
+        """Describe the issuer emissions on file
+
+        Returns:
+            Optional[Dict[str, Any]]: See emissions_summary() (None if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return emissions_summary(conn)
+        except Exception as e:
+            logger.error(f"Error describing issuer emissions: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def get_portfolio_metrics(self) -> pd.DataFrame:
+        """Get the carbon metrics of every client portfolio
+
+        Metrics are cached per portfolio and (holdings version, emissions
+        version); only portfolios whose holdings or the emissions changed
+        since are recomputed, all in one vectorized pass.
+
+        Returns:
+            pd.DataFrame: record_id, client, data_source and METRIC_COLUMNS,
+            one row per portfolio (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            portfolios = list_portfolios(conn)
+            if portfolios.empty:
+                return pd.DataFrame(columns=['record_id', 'client', 'data_source'] + METRIC_COLUMNS)
+
+            current = emissions_version(conn)
+            versions = {int(record_id): (int(version), current)
+                        for record_id, version in zip(portfolios['record_id'], portfolios['version'])}
+            with _lock:
+                cached = {record_id: _metrics.get(record_id) for record_id in versions}
+            stale = [record_id for record_id, version in versions.items()
+                     if cached[record_id] is None or cached[record_id][0] != version]
+            for record_id in versions:
+                record_cache_lookup(CACHE_NAME, record_id not in stale)
+
+            if stale:
+                holdings = load_holdings(conn, stale)
+                computed = portfolio_metrics(
+                    holdings['record_id'].to_numpy(dtype=np.int64),
+                    holdings['identifier'].to_numpy(dtype=str),
+                    holdings['market_value'].to_numpy(dtype=np.float64, na_value=np.nan),
+                    _issuer_arrays(conn, current)
+                )
+                # Portfolios without holdings have no rows in the computed frame
+                computed = computed.reindex(stale)
+                computed[['holdings', 'matched']] = computed[['holdings', 'matched']].fillna(0)
+                logger.info(f"Computed the carbon metrics of {len(stale)} portfolios over "
+                            f"{len(holdings)} holdings (emissions version {current})")
+                with _lock:
+                    for record_id, row in computed.iterrows():
+                        cached[record_id] = (versions[record_id], row.to_dict())
+                        _metrics[record_id] = cached[record_id]
+
+            metrics = pd.DataFrame([cached[record_id][1] for record_id in portfolios['record_id']],
+                                   columns=METRIC_COLUMNS)
+            metrics[['holdings', 'matched']] = metrics[['holdings', 'matched']].astype(np.int64)
+            return pd.concat([portfolios[['record_id', 'client', 'data_source']], metrics], axis=1)
+        except Exception as e:
+            logger.error(f"Error computing portfolio carbon metrics: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
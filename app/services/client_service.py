@@ -0,0 +1,197 @@
+import sqlite3
+import logging
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Config
+from app.database import get_connection
+from app.utils.metrics import record_cache_lookup, connection_factory
+from app.utils.profiles import build_profiles
+from app.utils.typeahead import PrefixIndex
+from app.repositories.clients import client_cross_reference, client_names_version, client_name_keys, name_key
+from app.repositories.client_profiles import load_profile, stale_profile_ids, profile_inputs, save_profiles
+
+logger = logging.getLogger(__name__)
+
+# Metrics labels of the stored client profiles and the name typeahead
+PROFILE_CACHE = "client_profile"
+TYPEAHEAD_CACHE = "client_typeahead"
+
+# Prefix index of the client name keys and the client names, with the
+# version of the names it was built from. The version is read over a
+# connection kept open for it: a new connection per keystroke would cost
+# more (schema parsing) than the lookup itself.
+_typeahead: Dict[str, Any] = {"version": None, "index": None, "names": None, "conn": None}
+_lock = threading.Lock()
+
+
+def _rebuild_profiles(conn, client_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Build and store the profiles of clients (the caller commits)"""
+    client_ids = [int(client_id) for client_id in client_ids]
+    if not client_ids:
+        return {}
+    clients, esg, shariah = profile_inputs(conn, client_ids)
+    profiles = build_profiles(clients, esg, shariah, np.datetime64('today', 'D'))
+    built_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for profile in profiles.values():
+        profile["built_at"] = built_at
+    save_profiles(conn, profiles, client_ids)
+    return profiles
+
+
+def _names_version() -> int:
+    """Read the version of the client names over the typeahead's connection"""
+    with _lock:
+        if _typeahead["conn"] is None:
+            _typeahead["conn"] = sqlite3.connect(Config.DATABASE_PATH, check_same_thread=False,
+                                                 factory=connection_factory())
+        try:
+            return client_names_version(_typeahead["conn"])
+        except sqlite3.Error:
+            # Reopened on the next lookup
+            _typeahead["conn"].close()
+            _typeahead["conn"] = None
+            raise
+
+
+def _client_index() -> Tuple[PrefixIndex, Dict[int, str]]:
+    """Get the prefix index of the client names, rebuilding it once they changed"""
+    version = _names_version()
+    with _lock:
+        if _typeahead["version"] == version:
+            record_cache_lookup(TYPEAHEAD_CACHE, True)
+            return _typeahead["index"], _typeahead["names"]
+    record_cache_lookup(TYPEAHEAD_CACHE, False)
+    conn = get_connection()
+    try:
+        rows = client_name_keys(conn)
+    finally:
+        conn.close()
+    index = PrefixIndex((key, client_id) for key, client_id, _ in rows)
+    names = {client_id: name for _, client_id, name in rows}
+    with _lock:
+        _typeahead.update(version=version, index=index, names=names)
+    return index, names
+
+
+class ClientService:
+    """Service class for clients across the ESG and Shariah datasets"""
+
+    def get_cross_reference(self, both_only: bool = False) -> pd.DataFrame:
+        """Get the ESG and Shariah aggregates of every client side by side
+
+        Args:
+            both_only: Only clients with records in both datasets
+
+        Returns:
+            pd.DataFrame: One row per client (see client_cross_reference()),
+            empty if unavailable
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return client_cross_reference(conn, both_only)
+        except Exception as e:
+            logger.error(f"Error building the client cross-reference: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def search_clients(self, prefix: str, limit: int = 20) -> pd.DataFrame:
+        """Find clients by the start of their name
+
+        The prefix is normalized like stored names and looked up in the
+        in-memory prefix index, which is rebuilt whenever client names are
+        added or merged.
+
+        Args:
+            prefix: Start of the name, in any spelling
+            limit: Maximum number of clients
+
+        Returns:
+            pd.DataFrame: client_id and name, in name key order (empty if
+            nothing matches or unavailable)
+        """
+        try:
+            index, names = _client_index()
+            client_ids = index.search(name_key(prefix) if prefix.strip() else '', limit)
+            return pd.DataFrame({'client_id': client_ids, 'name': [names[client_id] for client_id in client_ids]})
+        except Exception as e:
+            logger.error(f"Error searching clients: {str(e)}")
+            return pd.DataFrame()
+
+    def suggest_names(self, prefix: str, limit: int = 10) -> List[str]:
+        """Get the names of the clients whose name starts with a prefix
+
+        Args:
+            prefix: Start of the name, in any spelling
+            limit: Maximum number of names
+
+        Returns:
+            List[str]: Client names (empty if nothing matches or unavailable)
+        """
+        matches = self.search_clients(prefix, limit)
+        return matches['name'].tolist() if not matches.empty else []
+
+    def get_profile(self, client_id: int) -> Optional[Dict[str, Any]]:
+        """Get the profile of a client
+
+        The stored profile is returned as it is unless a write since it was
+        built marked it stale or it was built before today (its migration
+        statuses are for the day it was built); it is then rebuilt from the
+        client's records (one query per table) and stored again.
+
+        Args:
+            client_id: Client ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The profile (see build_profiles()) with
+            "built_at", or None if the client does not exist or on error
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            stored = load_profile(conn, client_id)
+            if stored is not None and not stored[1]:
+                record_cache_lookup(PROFILE_CACHE, True)
+                return stored[0]
+
+            record_cache_lookup(PROFILE_CACHE, False)
+            start = time.perf_counter()
+            profile = _rebuild_profiles(conn, [client_id]).get(int(client_id))
+            conn.commit()
+            logger.info(f"Built the profile of client {client_id} in {time.perf_counter() - start:.3f}s")
+            return profile
+        except Exception as e:
+            logger.error(f"Error getting the profile of client {client_id}: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def refresh_profiles(self) -> int:
+        """Rebuild every stale or outdated client profile
+
+        Returns:
+            int: Number of profiles rebuilt (0 on error)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            client_ids = stale_profile_ids(conn)
+            rebuilt = len(_rebuild_profiles(conn, client_ids))
+            conn.commit()
+            return rebuilt
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Error refreshing client profiles: {str(e)}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
@@ -0,0 +1,262 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config import Config
+from app.database import get_connection
+from app.utils.identifiers import ID_TYPES
+from app.utils.delivery import FILE_FORMATS, split_fields, delivery_frame, write_delivery
+from app.utils.processes import process_pool
+from app.repositories.identifiers import load_identifier_set
+from app.repositories.screening import latest_screening_run, load_screening_results
+from app.repositories.deliveries import (
+    BUILT, SKIPPED, FAILED, delivery_inputs, last_builds, start_run, record_build, finish_run,
+    list_runs, run_builds
+)
+
+logger = logging.getLogger(__name__)
+
+# Part of every input hash: bump when the layout of the delivery files
+# changes so that all deliveries are rebuilt
+BUILDER_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _slug(value: Any) -> str:
+    """Make a value safe for a file name"""
+    return re.sub(r'[^A-Za-z0-9]+', '_', str(value or '')).strip('_') or 'delivery'
+
+
+def input_hash(inputs: pd.Series, file_format: str) -> str:
+    """Hash what a delivery file is built from
+
+    Covers the record's content hash and fields, the versions of its
+    identifier sets, its latest screening run and the file format.
+
+    Args:
+        inputs: Row of delivery_inputs()
+        file_format: Delivery file format
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    parts = [BUILDER_VERSION, file_format] + [
+        None if pd.isna(inputs[column]) else str(inputs[column])
+        for column in ('content_hash', 'fields', 'identifier_versions', 'screening_run')
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def _build_delivery(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one delivery file (runs in a worker process)
+
+    The file is written next to its final path and moved into place, so a
+    failed build leaves the previous file intact.
+
+    Args:
+        task: record_id, fields, file_path and file_format
+
+    Returns:
+        Dict[str, Any]: status, rows, columns, missing_fields, seconds and error
+    """
+    start = time.perf_counter()
+    conn = None
+    try:
+        conn = get_connection()
+        codes = {id_type: load_identifier_set(conn, Config.DB.SHARIAH_TABLE, task['record_id'], id_type)
+                 for id_type in ID_TYPES}
+        run = latest_screening_run(conn, task['record_id'])
+        screening = load_screening_results(conn, int(run['id'])) if run is not None else None
+        conn.close()
+        conn = None
+
+        df, missing = delivery_frame(codes, screening, task['fields'])
+        root, extension = os.path.splitext(task['file_path'])
+        partial = f"{root}.partial{extension}"
+        write_delivery(df, partial, task['file_format'])
+        os.replace(partial, task['file_path'])
+        return {
+            "status": BUILT,
+            "rows": len(df),
+            "columns": len(df.columns),
+            "missing_fields": ", ".join(missing),
+            "seconds": time.perf_counter() - start,
+            "error": None
+        }
+    except Exception as e:
+        return {"status": FAILED, "seconds": time.perf_counter() - start, "error": str(e)}
+    finally:
+        if conn:
+            conn.close()
+
+
+class DeliveryBuilder:
+    """Builds the delivery file of each Shariah client delivery
+
+    Each file has the delivery's requested fields as columns and one row
+    per security of its universe (see delivery_frame()). Deliveries whose
+    inputs hash to the same value as their last successful build, and whose
+    file is still there, are skipped. Files are built in a process pool;
+    every run is recorded as a manifest in the database and in
+    ``manifest.json`` of the output folder.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, file_format: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        """Initialize the builder
+
+        Args:
+            output_dir: Folder of the delivery files (default: Config.APP.DELIVERY_DIR)
+            file_format: "csv" or "xlsx" (default: Config.APP.DELIVERY_FORMAT)
+            max_workers: Worker processes (default: Config.APP.DELIVERY_MAX_WORKERS,
+                or one per CPU)
+        """
+        self.output_dir = output_dir or Config.APP.DELIVERY_DIR
+        self.file_format = (file_format or Config.APP.DELIVERY_FORMAT).lower()
+        if self.file_format not in FILE_FORMATS:
+            raise ValueError(f"Unknown delivery format: {self.file_format}")
+        self.max_workers = max_workers or Config.APP.DELIVERY_MAX_WORKERS or os.cpu_count() or 1
+
+    def file_path(self, inputs: pd.Series) -> str:
+        """Get the path of a delivery's file"""
+        name = f"{int(inputs['record_id'])}_{_slug(inputs['client'])}_{_slug(inputs['delivery_name'])}"
+        return os.path.join(self.output_dir, f"{name}.{self.file_format}")
+
+    def _run_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the files of the tasks, in a process pool when there are several"""
+        workers = min(self.max_workers, len(tasks))
+        if workers <= 1:
+            return [_build_delivery(task) for task in tasks]
+        logger.info(f"Building {len(tasks)} delivery files with {workers} processes")
+        with process_pool(workers) as executor:
+            return list(executor.map(_build_delivery, tasks))
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        """Write the manifest of a run to the output folder (replacing the previous one)"""
+        path = os.path.join(self.output_dir, MANIFEST_FILE)
+        with open(f"{path}.partial", 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(f"{path}.partial", path)
+
+    def build(self, record_ids: Optional[Iterable[int]] = None, force: bool = False) -> Dict[str, Any]:
+        """Build the delivery files whose inputs changed since their last build
+
+        Args:
+            record_ids: Only these Shariah records (default: all)
+            force: Rebuild unchanged deliveries too
+
+        Returns:
+            Dictionary (the run manifest) with "run_id", "seconds", the
+            number of deliveries "built", "skipped" and "failed", and
+            "deliveries" (one entry per delivery)
+        """
+        start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        conn = get_connection()
+        try:
+            inputs = delivery_inputs(conn, record_ids)
+            previous = last_builds(conn)
+            run_id = start_run(conn, self.file_format, self.output_dir, self.max_workers)
+            conn.commit()
+
+            deliveries = []
+            tasks = []
+            for _, row in inputs.iterrows():
+                record_id = int(row['record_id'])
+                delivery = {
+                    "record_id": record_id,
+                    "client": row['client'],
+                    "delivery_name": row['delivery_name'],
+                    "input_hash": input_hash(row, self.file_format),
+                    "file_path": self.file_path(row)
+                }
+                deliveries.append(delivery)
+                fields = split_fields(row['fields'])
+                if not fields:
+                    delivery.update(status=FAILED, error="The delivery has no fields")
+                elif (not force and previous.get(record_id) == (delivery["input_hash"], delivery["file_path"])
+                      and os.path.exists(delivery["file_path"])):
+                    delivery.update(status=SKIPPED)
+                else:
+                    tasks.append((delivery, {
+                        "record_id": record_id,
+                        "fields": fields,
+                        "file_path": delivery["file_path"],
+                        "file_format": self.file_format
+                    }))
+
+            for (delivery, _), outcome in zip(tasks, self._run_tasks([task for _, task in tasks])):
+                delivery.update(outcome)
+                if outcome["status"] == FAILED:
+                    logger.error(f"Error building the delivery of Shariah record {delivery['record_id']}: "
+                                 f"{outcome['error']}")
+
+            counts = {status: sum(delivery["status"] == status for delivery in deliveries)
+                      for status in (BUILT, SKIPPED, FAILED)}
+            seconds = time.perf_counter() - start
+            for delivery in deliveries:
+                record_build(conn, run_id, delivery)
+            finish_run(conn, run_id, counts, seconds)
+            conn.commit()
+
+            manifest = {
+                "run_id": run_id,
+                "file_format": self.file_format,
+                "output_dir": self.output_dir,
+                "workers": min(self.max_workers, max(len(tasks), 1)),
+                "seconds": seconds,
+                **counts,
+                "deliveries": deliveries
+            }
+            self._write_manifest(manifest)
+            logger.info(f"Delivery run {run_id}: {counts[BUILT]} built, {counts[SKIPPED]} unchanged, "
+                        f"{counts[FAILED]} failed in {seconds:.2f}s")
+            return manifest
+        finally:
+            conn.close()
+
+    def get_runs(self, limit: int = 20) -> pd.DataFrame:
+        """Get the latest build runs
+
+        Args:
+            limit: Number of runs
+
+        Returns:
+            pd.DataFrame: One row per run, newest first (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return list_runs(conn, limit)
+        except Exception as e:
+            logger.error(f"Error listing delivery runs: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def get_run_deliveries(self, run_id: int) -> pd.DataFrame:
+        """Get the deliveries of a run (its manifest)
+
+        Args:
+            run_id: Run ID
+
+        Returns:
+            pd.DataFrame: One row per delivery (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return run_builds(conn, run_id)
+        except Exception as e:
+            logger.error(f"Error reading delivery run {run_id}: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
@@ -2,9 +2,16 @@ import pandas as pd
 import logging
 from typing import List, Dict, Any, Optional, Union
 import os
+import time
 from datetime import datetime
 
+from app.config import Config
 from app.database import get_connection
+from app.utils.metrics import record_import
+from app.repositories.upsert import APPEND, REPLACE, IMPORT_MODES, LOADERS, NoValidRowsError, refresh_fingerprints
+from app.repositories.dimensions import dimension_columns, encode_values, encode_record, category_counts
+from app.repositories.identifiers import sync_identifier_counts
+from app.utils.error_report import ErrorReport
 from app.models.esg_model import ESGData, ESGAggregatedData
 from app.repositories.esg_repository import ESGRepository
 
@@ -14,14 +21,12 @@ def get_all_esg_data() -> pd.DataFrame:
     """Get all ESG data from the database
     
     Returns:
-        DataFrame containing all ESG data records
+        DataFrame containing all ESG data records, typed per the schema dtype
+        policy (categoricals for enumerations, Int32 for counts)
     """
     try:
-        conn = get_connection()
-        query = "SELECT * FROM esg_data"
-        df = pd.read_sql(query, conn)
-        conn.close()
-        return df
+        # Load through the columnar path so the frame uses the schema dtype policy
+        return ESGRepository().get_all()
     except Exception as e:
         logger.error(f"Error retrieving ESG data: {str(e)}")
         return pd.DataFrame()
@@ -35,20 +40,27 @@ def update_esg_data(updated_df: pd.DataFrame) -> bool:
     Returns:
         True if update was successful, False otherwise
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
+        record_ids = []
+        
+        # Enumerated values are stored as keys into their lookup tables (one lookup per distinct value)
+        keys = {col: encode_values(conn, col, updated_df[col].where(updated_df[col] != '')).tolist()
+                for col in dimension_columns(Config.DB.ESG_TABLE) if col in updated_df.columns}
         
-        for _, row in updated_df.iterrows():
+        for position, (_, row) in enumerate(updated_df.iterrows()):
             # Ensure numeric fields are properly converted
             sedol_count = int(row.get('sedol_count', 0) or 0)
             isin_count = int(row.get('isin_count', 0) or 0)
             cusip_count = int(row.get('cusip_count', 0) or 0)
+            row_keys = {col: values[position] for col, values in keys.items()}
             
-            query = """
-            UPDATE esg_data 
-            SET client = ?, fields = ?, data_type = ?, data_source = ?,
-                sedol_count = ?, isin_count = ?, cusip_count = ?, compliance = ?,
+            query = f"""
+            UPDATE {Config.DB.ESG_STORE_TABLE} 
+            SET client = ?, fields = ?, data_type_id = ?, data_source_id = ?,
+                sedol_count = ?, isin_count = ?, cusip_count = ?, compliance_id = ?,
                 updated_at = ?
             WHERE id = ?
             """
@@ -56,15 +68,22 @@ def update_esg_data(updated_df: pd.DataFrame) -> bool:
             cursor.execute(query, (
                 row.get('client', ''),
                 row.get('fields', ''),
-                row.get('data_type', ''),
-                row.get('data_source', ''),
+                row_keys.get('data_type'),
+                row_keys.get('data_source'),
                 sedol_count,
                 isin_count,
                 cusip_count,
-                row.get('compliance', ''),
+                row_keys.get('compliance'),
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 int(row['id'])
             ))
+            record_ids.append(int(row['id']))
+        
+        # Counts of records with uploaded identifiers are derived from them, not typed in
+        sync_identifier_counts(conn, Config.DB.ESG_TABLE, record_ids)
+        
+        # Edits can change the natural key or content of a row
+        refresh_fingerprints(conn, Config.DB.ESG_TABLE, record_ids)
         
         conn.commit()
         conn.close()
@@ -72,6 +91,10 @@ def update_esg_data(updated_df: pd.DataFrame) -> bool:
     except Exception as e:
         logger.error(f"Error updating ESG data: {str(e)}")
         return False
+    finally:
+        # Closing also rolls back a partially applied batch
+        if conn:
+            conn.close()
 
 def delete_esg_data(record_id: int) -> bool:
     """Delete ESG data record from the database
@@ -85,7 +108,7 @@ def delete_esg_data(record_id: int) -> bool:
     try:
         conn = get_connection()
         cursor = conn.cursor()
-        query = "DELETE FROM esg_data WHERE id = ?"
+        query = f"DELETE FROM {Config.DB.ESG_STORE_TABLE} WHERE id = ?"
         cursor.execute(query, (record_id,))
         conn.commit()
         
@@ -116,6 +139,7 @@ class ESGService:
         Returns:
             ID of the newly created record, or -1 if operation failed
         """
+        conn = None
         try:
             # Ensure numeric fields are properly converted
             sedol_count = int(esg_data.get('sedol_count', 0) or 0)
@@ -125,32 +149,31 @@ class ESGService:
             conn = get_connection()
             cursor = conn.cursor()
             
-            # Insert new record
+            # Insert new record (enumerated values as keys into their lookup tables)
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            query = """
-            INSERT INTO esg_data (
-                client, fields, data_type, data_source, 
-                sedol_count, isin_count, cusip_count, compliance,
-                created_at, updated_at
-            ) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            record = encode_record(conn, Config.DB.ESG_TABLE, {
+                'client': esg_data.get('client', ''),
+                'fields': esg_data.get('fields', ''),
+                'data_type': esg_data.get('data_type', ''),
+                'data_source': esg_data.get('data_source', ''),
+                'sedol_count': sedol_count,
+                'isin_count': isin_count,
+                'cusip_count': cusip_count,
+                'compliance': esg_data.get('compliance', ''),
+                'created_at': now,
+                'updated_at': now
+            })
+            query = f"""
+            INSERT INTO {Config.DB.ESG_STORE_TABLE} ({', '.join(record)}) 
+            VALUES ({', '.join(['?'] * len(record))})
             """
             
-            cursor.execute(query, (
-                esg_data.get('client', ''),
-                esg_data.get('fields', ''),
-                esg_data.get('data_type', ''),
-                esg_data.get('data_source', ''),
-                sedol_count,
-                isin_count,
-                cusip_count,
-                esg_data.get('compliance', ''),
-                now,
-                now
-            ))
+            cursor.execute(query, list(record.values()))
             
-            conn.commit()
             record_id = cursor.lastrowid
+            # Fails with an IntegrityError if a record with the same natural key exists
+            refresh_fingerprints(conn, Config.DB.ESG_TABLE, [record_id])
+            conn.commit()
             conn.close()
             
             # Log successful insertion
@@ -160,6 +183,9 @@ class ESGService:
         except Exception as e:
             logger.error(f"Error adding ESG data: {str(e)}")
             return -1
+        finally:
+            if conn:
+                conn.close()
     
     def get_esg_data_by_id(self, record_id: int) -> Optional[Dict[str, Any]]:
         """Get ESG data by ID
@@ -184,83 +210,78 @@ class ESGService:
             logger.error(f"Error retrieving ESG data by ID: {str(e)}")
             return None
     
-    def import_esg_data_from_df(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def import_esg_data_from_df(self, df: pd.DataFrame, mode: str = APPEND) -> Dict[str, Any]:
         """Import ESG data from a DataFrame
         
         Args:
             df: DataFrame containing ESG data to import
+            mode: "append" inserts every row; "upsert" inserts or updates rows by
+                natural key (client, fields and data source) and leaves unchanged rows untouched;
+                "replace" makes the table match the file in one transaction
             
         Returns:
             Dictionary with results of the import operation
         """
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"Unknown import mode: {mode}")
+        return self._load_esg_data_from_df(df, mode)
+    
+    def _load_esg_data_from_df(self, df: pd.DataFrame, mode: str) -> Dict[str, Any]:
+        """Validate and load ESG data with the loader of the import mode
+        
+        Args:
+            df: DataFrame containing ESG data to import
+            mode: "append", "upsert" (insert or update in a single pass) or
+                "replace" (staged insert/update/delete diff applied in one transaction)
+            
+        Returns:
+            Dictionary with results of the import operation
+        """
+        conn = None
         try:
+            start_time = time.perf_counter()
             conn = get_connection()
-            cursor = conn.cursor()
+            counts = LOADERS[mode](conn, Config.DB.ESG_TABLE, df)
+            conn.commit()
             
-            # Track import results
-            records_added = 0
-            records_skipped = 0
-            errors = []
+            # Rejected and duplicate rows go to a bounded report spilled to disk
+            report = ErrorReport()
+            report.add(counts["errors"])
+            # Appended duplicates are loaded (unkeyed); the other modes leave them out
+            records_skipped = counts["rejected"] + (counts["duplicates"] if mode != APPEND else 0)
             
-            for _, row in df.iterrows():
-                try:
-                    # Validate required fields
-                    if not row.get('client') or pd.isna(row.get('client')):
-                        records_skipped += 1
-                        errors.append(f"Row skipped: Missing client name")
-                        continue
-                    
-                    # Ensure numeric fields are properly converted
-                    sedol_count = int(row.get('sedol_count', 0) or 0)
-                    isin_count = int(row.get('isin_count', 0) or 0)
-                    cusip_count = int(row.get('cusip_count', 0) or 0)
-                    
-                    # Insert new record
-                    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    query = """
-                    INSERT INTO esg_data (
-                        client, fields, data_type, data_source, 
-                        sedol_count, isin_count, cusip_count, compliance,
-                        created_at, updated_at
-                    ) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-                    
-                    cursor.execute(query, (
-                        row.get('client', ''),
-                        row.get('fields', ''),
-                        row.get('data_type', ''),
-                        row.get('data_source', ''),
-                        sedol_count,
-                        isin_count,
-                        cusip_count,
-                        row.get('compliance', ''),
-                        now,
-                        now
-                    ))
-                    
-                    records_added += 1
-                except Exception as row_error:
-                    records_skipped += 1
-                    errors.append(f"Error in row: {str(row_error)}")
+            record_import("esg", counts["inserted"] + counts["updated"], records_skipped,
+                          time.perf_counter() - start_time, rows_unchanged=counts["unchanged"])
             
-            conn.commit()
-            conn.close()
-            
-            return {
+            result = {
                 "success": True,
-                "records_added": records_added,
+                "records_added": counts["inserted"],
+                "records_updated": counts["updated"],
+                "records_unchanged": counts["unchanged"],
                 "records_skipped": records_skipped,
-                "errors": errors
+                "errors": [],
+                "error_report": report
             }
+            if mode == REPLACE:
+                result["records_deleted"] = counts["deleted"]
+            return result
         except Exception as e:
-            logger.error(f"Error importing ESG data: {str(e)}")
+            logger.error(f"Error importing ESG data ({mode}): {str(e)}")
+            report = ErrorReport()
+            if isinstance(e, NoValidRowsError):
+                report.add(e.errors)
             return {
                 "success": False,
                 "records_added": 0,
+                "records_updated": 0,
+                "records_unchanged": 0,
                 "records_skipped": 0,
-                "errors": [str(e)]
+                "errors": [str(e)],
+                "error_report": report
             }
+        finally:
+            if conn:
+                conn.close()
     
     def get_esg_metrics(self) -> Dict[str, Any]:
         """Get metrics for ESG data in the database
@@ -276,31 +297,20 @@ class ESGService:
             df_total = pd.read_sql(query_total, conn)
             total_records = int(df_total.iloc[0]['count']) if not df_total.empty else 0
             
-            # Unique clients
-            query_clients = "SELECT COUNT(DISTINCT client) as count FROM esg_data"
+            # Unique clients (spelling variants share a client_id)
+            query_clients = "SELECT COUNT(DISTINCT COALESCE(client_id, client)) as count FROM esg_data"
             df_clients = pd.read_sql(query_clients, conn)
             unique_clients = int(df_clients.iloc[0]['count']) if not df_clients.empty else 0
             
-            # Compliance breakdown
-            query_compliance = "SELECT compliance, COUNT(*) as count FROM esg_data GROUP BY compliance"
-            df_compliance = pd.read_sql(query_compliance, conn)
-            
-            # Data source breakdown
-            query_source = "SELECT data_source, COUNT(*) as count FROM esg_data GROUP BY data_source"
-            df_source = pd.read_sql(query_source, conn)
+            # Compliance and data source breakdowns (grouped on the integer keys)
+            compliance_counts = category_counts(conn, Config.DB.ESG_TABLE, 'compliance')
+            source_counts = category_counts(conn, Config.DB.ESG_TABLE, 'data_source')
             
             conn.close()
             
             # Format results
-            compliance_data = {}
-            for _, row in df_compliance.iterrows():
-                if not pd.isna(row['compliance']) and row['compliance']:
-                    compliance_data[row['compliance']] = int(row['count'])
-                
-            source_data = {}
-            for _, row in df_source.iterrows():
-                if not pd.isna(row['data_source']) and row['data_source']:
-                    source_data[row['data_source']] = int(row['count'])
+            compliance_data = {value: count for value, count in compliance_counts.items() if value}
+            source_data = {value: count for value, count in source_counts.items() if value}
             
             return {
                 "total_records": total_records,
@@ -324,22 +334,24 @@ class ESGService:
             List of ESGAggregatedData objects
         """
         try:
-            df = self.repository.get_aggregated_data()
-            
-            if df.empty:
-                return []
-                
-            # Convert DataFrame rows to ESGAggregatedData objects
-            aggregated_data = []
-            for _, row in df.iterrows():
-                data_dict = row.to_dict()
-                aggregated_data.append(ESGAggregatedData.from_dict(data_dict))
-                
-            return aggregated_data
+            # Models are built straight from the cursor, without an intermediate DataFrame
+            return list(self.repository.iter_aggregated())
         except Exception as e:
             logger.error(f"Error getting aggregated ESG data: {str(e)}")
             return []
             
+    def get_aggregated_frame(self) -> pd.DataFrame:
+        """Get aggregated ESG data by client as a DataFrame for display
+        
+        Returns:
+            pd.DataFrame: Aggregated ESG data (empty if unavailable)
+        """
+        try:
+            return self.repository.get_aggregated_data()
+        except Exception as e:
+            logger.error(f"Error getting aggregated ESG data: {str(e)}")
+            return pd.DataFrame()
+            
     def get_compliance_summary(self) -> Dict[str, int]:
         """Get a summary of compliance status
         
@@ -352,13 +364,14 @@ class ESGService:
             logger.error(f"Error getting ESG compliance summary: {str(e)}")
             return {}
             
-    def bulk_import_esg_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def bulk_import_esg_data(self, df: pd.DataFrame, mode: str = APPEND) -> Dict[str, Any]:
         """Import ESG data from a DataFrame (bulk upload)
         
         Args:
             df: DataFrame containing ESG data to import
+            mode: Import mode ("append", "upsert" or "replace")
             
         Returns:
             Dictionary with results of the import operation
         """
-        return self.import_esg_data_from_df(df) 
\ No newline at end of file
+        return self.import_esg_data_from_df(df, mode) 
\ No newline at end of file
@@ -0,0 +1,261 @@
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Tuple
+
+from app.config import Config
+from app.database import get_connection
+from app.utils.metrics import record_cache_lookup
+from app.utils.identifiers import (
+    ID_TYPES, encode_identifiers, decode_identifiers, derive_identifiers, read_identifier_file
+)
+from app.repositories.dimensions import store_table
+from app.repositories.identifiers import (
+    IDENTIFIER_TABLES, save_identifier_set, load_identifier_set, list_identifier_sets,
+    sync_identifier_counts, identifier_sets_version, distinct_identifier_counts,
+    client_set_owners, client_universes
+)
+from app.utils.overlap import build_bitmaps, overlap_matrix
+
+logger = logging.getLogger(__name__)
+
+# Metrics labels of the result caches
+COVERAGE_CACHE = "identifier_coverage"
+OVERLAP_CACHE = "universe_overlap"
+
+# Results derived from the identifier sets, by (cache, dataset, ...) key,
+# with the version of the sets they were computed from
+_results: Dict[Tuple[str, ...], Tuple[Any, Any]] = {}
+_results_lock = threading.Lock()
+
+
+def _cached(key: Tuple[str, ...], version: Any, build: Callable[[], Any]) -> Any:
+    """Get a result computed from the identifier sets, rebuilding it once they changed
+
+    Args:
+        key: Cache name (the metrics label) followed by what the result is for
+        version: Value that changes whenever the sets the result reads change
+        build: Computes the result
+
+    Returns:
+        Any: Cached or freshly built result (shared; do not modify)
+    """
+    with _results_lock:
+        cached = _results.get(key)
+    if cached is not None and cached[0] == version:
+        record_cache_lookup(key[0], True)
+        return cached[1]
+
+    record_cache_lookup(key[0], False)
+    result = build()
+    with _results_lock:
+        _results[key] = (version, result)
+    return result
+
+
+class IdentifierService:
+    """Service class for the identifiers delivered per record"""
+
+    def __init__(self, table: str):
+        """Initialize the service for one dataset
+
+        Args:
+            table: Dataset table name (Config.DB.ESG_TABLE or SHARIAH_TABLE)
+        """
+        if table not in IDENTIFIER_TABLES:
+            raise ValueError(f"Table {table} has no identifier sets")
+        self.table = table
+
+    def upload_identifiers(self, record_id: int, file_name: str, data: bytes) -> Dict[str, Any]:
+        """Store the identifiers of a delivery from a CSV file
+
+        Identifiers failing their check digit are rejected; numeric SEDOLs
+        and CUSIPs that lost their leading zeros are repaired. The CUSIPs of
+        US/CA ISINs and the SEDOLs of GB/IE ISINs are derived and added to
+        the sets of those types. Each identifier type found in (or derived
+        from) the file replaces the record's set of that type; the record's
+        counts are updated from the stored sets. Other types are left as
+        they are.
+
+        Args:
+            record_id: Record (delivery) the identifiers belong to
+            file_name: Uploaded file name
+            data: CSV file contents (see read_identifier_file())
+
+        Returns:
+            Dictionary with "success", the stored "counts" per type, the
+            number of "invalid" values with an "invalid_sample", the number
+            of "repaired" values, the identifiers "derived" per type, and
+            "errors"
+        """
+        conn = None
+        invalid = []
+        try:
+            by_type, unknown = read_identifier_file(data)
+            invalid.extend(unknown.tolist())
+            encoded = {}
+            repaired = 0
+            for id_type, values in by_type.items():
+                codes, rejected, fixed = encode_identifiers(values, id_type)
+                invalid.extend(rejected.tolist())
+                repaired += fixed
+                if len(codes):
+                    encoded[id_type] = codes
+
+            # Codes embedded in the ISINs that the file does not list itself
+            derived = {}
+            if 'isin' in encoded:
+                for id_type, codes in derive_identifiers(encoded['isin']).items():
+                    known = encoded.get(id_type, np.empty(0, dtype=np.int64))
+                    added = np.setdiff1d(codes, known, assume_unique=True)
+                    if len(added):
+                        derived[id_type] = len(added)
+                        encoded[id_type] = np.union1d(known, added)
+
+            result = {
+                "success": False,
+                "counts": {},
+                "invalid": len(invalid),
+                "invalid_sample": invalid[:Config.APP.ERROR_SAMPLE_SIZE],
+                "repaired": repaired,
+                "derived": derived,
+                "errors": []
+            }
+            if not encoded:
+                result["errors"].append("The file contains no valid SEDOL, ISIN or CUSIP (check digits included)")
+                return result
+
+            conn = get_connection()
+            exists = conn.execute(f"SELECT 1 FROM {store_table(self.table)} WHERE id = ?", (int(record_id),)).fetchone()
+            if not exists:
+                result["errors"].append(f"Record {record_id} does not exist")
+                return result
+
+            for id_type, codes in encoded.items():
+                result["counts"][id_type] = save_identifier_set(conn, self.table, record_id, id_type, codes, file_name)
+            sync_identifier_counts(conn, self.table, [record_id])
+            conn.commit()
+
+            logger.info(f"Stored identifiers of {self.table} record {record_id} from {file_name}: "
+                        f"{result['counts']} ({len(invalid)} invalid, {repaired} repaired, {derived} derived)")
+            result["success"] = True
+            return result
+        except Exception as e:
+            logger.error(f"Error uploading identifiers for {self.table} record {record_id}: {str(e)}")
+            return {
+                "success": False,
+                "counts": {},
+                "invalid": len(invalid),
+                "invalid_sample": invalid[:Config.APP.ERROR_SAMPLE_SIZE],
+                "repaired": 0,
+                "derived": {},
+                "errors": [str(e)]
+            }
+        finally:
+            if conn:
+                conn.close()
+
+    def get_identifier_sets(self) -> pd.DataFrame:
+        """Get the uploaded identifier sets of the dataset
+
+        Returns:
+            pd.DataFrame: One row per record and type (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return list_identifier_sets(conn, self.table)
+        except Exception as e:
+            logger.error(f"Error listing identifier sets of {self.table}: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def export_identifiers(self, record_id: int) -> pd.DataFrame:
+        """Get the identifiers stored for a record
+
+        Args:
+            record_id: Record ID
+
+        Returns:
+            pd.DataFrame: id_type and identifier columns, sorted (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            frames = []
+            for id_type in ID_TYPES:
+                codes = load_identifier_set(conn, self.table, record_id, id_type)
+                if len(codes):
+                    frames.append(pd.DataFrame({'id_type': id_type, 'identifier': decode_identifiers(codes, id_type)}))
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['id_type', 'identifier'])
+        except Exception as e:
+            logger.error(f"Error exporting identifiers of {self.table} record {record_id}: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def get_coverage(self) -> Dict[str, int]:
+        """Count the distinct identifiers of each type over all deliveries
+
+        The counts are cached per dataset and recomputed only after the
+        sets have changed (checked with one small query).
+
+        Returns:
+            Dict[str, int]: Distinct identifiers per type (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            version = identifier_sets_version(conn, self.table)
+            return dict(_cached((COVERAGE_CACHE, self.table), version,
+                                lambda: distinct_identifier_counts(conn, self.table)))
+        except Exception as e:
+            logger.error(f"Error getting identifier coverage of {self.table}: {str(e)}")
+            return {}
+        finally:
+            if conn:
+                conn.close()
+
+    def get_universe_overlap(self, id_type: str = 'isin') -> pd.DataFrame:
+        """Count the securities shared by each pair of clients
+
+        A client's universe is the union of the identifiers of its
+        deliveries. Every universe becomes a bitmap over the index of all
+        securities delivered, and the client x client matrix is computed
+        from popcounts of the bitmaps ANDed pairwise. The matrix is cached
+        until a set of the type changes or moves to another client.
+
+        Args:
+            id_type: Identifier type the universes are compared on
+
+        Returns:
+            pd.DataFrame: Shared securities, one row and one column per client
+            with uploaded identifiers (the diagonal holds the universe sizes);
+            empty if unavailable
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            owners = client_set_owners(conn, self.table, id_type)
+            version = (identifier_sets_version(conn, self.table),
+                       tuple(zip(owners['record_id'].tolist(), owners['client_id'].tolist())))
+
+            def build() -> pd.DataFrame:
+                universes = client_universes(conn, self.table, id_type, owners)
+                bitmaps, index = build_bitmaps(list(universes.values()))
+                logger.info(f"Computed the universe overlap of {len(universes)} {self.table} clients "
+                            f"over {len(index)} securities ({id_type})")
+                clients = list(universes)
+                return pd.DataFrame(overlap_matrix(bitmaps), index=clients, columns=clients)
+
+            return _cached((OVERLAP_CACHE, self.table, id_type), version, build)
+        except Exception as e:
+            logger.error(f"Error computing the universe overlap of {self.table}: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
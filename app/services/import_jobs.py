@@ -0,0 +1,458 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+import pandas as pd
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.config import Config
+from app.database import get_connection
+from app.utils.metrics import record_import
+from app.repositories.upsert import APPEND, REPLACE, IMPORT_MODES, LOADERS, NoValidRowsError
+from app.utils.error_report import ErrorReport, purge_error_reports
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Target table per dataset
+DATASET_TABLES = {
+    "esg": Config.DB.ESG_TABLE,
+    "shariah": Config.DB.SHARIAH_TABLE
+}
+
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_wake = threading.Event()
+
+
+def _now() -> str:
+    """Current local time in the format stored in the jobs table"""
+    return datetime.now().strftime(_TIMESTAMP_FORMAT)
+
+
+def submit_import_job(dataset: str, df: pd.DataFrame, mode: str = APPEND,
+                      file_name: Optional[str] = None) -> int:
+    """Queue an import to run on the background worker
+
+    The rows are written to a payload file under Config.APP.IMPORT_JOBS_DIR
+    so the job survives session disconnects and restarts.
+
+    Args:
+        dataset: Dataset name ("esg" or "shariah")
+        df: Rows to import, with database column names
+        mode: Import mode ("append", "upsert" or "replace")
+        file_name: Name of the uploaded file, for display
+
+    Returns:
+        int: Job ID
+    """
+    if dataset not in DATASET_TABLES:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode}")
+
+    os.makedirs(Config.APP.IMPORT_JOBS_DIR, exist_ok=True)
+    payload_path = os.path.join(Config.APP.IMPORT_JOBS_DIR, f"{uuid.uuid4().hex}.pkl")
+    df.reset_index(drop=True).to_pickle(payload_path)
+
+    conn = None
+    try:
+        conn = get_connection()
+        now = _now()
+        cursor = conn.execute("""
+            INSERT INTO import_jobs (dataset, mode, file_name, payload_path, status, total_rows, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (dataset, mode, file_name, payload_path, QUEUED, len(df), now, now))
+        conn.commit()
+        job_id = cursor.lastrowid
+    except sqlite3.Error:
+        os.remove(payload_path)
+        raise
+    finally:
+        if conn:
+            conn.close()
+
+    logger.info(f"Queued {mode} import job {job_id} for {dataset} ({len(df)} rows)")
+    _wake.set()
+    return job_id
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    """Get the state of an import job
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Optional[Dict[str, Any]]: Job row, or None if not found
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+    except sqlite3.Error as e:
+        logger.error(f"Error getting import job {job_id}: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def list_jobs(dataset: Optional[str] = None, limit: int = 10) -> pd.DataFrame:
+    """Get the most recent import jobs
+
+    Args:
+        dataset: Optional dataset filter
+        limit: Maximum number of jobs
+
+    Returns:
+        pd.DataFrame: Jobs, newest first
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        if dataset:
+            return pd.read_sql("SELECT * FROM import_jobs WHERE dataset = ? ORDER BY id DESC LIMIT ?",
+                               conn, params=(dataset, limit))
+        return pd.read_sql("SELECT * FROM import_jobs ORDER BY id DESC LIMIT ?", conn, params=(limit,))
+    except Exception as e:
+        logger.error(f"Error listing import jobs: {e}")
+        return pd.DataFrame()
+    finally:
+        if conn:
+            conn.close()
+
+
+def job_error_report(job: Dict[str, Any]) -> Optional[ErrorReport]:
+    """Get the error report of a job
+
+    Args:
+        job: Job row
+
+    Returns:
+        Optional[ErrorReport]: Report of the rows left out, or None if the
+            job has not rejected any row
+    """
+    if not job.get("error_report"):
+        return None
+    return ErrorReport.from_dict(json.loads(job["error_report"]))
+
+
+def _report_path(job_id: int) -> str:
+    """File the error report entries of a job are spilled to"""
+    return os.path.join(Config.APP.ERROR_REPORTS_DIR, f"job_{job_id}.csv.gz")
+
+
+def job_result(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a job row to the result dictionary returned by synchronous imports
+
+    Args:
+        job: Job row
+
+    Returns:
+        Dict[str, Any]: Import result
+    """
+    result = {
+        "success": job["status"] == COMPLETED,
+        "records_added": job["records_added"],
+        "records_updated": job["records_updated"],
+        "records_unchanged": job["records_unchanged"],
+        "records_skipped": job["records_skipped"],
+        "errors": [job["error"]] if job.get("error") else [],
+        "error_report": job_error_report(job)
+    }
+    if job["mode"] == REPLACE:
+        result["records_deleted"] = job["records_deleted"]
+    return result
+
+
+def requeue_stale_jobs() -> int:
+    """Requeue running jobs whose worker stopped reporting progress
+
+    A running job's updated_at is refreshed by its worker's heartbeat (see
+    _heartbeat()) and with every committed chunk, so a running job that has
+    not moved for IMPORT_JOB_STALE_SECONDS belonged to a worker that crashed
+    or was restarted. It resumes from its checkpoint.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    cutoff = (datetime.now() - timedelta(seconds=Config.APP.IMPORT_JOB_STALE_SECONDS)).strftime(_TIMESTAMP_FORMAT)
+    conn = None
+    try:
+        conn = get_connection()
+        cursor = conn.execute(
+            "UPDATE import_jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+            (QUEUED, _now(), RUNNING, cutoff)
+        )
+        conn.commit()
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} interrupted import jobs")
+        return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error(f"Error requeuing import jobs: {e}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+
+def _claim_next_job(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+    """Mark the oldest queued job as running
+
+    Args:
+        conn: Database connection
+
+    Returns:
+        Optional[Dict[str, Any]]: Claimed job row, or None if the queue is empty
+    """
+    while True:
+        row = conn.execute(
+            "SELECT * FROM import_jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = _now()
+        cursor = conn.execute("""
+            UPDATE import_jobs SET status = ?, started_at = COALESCE(started_at, ?), updated_at = ?
+            WHERE id = ? AND status = ?
+        """, (RUNNING, now, now, row['id'], QUEUED))
+        conn.commit()
+        # Another worker may have claimed it first
+        if cursor.rowcount:
+            return dict(row)
+
+
+def _remove_payload(job: Dict[str, Any]):
+    """Delete the payload file of a finished job (it is never run again)"""
+    try:
+        os.remove(job['payload_path'])
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove payload of import job {job['id']}: {e}")
+
+
+def purge_finished_payloads() -> int:
+    """Delete payload files left behind by completed and failed jobs
+
+    Returns:
+        int: Number of files deleted
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        rows = conn.execute(
+            "SELECT id, payload_path FROM import_jobs WHERE status IN (?, ?)", (COMPLETED, FAILED)
+        ).fetchall()
+    except sqlite3.Error as e:
+        logger.error(f"Error listing finished import jobs: {e}")
+        return 0
+    finally:
+        if conn:
+            conn.close()
+
+    purged = 0
+    for job_id, payload_path in rows:
+        if os.path.exists(payload_path):
+            _remove_payload({'id': job_id, 'payload_path': payload_path})
+            purged += not os.path.exists(payload_path)
+    if purged:
+        logger.info(f"Removed {purged} payloads of finished import jobs")
+    return purged
+
+
+def _heartbeat_loop(job_id: int, stop: threading.Event):
+    """Refresh the updated_at of a running job until stop is set"""
+    interval = max(Config.APP.IMPORT_JOB_STALE_SECONDS / 4, 1)
+    while not stop.wait(interval):
+        conn = None
+        try:
+            conn = get_connection()
+            conn.execute("UPDATE import_jobs SET updated_at = ? WHERE id = ? AND status = ?",
+                         (_now(), job_id, RUNNING))
+            conn.commit()
+        except sqlite3.Error as e:
+            # Busy while the job's own write transaction holds the lock, which keeps others from requeuing it too
+            logger.debug(f"Heartbeat of import job {job_id} skipped: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+
+@contextmanager
+def _heartbeat(job_id: int):
+    """Keep a job from looking stale while it runs
+
+    Replace jobs load in a single chunk, so without a heartbeat a long load
+    would be requeued (and run again) by another process sharing the
+    database after IMPORT_JOB_STALE_SECONDS.
+
+    Args:
+        job_id: Job ID
+    """
+    stop = threading.Event()
+    thread = threading.Thread(target=_heartbeat_loop, args=(job_id, stop),
+                              name=f"import-heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _run_job(conn: sqlite3.Connection, job: Dict[str, Any]):
+    """Process a claimed job from its checkpoint
+
+    Each chunk is loaded and the job's counters and checkpoint are updated in
+    the same transaction, so a crash never loses or repeats committed rows.
+    Replace jobs run as a single chunk since they must be all-or-nothing.
+    Rejected rows are summarized in the job row and their entries appended
+    to the job's error report file once the chunk has committed.
+
+    Args:
+        conn: Database connection
+        job: Claimed job row
+    """
+    job_id = job['id']
+    table = DATASET_TABLES[job['dataset']]
+    load = LOADERS[job['mode']]
+    start_time = time.perf_counter()
+
+    df = pd.read_pickle(job['payload_path'])
+    chunk_size = len(df) if job['mode'] == REPLACE else max(Config.APP.IMPORT_CHUNK_SIZE, 1)
+    report = job_error_report(job) or ErrorReport(path=_report_path(job_id))
+    offset = job['checkpoint_offset']
+    if offset:
+        logger.info(f"Resuming import job {job_id} at row {offset}")
+
+    while offset < len(df):
+        chunk = df.iloc[offset:offset + chunk_size]
+        counts = load(conn, table, chunk)
+        offset += len(chunk)
+        report.record(counts['errors'])
+        # Appended duplicates are loaded (unkeyed); the other modes leave them out
+        skipped = counts['rejected'] + (counts['duplicates'] if job['mode'] != APPEND else 0)
+        conn.execute("""
+            UPDATE import_jobs SET
+                rows_processed = ?, checkpoint_offset = ?,
+                records_added = records_added + ?, records_updated = records_updated + ?,
+                records_unchanged = records_unchanged + ?, records_deleted = records_deleted + ?,
+                records_skipped = records_skipped + ?, error_report = ?, updated_at = ?
+            WHERE id = ?
+        """, (offset, offset, counts['inserted'], counts['updated'], counts['unchanged'],
+              counts.get('deleted', 0), skipped,
+              json.dumps(report.to_dict()) if report.total else None, _now(), job_id))
+        conn.commit()
+        report.spill(counts['errors'])
+
+    now = _now()
+    conn.execute(
+        "UPDATE import_jobs SET status = ?, finished_at = ?, updated_at = ? WHERE id = ?",
+        (COMPLETED, now, now, job_id)
+    )
+    conn.commit()
+
+    finished = dict(conn.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,)).fetchone())
+    record_import(job['dataset'], finished['records_added'] + finished['records_updated'],
+                  finished['records_skipped'], time.perf_counter() - start_time,
+                  rows_unchanged=finished['records_unchanged'])
+    logger.info(f"Import job {job_id} completed ({offset} rows)")
+    _remove_payload(job)
+
+
+def run_next_job() -> bool:
+    """Claim and process the oldest queued job
+
+    Returns:
+        bool: True if a job was processed (successfully or not)
+    """
+    conn = None
+    job = None
+    try:
+        conn = get_connection()
+        conn.row_factory = sqlite3.Row
+        job = _claim_next_job(conn)
+        if job is None:
+            return False
+        with _heartbeat(job['id']):
+            _run_job(conn, job)
+        return True
+    except Exception as e:
+        logger.exception(f"Import job {job['id'] if job else '?'} failed")
+        if conn and job:
+            conn.rollback()
+            error_report = None
+            if isinstance(e, NoValidRowsError):
+                report = ErrorReport(path=_report_path(job['id']))
+                report.add(e.errors)
+                error_report = json.dumps(report.to_dict())
+            now = _now()
+            conn.execute("""
+                UPDATE import_jobs SET status = ?, error = ?, error_report = COALESCE(?, error_report),
+                    finished_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (FAILED, str(e), error_report, now, now, job['id']))
+            conn.commit()
+            # Failed jobs are not retried
+            _remove_payload(job)
+        return job is not None
+    finally:
+        if conn:
+            conn.close()
+
+
+def _worker_loop():
+    """Process queued jobs until the process exits"""
+    purge_error_reports()
+    purge_finished_payloads()
+    requeue_stale_jobs()
+    last_requeue = time.monotonic()
+    while True:
+        try:
+            if run_next_job():
+                continue
+        except Exception as e:
+            logger.error(f"Import worker error: {e}")
+        _wake.wait(Config.APP.IMPORT_JOB_POLL_SECONDS)
+        _wake.clear()
+        # Pick up jobs abandoned by other processes sharing the database
+        if time.monotonic() - last_requeue > Config.APP.IMPORT_JOB_STALE_SECONDS / 2:
+            requeue_stale_jobs()
+            last_requeue = time.monotonic()
+
+
+def start_import_worker() -> bool:
+    """Start the background import worker thread
+
+    Safe to call more than once; only the first call starts a worker.
+
+    Returns:
+        bool: True if the worker is running
+    """
+    global _worker
+
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return True
+        _worker = threading.Thread(target=_worker_loop, name="import-worker", daemon=True)
+        _worker.start()
+
+    logger.info("Import worker started")
+    return True
\ No newline at end of file
@@ -0,0 +1,294 @@
+import os
+import io
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import Config
+from app.database import get_connection
+from app.repositories.upsert import IMPORT_MODES
+from app.models.schema import ESG_REQUIRED, SHARIAH_REQUIRED
+from app.services.esg_service import ESGService
+from app.services.shariah_service import ShariahService
+from app.utils.data_helpers import normalize_column_names
+from app.utils.upload_cache import file_hash
+from app.utils.workbook import read_workbook
+
+logger = logging.getLogger(__name__)
+
+# Outcome of an ingested file
+IMPORTED = "imported"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+
+# Dataset subfolders of the drop folder, with the columns a file must have
+DATASETS = ("esg", "shariah")
+REQUIRED_COLUMNS = {
+    "esg": ESG_REQUIRED,
+    "shariah": SHARIAH_REQUIRED
+}
+
+ARCHIVE_DIR = "archive"
+QUARANTINE_DIR = "quarantine"
+
+FILE_EXTENSIONS = ('.csv', '.xlsx')
+
+# SQLite allows one writer at a time: workers parse files in parallel but load them in turn
+_write_lock = threading.Lock()
+
+
+def _import(dataset: str, df: pd.DataFrame, mode: str) -> Dict[str, Any]:
+    """Import rows through the service layer"""
+    with _write_lock:
+        if dataset == "esg":
+            return ESGService().import_esg_data_from_df(df, mode)
+        return ShariahService().import_shariah_data_from_df(df, mode)
+
+
+def _parse(dataset: str, path: str, data: bytes) -> pd.DataFrame:
+    """Parse a dropped file with database column names (every sheet of a workbook)
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    if path.lower().endswith('.csv'):
+        df = pd.read_csv(io.BytesIO(data))
+    else:
+        df = read_workbook(data)
+    df = normalize_column_names(df)
+
+    missing = [col for col in REQUIRED_COLUMNS[dataset] if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return df
+
+
+def _parse_timed(dataset: str, path: str, data: bytes) -> Tuple[pd.DataFrame, float]:
+    """Parse a dropped file (see _parse()) and time it"""
+    start_time = time.perf_counter()
+    df = _parse(dataset, path, data)
+    return df, time.perf_counter() - start_time
+
+
+class DropFolderIngestor:
+    """Imports files dropped into a watched folder
+
+    Files are picked up from one subfolder per dataset (``esg/`` and
+    ``shariah/``) once they have not been modified for
+    INGEST_SETTLE_SECONDS. Each file is identified by its content hash:
+    content that was already imported is archived without importing it
+    again. Imported files are moved to ``archive/<dataset>/`` and files that
+    could not be imported to ``quarantine/<dataset>/`` with the error in a
+    ``.error.txt`` file next to them.
+    """
+
+    def __init__(self, root: Optional[str] = None, mode: Optional[str] = None,
+                 workers: Optional[int] = None):
+        """Initialize the ingestor
+
+        Args:
+            root: Drop folder (default: Config.APP.INGEST_DIR)
+            mode: Import mode (default: Config.APP.INGEST_MODE)
+            workers: Worker threads (default: Config.APP.INGEST_WORKERS)
+        """
+        self.root = root or Config.APP.INGEST_DIR
+        self.mode = mode or Config.APP.INGEST_MODE
+        self.workers = max(workers or Config.APP.INGEST_WORKERS, 1)
+        if self.mode not in IMPORT_MODES:
+            raise ValueError(f"Unknown import mode: {self.mode}")
+
+        for dataset in DATASETS:
+            for folder in ((dataset,), (ARCHIVE_DIR, dataset), (QUARANTINE_DIR, dataset)):
+                os.makedirs(os.path.join(self.root, *folder), exist_ok=True)
+
+    def pending_files(self) -> List[Tuple[str, str]]:
+        """List the files ready to be ingested
+
+        Returns:
+            List[Tuple[str, str]]: (dataset, path) pairs, oldest first
+        """
+        cutoff = time.time() - Config.APP.INGEST_SETTLE_SECONDS
+        files = []
+        for dataset in DATASETS:
+            folder = os.path.join(self.root, dataset)
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if not name.lower().endswith(FILE_EXTENSIONS) or not os.path.isfile(path):
+                    continue
+                mtime = os.path.getmtime(path)
+                if mtime <= cutoff:
+                    files.append((mtime, dataset, path))
+        return [(dataset, path) for _, dataset, path in sorted(files)]
+
+    def _already_imported(self, digest: str) -> bool:
+        """Check whether content with this hash was imported before"""
+        conn = None
+        try:
+            conn = get_connection()
+            row = conn.execute(
+                "SELECT 1 FROM ingested_files WHERE content_hash = ? AND status = ? LIMIT 1", (digest, IMPORTED)
+            ).fetchone()
+            return row is not None
+        finally:
+            if conn:
+                conn.close()
+
+    def _move(self, path: str, folder: str, dataset: str) -> str:
+        """Move a processed file out of the drop folder, keeping its name unique"""
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        name = os.path.basename(path)
+        target = os.path.join(self.root, folder, dataset, f"{stamp}_{name}")
+        suffix = 1
+        while os.path.exists(target):
+            target = os.path.join(self.root, folder, dataset, f"{stamp}_{suffix}_{name}")
+            suffix += 1
+        shutil.move(path, target)
+        return target
+
+    def _record(self, digest: str, path: str, dataset: str, status: str, seconds: float,
+                moved_to: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Log the outcome of a file in the ingested_files table"""
+        result = result or {}
+        report = result.get("error_report")
+        conn = None
+        try:
+            conn = get_connection()
+            conn.execute("""
+                INSERT INTO ingested_files (
+                    content_hash, file_name, dataset, mode, status,
+                    records_added, records_updated, records_unchanged, records_skipped,
+                    error, error_report, moved_to, seconds
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (digest, os.path.basename(path), dataset, self.mode, status,
+                  result.get("records_added", 0), result.get("records_updated", 0),
+                  result.get("records_unchanged", 0), result.get("records_skipped", 0),
+                  error, report.path if report is not None and report.total else None, moved_to, seconds))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error recording ingested file {path}: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def ingest_file(self, dataset: str, path: str, digest: str, data: bytes,
+                    parsing: Optional[Future] = None) -> str:
+        """Import one file and move it to the archive or quarantine folder
+
+        Args:
+            dataset: Dataset name ("esg" or "shariah")
+            path: File path
+            digest: Content hash of the file
+            data: File contents
+            parsing: Future of _parse_timed() for the file, when it is parsed
+                ahead (default: parse it here)
+
+        Returns:
+            str: Outcome (IMPORTED or FAILED)
+        """
+        start_time = time.perf_counter()
+        result = None
+        try:
+            df, parsed = parsing.result() if parsing is not None else _parse_timed(dataset, path, data)
+            result = _import(dataset, df, self.mode)
+            if not result.get("success"):
+                error = "; ".join(result.get("errors", [])) or "Import failed"
+            elif result["records_skipped"] and not (result["records_added"] + result["records_updated"]
+                                                    + result["records_unchanged"]):
+                error = f"None of the {result['records_skipped']} rows could be imported"
+            else:
+                error = None
+        except Exception as e:
+            # Unreadable files and missing columns are expected; anything else gets a traceback
+            if not isinstance(e, (ValueError, UnicodeDecodeError)):
+                logger.exception(f"Error ingesting {path}")
+            parsed = time.perf_counter() - start_time
+            error = str(e)
+
+        seconds = time.perf_counter() - start_time
+        if error is None:
+            moved_to = self._move(path, ARCHIVE_DIR, dataset)
+            logger.info(
+                f"Ingested {os.path.basename(path)} into {dataset} ({self.mode}) in {seconds:.2f}s "
+                f"(parse {parsed:.2f}s): {result['records_added']} inserted, {result['records_updated']} updated, "
+                f"{result['records_unchanged']} unchanged, {result['records_skipped']} skipped"
+            )
+            self._record(digest, path, dataset, IMPORTED, seconds, moved_to, result)
+            return IMPORTED
+
+        moved_to = self._move(path, QUARANTINE_DIR, dataset)
+        with open(f"{moved_to}.error.txt", "w") as f:
+            f.write(error + "\n")
+        logger.error(f"Quarantined {os.path.basename(path)} after {seconds:.2f}s: {error}")
+        self._record(digest, path, dataset, FAILED, seconds, moved_to, result, error)
+        return FAILED
+
+    def run_once(self) -> Dict[str, int]:
+        """Ingest every pending file
+
+        Files whose content was already imported (earlier, or by another
+        file in the same pass) are archived as duplicates. Files are parsed
+        in parallel, but the files of a dataset are loaded one after another,
+        oldest first, so a newer file always overwrites an older one.
+
+        Returns:
+            Dict[str, int]: Number of files per outcome
+        """
+        outcomes = {IMPORTED: 0, FAILED: 0, DUPLICATE: 0}
+        seen = set()
+        tasks = []
+        for dataset, path in self.pending_files():
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = file_hash(data)
+            if digest in seen or self._already_imported(digest):
+                moved_to = self._move(path, ARCHIVE_DIR, dataset)
+                logger.info(f"Skipped {os.path.basename(path)}: same content as a file already imported")
+                self._record(digest, path, dataset, DUPLICATE, 0.0, moved_to)
+                outcomes[DUPLICATE] += 1
+                continue
+            seen.add(digest)
+            tasks.append((dataset, path, digest, data))
+
+        if not tasks:
+            return outcomes
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(tasks)), thread_name_prefix="ingest") as parsers:
+            # One loader per dataset, taking its files in order as their parses finish
+            queues: Dict[str, List[Tuple[Tuple[str, str, str, bytes], Future]]] = {}
+            for task in tasks:
+                dataset, path, _, data = task
+                queues.setdefault(dataset, []).append((task, parsers.submit(_parse_timed, dataset, path, data)))
+
+            def load(queue):
+                return [self.ingest_file(*task, parsing=parsing) for task, parsing in queue]
+
+            with ThreadPoolExecutor(max_workers=len(queues), thread_name_prefix="ingest-load") as loaders:
+                for loaded in loaders.map(load, queues.values()):
+                    for outcome in loaded:
+                        outcomes[outcome] += 1
+
+        logger.info(f"Ingestion pass: {outcomes[IMPORTED]} imported, {outcomes[FAILED]} failed, "
+                    f"{outcomes[DUPLICATE]} duplicates")
+        return outcomes
+
+    def watch(self, interval: Optional[float] = None):
+        """Ingest pending files every interval seconds until interrupted
+
+        Args:
+            interval: Seconds between scans (default: Config.APP.INGEST_POLL_SECONDS)
+        """
+        interval = interval if interval is not None else Config.APP.INGEST_POLL_SECONDS
+        logger.info(f"Watching {self.root} for {', '.join(DATASETS)} files ({self.mode}, {self.workers} workers)")
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Ingestion pass failed: {e}")
+            time.sleep(interval)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import time
+import logging
+import pandas as pd
+from typing import Any, Dict, Optional
+
+from app.config import Config
+from app.database import get_connection
+from app.repositories.dimensions import store_table
+from app.repositories.screening import (
+    save_screening_run, latest_screening_run, load_screening_results, list_screening_runs
+)
+from app.utils.screening import PASS, FAIL, NO_DATA, map_financial_columns, screen_financials
+
+logger = logging.getLogger(__name__)
+
+
+class ScreeningService:
+    """Service class for the Shariah screening of delivery universes"""
+
+    def screen_delivery(self, record_id: int, financials: pd.DataFrame, file_name: str,
+                        debt_limit: Optional[float] = None, cash_limit: Optional[float] = None,
+                        income_limit: Optional[float] = None) -> Dict[str, Any]:
+        """Screen the financials of a delivery's universe and store the results
+
+        Rows without an identifier are skipped; the delivery's results of an
+        earlier run are replaced.
+
+        Args:
+            record_id: Shariah record (delivery) the universe belongs to
+            financials: Financials as read from the file (see map_financial_columns())
+            file_name: File the financials were read from
+            debt_limit: Highest debt ratio that passes (default Config.APP.SCREEN_DEBT_LIMIT)
+            cash_limit: Highest cash ratio that passes (default Config.APP.SCREEN_CASH_LIMIT)
+            income_limit: Highest income ratio that passes (default Config.APP.SCREEN_INCOME_LIMIT)
+
+        Returns:
+            Dictionary with "success", the "run_id", the "run" summary, the
+            number of rows "skipped" and "errors"
+        """
+        conn = None
+        result = {"success": False, "run_id": None, "run": {}, "skipped": 0, "errors": []}
+        try:
+            df, missing = map_financial_columns(financials)
+            if missing:
+                result["errors"].append(f"Missing columns: {', '.join(missing)}")
+                return result
+
+            identifiers = df['identifier'].astype(str).str.strip()
+            keep = df['identifier'].notna() & (identifiers != '')
+            result["skipped"] = int((~keep).sum())
+            df = df[keep]
+            if df.empty:
+                result["errors"].append("The file contains no securities")
+                return result
+
+            limits = {
+                "debt_limit": Config.APP.SCREEN_DEBT_LIMIT if debt_limit is None else float(debt_limit),
+                "cash_limit": Config.APP.SCREEN_CASH_LIMIT if cash_limit is None else float(cash_limit),
+                "income_limit": Config.APP.SCREEN_INCOME_LIMIT if income_limit is None else float(income_limit)
+            }
+            start = time.perf_counter()
+            results = screen_financials(df, **limits)
+            statuses = results['status'].value_counts()
+            run = {
+                "file_name": file_name,
+                "securities": len(results),
+                "passed": int(statuses.get(PASS, 0)),
+                "failed": int(statuses.get(FAIL, 0)),
+                "no_data": int(statuses.get(NO_DATA, 0)),
+                **limits,
+                "seconds": time.perf_counter() - start
+            }
+
+            conn = get_connection()
+            exists = conn.execute(f"SELECT 1 FROM {store_table(Config.DB.SHARIAH_TABLE)} WHERE id = ?",
+                                  (int(record_id),)).fetchone()
+            if not exists:
+                result["errors"].append(f"Record {record_id} does not exist")
+                return result
+
+            result["run_id"] = save_screening_run(conn, record_id, run, results)
+            conn.commit()
+
+            logger.info(f"Screened {run['securities']} securities of Shariah record {record_id} from {file_name} "
+                        f"in {run['seconds']:.3f}s: {run['passed']} pass, {run['failed']} fail, "
+                        f"{run['no_data']} no data")
+            result["run"] = run
+            result["success"] = True
+            return result
+        except Exception as e:
+            logger.error(f"Error screening Shariah record {record_id}: {str(e)}")
+            result["errors"].append(str(e))
+            return result
+        finally:
+            if conn:
+                conn.close()
+
+    def get_latest_run(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Get the latest screening run of a delivery
+
+        Args:
+            record_id: Shariah record ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The run, or None if the delivery was
+            never screened (or it is unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return latest_screening_run(conn, record_id)
+        except Exception as e:
+            logger.error(f"Error getting the screening run of Shariah record {record_id}: {str(e)}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def get_results(self, run_id: int) -> pd.DataFrame:
+        """Get the per-security results of a run
+
+        Args:
+            run_id: Screening run ID
+
+        Returns:
+            pd.DataFrame: One row per security (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return load_screening_results(conn, run_id)
+        except Exception as e:
+            logger.error(f"Error getting the results of screening run {run_id}: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
+
+    def get_runs(self) -> pd.DataFrame:
+        """Get the screening runs of all deliveries, latest first
+
+        Returns:
+            pd.DataFrame: One row per run (empty if unavailable)
+        """
+        conn = None
+        try:
+            conn = get_connection()
+            return list_screening_runs(conn)
+        except Exception as e:
+            logger.error(f"Error listing screening runs: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                conn.close()
\ No newline at end of file
@@ -2,9 +2,16 @@ import pandas as pd
 import logging
 from typing import List, Dict, Any, Optional, Union
 import os
+import time
 from datetime import datetime
 
+from app.config import Config
 from app.database import get_connection
+from app.utils.metrics import record_import
+from app.repositories.upsert import APPEND, REPLACE, IMPORT_MODES, LOADERS, NoValidRowsError, refresh_fingerprints
+from app.repositories.dimensions import dimension_columns, encode_values, encode_record, category_counts
+from app.repositories.identifiers import sync_identifier_counts
+from app.utils.error_report import ErrorReport
 from app.models.shariah_model import ShariahData, ShariahAggregatedData
 from app.repositories.shariah_repository import ShariahRepository
 
@@ -14,14 +21,12 @@ def get_all_shariah_data() -> pd.DataFrame:
     """Get all Shariah data from the database
     
     Returns:
-        DataFrame containing all Shariah data records
+        DataFrame containing all Shariah data records, typed per the schema dtype
+        policy (categoricals for enumerations, Int32 for counts)
     """
     try:
-        conn = get_connection()
-        query = "SELECT * FROM shariah_datafeed"
-        df = pd.read_sql(query, conn)
-        conn.close()
-        return df
+        # Load through the columnar path so the frame uses the schema dtype policy
+        return ShariahRepository().get_all()
     except Exception as e:
         logger.error(f"Error retrieving Shariah data: {str(e)}")
         return pd.DataFrame()
@@ -35,37 +40,51 @@ def update_shariah_data(updated_df: pd.DataFrame) -> bool:
     Returns:
         True if update was successful, False otherwise
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
+        record_ids = []
+        
+        # Enumerated values are stored as keys into their lookup tables (one lookup per distinct value)
+        keys = {col: encode_values(conn, col, updated_df[col].where(updated_df[col] != '')).tolist()
+                for col in dimension_columns(Config.DB.SHARIAH_TABLE) if col in updated_df.columns}
         
-        for _, row in updated_df.iterrows():
+        for position, (_, row) in enumerate(updated_df.iterrows()):
             # Ensure numeric fields are properly converted
             sedol_count = int(row.get('sedol_count', 0) or 0)
             isin_count = int(row.get('isin_count', 0) or 0)
             cusip_count = int(row.get('cusip_count', 0) or 0)
+            row_keys = {col: values[position] for col, values in keys.items()}
             
-            query = """
-            UPDATE shariah_datafeed 
-            SET client = ?, fields = ?, data_type = ?, data_source = ?,
-                sedol_count = ?, isin_count = ?, cusip_count = ?, compliance = ?,
-                frequency = ?, updated_at = ?
+            query = f"""
+            UPDATE {Config.DB.SHARIAH_STORE_TABLE} 
+            SET client = ?, fields = ?, data_type_id = ?, data_source_id = ?,
+                sedol_count = ?, isin_count = ?, cusip_count = ?, compliance_id = ?,
+                frequency_id = ?, updated_at = ?
             WHERE id = ?
             """
             
             cursor.execute(query, (
                 row.get('client', ''),
                 row.get('fields', ''),
-                row.get('data_type', ''),
-                row.get('data_source', ''),
+                row_keys.get('data_type'),
+                row_keys.get('data_source'),
                 sedol_count,
                 isin_count,
                 cusip_count,
-                row.get('compliance', ''),
-                row.get('frequency', ''),
+                row_keys.get('compliance'),
+                row_keys.get('frequency'),
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 int(row['id'])
             ))
+            record_ids.append(int(row['id']))
+        
+        # Counts of records with uploaded identifiers are derived from them, not typed in
+        sync_identifier_counts(conn, Config.DB.SHARIAH_TABLE, record_ids)
+        
+        # Edits can change the natural key or content of a row
+        refresh_fingerprints(conn, Config.DB.SHARIAH_TABLE, record_ids)
         
         conn.commit()
         conn.close()
@@ -73,6 +92,10 @@ def update_shariah_data(updated_df: pd.DataFrame) -> bool:
     except Exception as e:
         logger.error(f"Error updating Shariah data: {str(e)}")
         return False
+    finally:
+        # Closing also rolls back a partially applied batch
+        if conn:
+            conn.close()
 
 def delete_shariah_data(record_id: int) -> bool:
     """Delete Shariah data record from the database
@@ -86,7 +109,7 @@ def delete_shariah_data(record_id: int) -> bool:
     try:
         conn = get_connection()
         cursor = conn.cursor()
-        query = "DELETE FROM shariah_datafeed WHERE id = ?"
+        query = f"DELETE FROM {Config.DB.SHARIAH_STORE_TABLE} WHERE id = ?"
         cursor.execute(query, (record_id,))
         conn.commit()
         
@@ -117,6 +140,7 @@ class ShariahService:
         Returns:
             ID of the newly created record, or -1 if operation failed
         """
+        conn = None
         try:
             # Ensure numeric fields are properly converted
             sedol_count = int(shariah_data.get('sedol_count', 0) or 0)
@@ -127,37 +151,35 @@ class ShariahService:
             conn = get_connection()
             cursor = conn.cursor()
             
-            # Insert new record
+            # Insert new record (enumerated values as keys into their lookup tables)
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            query = """
-            INSERT INTO shariah_datafeed (
-                client, fields, sedol_count, isin_count, 
-                cusip_count, frequency, current_source,
-                after_migration, delivery_name, universe, 
-                universe_count, migration_plan, created_at, updated_at
-            ) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            record = encode_record(conn, Config.DB.SHARIAH_TABLE, {
+                'client': shariah_data.get('client', ''),
+                'fields': shariah_data.get('fields', ''),
+                'sedol_count': sedol_count,
+                'isin_count': isin_count,
+                'cusip_count': cusip_count,
+                'frequency': shariah_data.get('frequency', ''),
+                'current_source': shariah_data.get('current_source', ''),
+                'after_migration': shariah_data.get('after_migration', ''),
+                'delivery_name': shariah_data.get('delivery_name', ''),
+                'universe': shariah_data.get('universe', ''),
+                'universe_count': universe_count,
+                'migration_plan': shariah_data.get('migration_plan', ''),
+                'created_at': now,
+                'updated_at': now
+            })
+            query = f"""
+            INSERT INTO {Config.DB.SHARIAH_STORE_TABLE} ({', '.join(record)}) 
+            VALUES ({', '.join(['?'] * len(record))})
             """
             
-            cursor.execute(query, (
-                shariah_data.get('client', ''),
-                shariah_data.get('fields', ''),
-                sedol_count,
-                isin_count,
-                cusip_count,
-                shariah_data.get('frequency', ''),
-                shariah_data.get('current_source', ''),
-                shariah_data.get('after_migration', ''),
-                shariah_data.get('delivery_name', ''),
-                shariah_data.get('universe', ''),
-                universe_count,
-                shariah_data.get('migration_plan', ''),
-                now,
-                now
-            ))
+            cursor.execute(query, list(record.values()))
             
-            conn.commit()
             record_id = cursor.lastrowid
+            # Fails with an IntegrityError if a record with the same natural key exists
+            refresh_fingerprints(conn, Config.DB.SHARIAH_TABLE, [record_id])
+            conn.commit()
             conn.close()
             
             # Log successful insertion
@@ -167,6 +189,9 @@ class ShariahService:
         except Exception as e:
             logger.error(f"Error adding Shariah data: {str(e)}")
             return -1
+        finally:
+            if conn:
+                conn.close()
     
     def get_shariah_data_by_id(self, record_id: int) -> Optional[Dict[str, Any]]:
         """Get Shariah data by ID
@@ -191,84 +216,78 @@ class ShariahService:
             logger.error(f"Error retrieving Shariah data by ID: {str(e)}")
             return None
     
-    def import_shariah_data_from_df(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def import_shariah_data_from_df(self, df: pd.DataFrame, mode: str = APPEND) -> Dict[str, Any]:
         """Import Shariah data from a DataFrame
         
         Args:
             df: DataFrame containing Shariah data to import
+            mode: "append" inserts every row; "upsert" inserts or updates rows by
+                natural key (client and delivery name) and leaves unchanged rows untouched;
+                "replace" makes the table match the file in one transaction
+            
+        Returns:
+            Dictionary with results of the import operation
+        """
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"Unknown import mode: {mode}")
+        return self._load_shariah_data_from_df(df, mode)
+    
+    def _load_shariah_data_from_df(self, df: pd.DataFrame, mode: str) -> Dict[str, Any]:
+        """Validate and load Shariah data with the loader of the import mode
+        
+        Args:
+            df: DataFrame containing Shariah data to import
+            mode: "append", "upsert" (insert or update in a single pass) or
+                "replace" (staged insert/update/delete diff applied in one transaction)
             
         Returns:
             Dictionary with results of the import operation
         """
+        conn = None
         try:
+            start_time = time.perf_counter()
             conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Track import results
-            records_added = 0
-            records_skipped = 0
-            errors = []
+            counts = LOADERS[mode](conn, Config.DB.SHARIAH_TABLE, df)
+            conn.commit()
             
-            for _, row in df.iterrows():
-                try:
-                    # Validate required fields
-                    if not row.get('client') or pd.isna(row.get('client')):
-                        records_skipped += 1
-                        errors.append(f"Row skipped: Missing client name")
-                        continue
-                    
-                    # Ensure numeric fields are properly converted
-                    sedol_count = int(row.get('sedol_count', 0) or 0)
-                    isin_count = int(row.get('isin_count', 0) or 0)
-                    cusip_count = int(row.get('cusip_count', 0) or 0)
-                    
-                    # Insert new record
-                    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    query = """
-                    INSERT INTO shariah_datafeed (
-                        client, fields, data_type, data_source, 
-                        sedol_count, isin_count, cusip_count, compliance,
-                        frequency, created_at, updated_at
-                    ) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-                    
-                    cursor.execute(query, (
-                        row.get('client', ''),
-                        row.get('fields', ''),
-                        row.get('data_type', ''),
-                        row.get('data_source', ''),
-                        sedol_count,
-                        isin_count,
-                        cusip_count,
-                        row.get('compliance', ''),
-                        row.get('frequency', ''),
-                        now,
-                        now
-                    ))
-                    
-                    records_added += 1
-                except Exception as row_error:
-                    records_skipped += 1
-                    errors.append(f"Error in row: {str(row_error)}")
+            # Rejected and duplicate rows go to a bounded report spilled to disk
+            report = ErrorReport()
+            report.add(counts["errors"])
+            # Appended duplicates are loaded (unkeyed); the other modes leave them out
+            records_skipped = counts["rejected"] + (counts["duplicates"] if mode != APPEND else 0)
             
-            conn.commit()
-            conn.close()
+            record_import("shariah", counts["inserted"] + counts["updated"], records_skipped,
+                          time.perf_counter() - start_time, rows_unchanged=counts["unchanged"])
             
-            return {
+            result = {
                 "success": True,
-                "records_added": records_added,
+                "records_added": counts["inserted"],
+                "records_updated": counts["updated"],
+                "records_unchanged": counts["unchanged"],
                 "records_skipped": records_skipped,
-                "errors": errors
+                "errors": [],
+                "error_report": report
             }
+            if mode == REPLACE:
+                result["records_deleted"] = counts["deleted"]
+            return result
         except Exception as e:
-            logger.error(f"Error importing Shariah data: {str(e)}")
+            logger.error(f"Error importing Shariah data ({mode}): {str(e)}")
+            report = ErrorReport()
+            if isinstance(e, NoValidRowsError):
+                report.add(e.errors)
             return {
                 "success": False,
                 "records_added": 0,
+                "records_updated": 0,
+                "records_unchanged": 0,
                 "records_skipped": 0,
-                "errors": [str(e)]
+                "errors": [str(e)],
+                "error_report": report
             }
+        finally:
+            if conn:
+                conn.close()
     
     def get_shariah_metrics(self) -> Dict[str, Any]:
         """Get metrics for Shariah data in the database
@@ -284,40 +303,22 @@ class ShariahService:
             df_total = pd.read_sql(query_total, conn)
             total_records = int(df_total.iloc[0]['count']) if not df_total.empty else 0
             
-            # Unique clients
-            query_clients = "SELECT COUNT(DISTINCT client) as count FROM shariah_datafeed"
+            # Unique clients (spelling variants share a client_id)
+            query_clients = "SELECT COUNT(DISTINCT COALESCE(client_id, client)) as count FROM shariah_datafeed"
             df_clients = pd.read_sql(query_clients, conn)
             unique_clients = int(df_clients.iloc[0]['count']) if not df_clients.empty else 0
             
-            # Compliance breakdown
-            query_compliance = "SELECT compliance, COUNT(*) as count FROM shariah_datafeed GROUP BY compliance"
-            df_compliance = pd.read_sql(query_compliance, conn)
-            
-            # Data source breakdown
-            query_source = "SELECT data_source, COUNT(*) as count FROM shariah_datafeed GROUP BY data_source"
-            df_source = pd.read_sql(query_source, conn)
-            
-            # Frequency breakdown
-            query_frequency = "SELECT frequency, COUNT(*) as count FROM shariah_datafeed GROUP BY frequency"
-            df_frequency = pd.read_sql(query_frequency, conn)
+            # Compliance, data source and frequency breakdowns (grouped on the integer keys)
+            compliance_counts = category_counts(conn, Config.DB.SHARIAH_TABLE, 'compliance')
+            source_counts = category_counts(conn, Config.DB.SHARIAH_TABLE, 'data_source')
+            frequency_counts = category_counts(conn, Config.DB.SHARIAH_TABLE, 'frequency')
             
             conn.close()
             
             # Format results
-            compliance_data = {}
-            for _, row in df_compliance.iterrows():
-                if not pd.isna(row['compliance']) and row['compliance']:
-                    compliance_data[row['compliance']] = int(row['count'])
-                
-            source_data = {}
-            for _, row in df_source.iterrows():
-                if not pd.isna(row['data_source']) and row['data_source']:
-                    source_data[row['data_source']] = int(row['count'])
-                    
-            frequency_data = {}
-            for _, row in df_frequency.iterrows():
-                if not pd.isna(row['frequency']) and row['frequency']:
-                    frequency_data[row['frequency']] = int(row['count'])
+            compliance_data = {value: count for value, count in compliance_counts.items() if value}
+            source_data = {value: count for value, count in source_counts.items() if value}
+            frequency_data = {value: count for value, count in frequency_counts.items() if value}
             
             return {
                 "total_records": total_records,
@@ -343,22 +344,24 @@ class ShariahService:
             List of ShariahAggregatedData objects
         """
         try:
-            df = self.repository.get_aggregated_data()
-            
-            if df.empty:
-                return []
-                
-            # Convert DataFrame rows to ShariahAggregatedData objects
-            aggregated_data = []
-            for _, row in df.iterrows():
-                data_dict = row.to_dict()
-                aggregated_data.append(ShariahAggregatedData.from_dict(data_dict))
-                
-            return aggregated_data
+            # Models are built straight from the cursor, without an intermediate DataFrame
+            return list(self.repository.iter_aggregated())
         except Exception as e:
             logger.error(f"Error getting aggregated Shariah data: {str(e)}")
             return []
             
+    def get_aggregated_frame(self) -> pd.DataFrame:
+        """Get aggregated Shariah data by client as a DataFrame for display
+        
+        Returns:
+            pd.DataFrame: Aggregated Shariah data (empty if unavailable)
+        """
+        try:
+            return self.repository.get_aggregated_data()
+        except Exception as e:
+            logger.error(f"Error getting aggregated Shariah data: {str(e)}")
+            return pd.DataFrame()
+            
     def get_frequency_summary(self) -> Dict[str, int]:
         """Get a summary of frequency counts
         
@@ -371,13 +374,14 @@ class ShariahService:
             logger.error(f"Error getting Shariah frequency summary: {str(e)}")
             return {}
             
-    def bulk_import_shariah_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def bulk_import_shariah_data(self, df: pd.DataFrame, mode: str = APPEND) -> Dict[str, Any]:
         """Import Shariah data from a DataFrame (bulk upload)
         
         Args:
             df: DataFrame containing Shariah data to import
+            mode: Import mode ("append", "upsert" or "replace")
             
         Returns:
             Dictionary with results of the import operation
         """
-        return self.import_shariah_data_from_df(df) 
\ No newline at end of file
+        return self.import_shariah_data_from_df(df, mode) 
\ No newline at end of file
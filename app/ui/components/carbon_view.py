@@ -0,0 +1,88 @@
+import streamlit as st
+import pandas as pd
+import logging
+from typing import Optional
+
+from app.services.esg_service import get_all_esg_data
+from app.services.carbon_service import CarbonService
+from app.utils.upload_cache import file_hash, read_upload
+
+logger = logging.getLogger(__name__)
+
+
+def _record_label(row: pd.Series) -> str:
+    """Describe an ESG record in the portfolio selector"""
+    extra = row.get('data_source')
+    return f"#{row['id']} · {row['client']}" + (f" · {extra}" if pd.notna(extra) and extra != '' else "")
+
+
+def _read(uploaded_file) -> Optional[pd.DataFrame]:
+    """Parse an uploaded CSV or Excel file, reporting read errors (None if unreadable)"""
+    data = uploaded_file.getvalue()
+    try:
+        return read_upload(uploaded_file.name, data, file_hash(data))
+    except Exception as e:
+        st.error(f"Error reading file: {str(e)}")
+        logger.error(f"Error reading {uploaded_file.name}: {str(e)}")
+        return None
+
+
+def render_carbon_upload():
+    """Render the uploads of issuer emissions and client portfolio holdings"""
+    st.header("Portfolio Emissions")
+    st.info("Upload issuer emissions and the holdings of client portfolios to compute financed "
+            "emissions, carbon footprint and weighted average carbon intensity (WACI). "
+            "The metrics are shown on the dashboard.")
+    service = CarbonService()
+
+    st.subheader("Issuer Emissions")
+    summary = service.get_emissions_summary()
+    if summary and summary["issuers"]:
+        st.caption(f"{summary['issuers']:,} issuers on file · last upload {summary['file_name']} "
+                   f"({summary['uploaded_at']})")
+    with st.expander("File format"):
+        st.markdown("""
+        One row per issuer with the columns **identifier** (or isin, sedol, cusip, ticker),
+        **scope1_emissions** and **scope2_emissions** (tCO2e), **revenue** and **evic**
+        (enterprise value including cash), in the currency of the holdings.
+
+        Issuers already on file are updated, others are added.
+        """)
+    emissions_file = st.file_uploader("Choose emissions file", type=["csv", "xlsx", "xls"], key="emissions_upload")
+    if emissions_file is not None and st.button("Store Emissions", type="primary"):
+        emissions = _read(emissions_file)
+        if emissions is not None:
+            result = service.upload_emissions(emissions, emissions_file.name)
+            if result["success"]:
+                st.success(f"Stored the emissions of {result['issuers']:,} issuers")
+                if result["skipped"]:
+                    st.warning(f"{result['skipped']:,} rows without an identifier were skipped")
+            else:
+                st.error("; ".join(result["errors"]) or "Error storing emissions")
+
+    st.subheader("Portfolio Holdings")
+    records = get_all_esg_data()
+    if records.empty:
+        st.caption("No ESG records yet.")
+        return
+
+    labels = {int(row['id']): _record_label(row) for _, row in records.iterrows()}
+    record_id = st.selectbox("Portfolio", list(labels), format_func=labels.get, key="holdings_record")
+    with st.expander("File format"):
+        st.markdown("""
+        One row per holding with the columns **identifier** (matching the emissions file)
+        and **market_value**. The file replaces the portfolio's holdings.
+        """)
+    holdings_file = st.file_uploader("Choose holdings file", type=["csv", "xlsx", "xls"], key="holdings_upload")
+    if holdings_file is not None and st.button("Store Holdings", type="primary"):
+        holdings = _read(holdings_file)
+        if holdings is not None:
+            result = service.upload_holdings(record_id, holdings, holdings_file.name)
+            if result["success"]:
+                st.success(f"Stored {result['holdings']:,} holdings for {labels[record_id]}")
+                if result["skipped"]:
+                    st.warning(f"{result['skipped']:,} rows without an identifier were skipped")
+                if result["invalid"]:
+                    st.warning(f"{result['invalid']:,} market values could not be read and count as 0")
+            else:
+                st.error("; ".join(result["errors"]) or "Error storing holdings")
\ No newline at end of file
@@ -0,0 +1,105 @@
+import streamlit as st
+import logging
+from typing import Optional
+
+from app.services.client_service import ClientService
+from app.repositories.clients import name_key
+
+logger = logging.getLogger(__name__)
+
+
+def render_client_name_input(label: str, key: str, value: str = "", help: Optional[str] = None) -> str:
+    """Render a client name input suggesting the client names already on file
+
+    Rendered outside forms, so the suggestions follow what is typed. When
+    the typed name normalizes to a known client's, that client's name is
+    preselected; otherwise the name as typed is.
+
+    Args:
+        label: Input label
+        key: Unique widget key
+        value: Initial name
+        help: Optional help text
+
+    Returns:
+        str: The chosen name (a suggestion or the text as typed), stripped
+    """
+    text = st.text_input(label, value=value, key=key, help=help,
+                         placeholder="Start typing a client name").strip()
+    if not text:
+        return ""
+    suggestions = ClientService().suggest_names(text)
+    if not suggestions or suggestions == [text]:
+        return text
+
+    typed = f"{text} (as typed)"
+    options = suggestions if text in suggestions else [typed] + suggestions
+    exact = [name for name in suggestions if name_key(name) == name_key(text)]
+    choice = st.selectbox("Existing clients", options, index=options.index(exact[0]) if exact else 0,
+                          key=f"{key}_suggestion",
+                          help="Pick an existing client so its records are not split over spellings")
+    return text if choice == typed else choice
+
+
+def render_client_cross_reference(service: Optional[ClientService] = None):
+    """Render the clients of the ESG and Shariah datasets side by side
+
+    Args:
+        service: Optional client service instance
+    """
+    service = service or ClientService()
+
+    st.subheader("ESG ↔ Shariah Clients")
+    st.info("Clients are matched on their normalized name, so spelling variants of a client count once.")
+
+    df = service.get_cross_reference()
+    if df.empty:
+        st.info("No client data available.")
+        return
+
+    counts = df['datasets'].value_counts()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("In Both", f"{counts.get('Both', 0):,}")
+    col2.metric("ESG Only", f"{counts.get('ESG only', 0):,}")
+    col3.metric("Shariah Only", f"{counts.get('Shariah only', 0):,}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        datasets = st.multiselect("Datasets", ["Both", "ESG only", "Shariah only"], default=["Both"],
+                                  key="client_xref_datasets")
+    with col2:
+        search = st.text_input("Client", key="client_xref_search")
+    shown = df[df['datasets'].isin(datasets)]
+    if search:
+        shown = shown[shown['client'].str.contains(search, case=False, regex=False)]
+
+    st.dataframe(
+        shown.drop(columns=['client_id']),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'client': 'Client',
+            'datasets': 'Datasets',
+            'esg_records': 'ESG Records',
+            'esg_sources': 'ESG Sources',
+            'esg_isin_count': 'ESG ISINs',
+            'esg_sedol_count': 'ESG SEDOLs',
+            'esg_cusip_count': 'ESG CUSIPs',
+            'shariah_records': 'Shariah Records',
+            'shariah_sources': 'Shariah Sources',
+            'shariah_universe_count': 'Shariah Universe',
+            'shariah_isin_count': 'Shariah ISINs',
+            'shariah_sedol_count': 'Shariah SEDOLs',
+            'shariah_cusip_count': 'Shariah CUSIPs',
+            'total_isin_count': 'Total ISINs',
+            'total_sedol_count': 'Total SEDOLs',
+            'total_cusip_count': 'Total CUSIPs'
+        }
+    )
+    st.caption(f"{len(shown):,} of {len(df):,} clients")
+    st.download_button(
+        label="Download Report",
+        data=shown.to_csv(index=False),
+        file_name="client_cross_reference.csv",
+        mime="text/csv"
+    )
\ No newline at end of file
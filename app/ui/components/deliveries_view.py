@@ -0,0 +1,65 @@
+import os
+import streamlit as st
+import logging
+
+from app.config import Config
+from app.utils.delivery import FILE_FORMATS
+from app.repositories.deliveries import BUILT, SKIPPED
+from app.services.delivery_builder import DeliveryBuilder
+
+logger = logging.getLogger(__name__)
+
+
+def render_delivery_builder():
+    """Render the build of the Shariah client delivery files and their manifests"""
+    st.subheader("Delivery Files")
+    st.info("Build each Shariah client's delivery file with its requested fields for the securities of "
+            "its universe (its uploaded identifiers, with the latest screening results). Deliveries whose "
+            "inputs did not change since their last build are skipped.")
+    st.caption(f"Files are written to {Config.APP.DELIVERY_DIR}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        file_format = st.radio("Format", list(FILE_FORMATS), horizontal=True,
+                               index=list(FILE_FORMATS).index(Config.APP.DELIVERY_FORMAT)
+                               if Config.APP.DELIVERY_FORMAT in FILE_FORMATS else 0,
+                               key="delivery_format")
+    with col2:
+        force = st.checkbox("Rebuild unchanged deliveries", key="delivery_force")
+
+    builder = DeliveryBuilder(file_format=file_format)
+    if st.button("Build Delivery Files", type="primary"):
+        try:
+            with st.spinner("Building delivery files..."):
+                manifest = builder.build(force=force)
+            message = (f"{manifest['built']} built, {manifest['skipped']} unchanged, "
+                       f"{manifest['failed']} failed in {manifest['seconds']:.2f}s")
+            if manifest["failed"]:
+                st.warning(message)
+            else:
+                st.success(message)
+        except Exception as e:
+            st.error(f"Error building delivery files: {str(e)}")
+            logger.error(f"Error building delivery files: {str(e)}")
+
+    runs = builder.get_runs()
+    if runs.empty:
+        return
+
+    st.markdown("#### Runs")
+    st.dataframe(runs[['id', 'started_at', 'file_format', 'built', 'skipped', 'failed', 'seconds', 'workers']],
+                 hide_index=True, use_container_width=True)
+
+    run_id = st.selectbox("Run manifest", runs['id'].tolist(), key="delivery_run")
+    builds = builder.get_run_deliveries(run_id)
+    if builds.empty:
+        return
+    st.dataframe(builds.drop(columns=['input_hash']), hide_index=True, use_container_width=True)
+
+    # Download of a file of the run (built, or unchanged from an earlier run) that is still on disk
+    files = {os.path.basename(path): path for path in builds.loc[builds['status'].isin([BUILT, SKIPPED]), 'file_path']
+             if isinstance(path, str) and os.path.exists(path)}
+    if files:
+        name = st.selectbox("Download delivery", list(files), key="delivery_download")
+        with open(files[name], 'rb') as f:
+            st.download_button("Download File", data=f.read(), file_name=name)
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional
 from app.models.esg_model import ESGData
 from app.services.esg_service import ESGService
 from app.ui.components.ui_helpers import show_error_message, show_success_message
+from app.ui.components.clients_view import render_client_name_input
 
 
 def render_esg_form(service: Optional[ESGService] = None):
@@ -16,8 +17,10 @@ def render_esg_form(service: Optional[ESGService] = None):
     
     st.subheader("Add New ESG Data")
     
+    # Outside the form, so existing clients are suggested while typing
+    client = render_client_name_input("Client Name", key="esg_form_client")
+    
     with st.form("esg_form"):
-        client = st.text_input("Client Name")
         fields = st.text_area("Fields (separate by commas)")
         data_type = st.text_input("Data Type (e.g., Numeric, Percentage)")
         data_source = st.text_input("Data Source (e.g., FactSet, Reuters)")
@@ -112,8 +115,10 @@ def render_esg_edit_form(record_id: int, service: Optional[ESGService] = None):
         
     st.subheader(f"Edit ESG Data - {esg_data.client}")
     
+    # Outside the form, so existing clients are suggested while typing
+    client = render_client_name_input("Client Name", key=f"esg_edit_client_{record_id}", value=esg_data.client)
+    
     with st.form("esg_edit_form"):
-        client = st.text_input("Client Name", value=esg_data.client)
         fields = st.text_area("Fields (separate by commas)", value=esg_data.fields)
         data_type = st.text_input("Data Type", value=esg_data.data_type or "")
         data_source = st.text_input("Data Source", value=esg_data.data_source or "")
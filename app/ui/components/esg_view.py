@@ -182,15 +182,12 @@ def render_esg_aggregated_view(service: Optional[ESGService] = None):
     
     st.subheader("Aggregated ESG Data")
     
-    # Get aggregated ESG data
-    aggregated_data = service.get_aggregated_data()
+    # Get aggregated ESG data as a DataFrame (no per-client model round-trip)
+    df = service.get_aggregated_frame()
     
-    if not aggregated_data:
+    if df.empty:
         st.info("No ESG data available for aggregation.")
         return
-        
-    # Convert to DataFrame for display
-    df = pd.DataFrame([d.to_dict() for d in aggregated_data])
     
     # Add filters to sidebar
     filter_columns = ['client', 'data_source']
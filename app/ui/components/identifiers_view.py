@@ -0,0 +1,83 @@
+import streamlit as st
+import pandas as pd
+import logging
+
+from app.config import Config
+from app.services.esg_service import get_all_esg_data
+from app.services.shariah_service import get_all_shariah_data
+from app.services.identifier_service import IdentifierService
+
+logger = logging.getLogger(__name__)
+
+# Label, table, loader and the column that tells deliveries of a client apart
+_DATASETS = {
+    "ESG": (Config.DB.ESG_TABLE, get_all_esg_data, 'data_source'),
+    "Shariah": (Config.DB.SHARIAH_TABLE, get_all_shariah_data, 'delivery_name')
+}
+
+
+def _record_label(row: pd.Series, detail: str) -> str:
+    """Describe a record in the delivery selector"""
+    extra = row.get(detail)
+    return f"#{row['id']} · {row['client']}" + (f" · {extra}" if pd.notna(extra) and extra != '' else "")
+
+
+def render_identifier_upload():
+    """Render the upload of the identifiers delivered to a client"""
+    st.header("Upload Delivery Identifiers")
+    st.info("Upload the SEDOLs, ISINs and CUSIPs of a delivery. The record's identifier counts "
+            "are then derived from the stored identifiers instead of being typed in.")
+
+    dataset = st.radio("Dataset", list(_DATASETS), horizontal=True, key="identifiers_dataset")
+    table, load, detail = _DATASETS[dataset]
+    service = IdentifierService(table)
+
+    records = load()
+    if records.empty:
+        st.caption(f"No {dataset} records yet.")
+        return
+
+    labels = {int(row['id']): _record_label(row, detail) for _, row in records.iterrows()}
+    record_id = st.selectbox("Delivery", list(labels), format_func=labels.get, key="identifiers_record")
+
+    with st.expander("File format"):
+        st.markdown("""
+        A CSV file with a header row and either
+
+        - one column per type, named **sedol**, **isin** and/or **cusip**, or
+        - a single column of mixed identifiers, typed by length (SEDOL 7, CUSIP 9, ISIN 12 characters).
+
+        Identifiers with a wrong check digit are left out. The CUSIPs of US/CA ISINs and
+        the SEDOLs of GB/IE ISINs are derived and stored as well.
+
+        Each type in the file replaces the delivery's stored identifiers of that type.
+        """)
+
+    uploaded_file = st.file_uploader("Choose CSV file", type=["csv"], key="identifiers_upload")
+    if uploaded_file is not None and st.button("Store Identifiers", type="primary"):
+        result = service.upload_identifiers(record_id, uploaded_file.name, uploaded_file.getvalue())
+        if result["success"]:
+            stored = ", ".join(f"{count:,} {id_type.upper()}" for id_type, count in result["counts"].items())
+            st.success(f"Stored {stored} for {labels[record_id]}")
+            if result["derived"]:
+                derived = ", ".join(f"{count:,} {id_type.upper()}s" for id_type, count in result["derived"].items())
+                st.info(f"Derived {derived} from the ISINs")
+            if result["repaired"]:
+                st.info(f"Restored the leading zeros of {result['repaired']:,} codes")
+        else:
+            st.error("; ".join(result["errors"]) or "Error storing identifiers")
+        if result["invalid"]:
+            st.warning(f"{result['invalid']:,} values are not a valid SEDOL, ISIN or CUSIP (format or check digit) and were left out")
+            st.code("\n".join(map(str, result["invalid_sample"])))
+
+    sets = service.get_identifier_sets()
+    record_sets = sets[sets['record_id'] == record_id] if not sets.empty else sets
+    if not record_sets.empty:
+        st.subheader("Stored Identifiers")
+        st.dataframe(record_sets.drop(columns='record_id'), hide_index=True, use_container_width=True)
+        st.download_button(
+            label="Download Identifiers",
+            data=service.export_identifiers(record_id).to_csv(index=False),
+            file_name=f"{table}_{record_id}_identifiers.csv",
+            mime="text/csv"
+        )
\ No newline at end of file
@@ -0,0 +1,73 @@
+import time
+import streamlit as st
+import logging
+
+from app.services.import_jobs import list_jobs, job_result, QUEUED, RUNNING, COMPLETED, FAILED
+from app.ui.components.ui_helpers import show_import_result
+
+logger = logging.getLogger(__name__)
+
+# Seconds between automatic refreshes while a job is active
+REFRESH_INTERVAL = 2
+
+_STATUS_ICONS = {
+    QUEUED: "🕒",
+    RUNNING: "⏳",
+    COMPLETED: "✅",
+    FAILED: "❌"
+}
+
+
+def render_import_jobs(dataset: str, label: str, limit: int = 5) -> bool:
+    """Render the recent import jobs of a dataset with their progress
+    
+    Args:
+        dataset: Dataset name ("esg" or "shariah")
+        label: Dataset label used in the messages (e.g. "ESG")
+        limit: Number of jobs to show
+        
+    Returns:
+        bool: True if a job is queued or running and automatic refresh is on
+        (the page reruns through refresh_import_jobs() once fully rendered)
+    """
+    st.subheader("Import Jobs")
+    
+    jobs = list_jobs(dataset, limit=limit)
+    if jobs.empty:
+        st.caption("No imports yet.")
+        return False
+    
+    active = False
+    for job in jobs.to_dict('records'):
+        status = job['status']
+        active = active or status in (QUEUED, RUNNING)
+        title = f"{_STATUS_ICONS.get(status, '')} Job #{job['id']} · {job['file_name'] or 'upload'} · {job['mode']} · {status}"
+        
+        with st.expander(title, expanded=status != COMPLETED):
+            total = job['total_rows'] or 0
+            processed = job['rows_processed'] or 0
+            st.progress(processed / total if total else 1.0, text=f"{processed:,} of {total:,} rows")
+            st.caption(f"Queued {job['created_at']}" + (f" · finished {job['finished_at']}" if job['finished_at'] else ""))
+            if status in (COMPLETED, FAILED):
+                show_import_result(job_result(job), label)
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.button("Refresh", key=f"{dataset}_jobs_refresh")
+    with col2:
+        auto_refresh = st.checkbox("Refresh automatically while running", value=True, key=f"{dataset}_jobs_auto")
+    
+    return active and auto_refresh
+
+
+def refresh_import_jobs(active: bool):
+    """Rerun the page after REFRESH_INTERVAL seconds while import jobs are active
+    
+    Call it last on the page, so every tab has rendered before the wait.
+    
+    Args:
+        active: Whether any render_import_jobs() call asked for a refresh
+    """
+    if active:
+        time.sleep(REFRESH_INTERVAL)
+        st.rerun()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import streamlit as st
+import pandas as pd
+import logging
+
+from app.config import Config
+from app.services.shariah_service import get_all_shariah_data
+from app.services.screening_service import ScreeningService
+from app.utils.upload_cache import file_hash, read_upload
+
+logger = logging.getLogger(__name__)
+
+
+def _record_label(row: pd.Series) -> str:
+    """Describe a Shariah record in the delivery selector"""
+    extra = row.get('delivery_name')
+    return f"#{row['id']} · {row['client']}" + (f" · {extra}" if pd.notna(extra) and extra != '' else "")
+
+
+def _render_run(service: ScreeningService, run: dict):
+    """Render the summary and results of a screening run"""
+    st.subheader("Latest Screening")
+    st.caption(f"{run['file_name']} · {run['created_at']} · limits: debt {run['debt_limit']:.0%}, "
+               f"cash {run['cash_limit']:.0%}, income {run['income_limit']:.0%}")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Securities", f"{int(run['securities']):,}")
+    col2.metric("Pass", f"{int(run['passed']):,}")
+    col3.metric("Fail", f"{int(run['failed']):,}")
+    col4.metric("No Data", f"{int(run['no_data']):,}")
+
+    results = service.get_results(int(run['id']))
+    if results.empty:
+        return
+    statuses = st.multiselect("Status", ["PASS", "FAIL", "NO_DATA"], default=["PASS", "FAIL", "NO_DATA"],
+                              key="screening_status")
+    shown = results[results['status'].isin(statuses)]
+    st.dataframe(
+        shown,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            column: st.column_config.NumberColumn(format="%.4f")
+            for column in ('debt_ratio', 'cash_ratio', 'income_ratio', 'purification_ratio')
+        }
+    )
+    st.download_button(
+        label="Download Results",
+        data=results.to_csv(index=False),
+        file_name=f"screening_{run['record_id']}_{run['id']}.csv",
+        mime="text/csv"
+    )
+
+
+def render_screening():
+    """Render the Shariah screening of a delivery's universe"""
+    st.header("Shariah Screening")
+    st.info("Upload the financials of a delivery's universe to screen every security against "
+            "AAOIFI-style ratios. The results are stored with the delivery.")
+
+    service = ScreeningService()
+    records = get_all_shariah_data()
+    if records.empty:
+        st.caption("No Shariah records yet.")
+        return
+
+    labels = {int(row['id']): _record_label(row) for _, row in records.iterrows()}
+    record_id = st.selectbox("Delivery", list(labels), format_func=labels.get, key="screening_record")
+
+    with st.expander("File format and screens"):
+        st.markdown("""
+        A CSV or Excel file with one row per security and the columns
+
+        - **identifier** (or isin, sedol, cusip, ticker)
+        - **market_cap**, **total_debt**, **cash** (cash and interest-bearing securities)
+        - **interest_income**, **non_compliant_revenue**, **total_revenue**
+
+        A security passes when debt / market cap and cash / market cap do not exceed their
+        limits and (non-compliant revenue + interest income) / total revenue does not exceed
+        the income limit. The income ratio is also the purification ratio of its dividends.
+        Securities whose ratios cannot be computed are reported as NO_DATA.
+        """)
+
+    col1, col2, col3 = st.columns(3)
+    debt_limit = col1.number_input("Debt limit", 0.0, 1.0, Config.APP.SCREEN_DEBT_LIMIT, 0.01, key="screening_debt")
+    cash_limit = col2.number_input("Cash limit", 0.0, 1.0, Config.APP.SCREEN_CASH_LIMIT, 0.01, key="screening_cash")
+    income_limit = col3.number_input("Income limit", 0.0, 1.0, Config.APP.SCREEN_INCOME_LIMIT, 0.01,
+                                     key="screening_income")
+
+    uploaded_file = st.file_uploader("Choose financials file", type=["csv", "xlsx", "xls"], key="screening_upload")
+    if uploaded_file is not None and st.button("Run Screening", type="primary"):
+        data = uploaded_file.getvalue()
+        try:
+            financials = read_upload(uploaded_file.name, data, file_hash(data))
+        except Exception as e:
+            st.error(f"Error reading file: {str(e)}")
+            logger.error(f"Error reading financials file: {str(e)}")
+            financials = None
+        if financials is not None:
+            result = service.screen_delivery(record_id, financials, uploaded_file.name,
+                                             debt_limit, cash_limit, income_limit)
+            if result["success"]:
+                run = result["run"]
+                st.success(f"Screened {run['securities']:,} securities in {run['seconds']:.2f}s")
+                if result["skipped"]:
+                    st.warning(f"{result['skipped']:,} rows without an identifier were skipped")
+            else:
+                st.error("; ".join(result["errors"]) or "Error screening the universe")
+
+    run = service.get_latest_run(record_id)
+    if run is not None:
+        _render_run(service, run)
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional
 from app.models.shariah_model import ShariahData
 from app.services.shariah_service import ShariahService
 from app.ui.components.ui_helpers import show_error_message, show_success_message
+from app.ui.components.clients_view import render_client_name_input
 
 
 def render_shariah_form(service: Optional[ShariahService] = None):
@@ -16,8 +17,10 @@ def render_shariah_form(service: Optional[ShariahService] = None):
     
     st.subheader("Add New Shariah DataFeed Data")
     
+    # Outside the form, so existing clients are suggested while typing
+    client = render_client_name_input("Client Name", key="shariah_form_client")
+    
     with st.form("shariah_form"):
-        client = st.text_input("Client Name")
         current_source = st.text_input("Current Source")
         after_migration = st.text_input("After Migration")
         delivery_name = st.text_input("Delivery Name")
@@ -119,8 +122,11 @@ def render_shariah_edit_form(record_id: int, service: Optional[ShariahService] =
         
     st.subheader(f"Edit Shariah Data - {shariah_data.client}")
     
+    # Outside the form, so existing clients are suggested while typing
+    client = render_client_name_input("Client Name", key=f"shariah_edit_client_{record_id}",
+                                      value=shariah_data.client)
+    
     with st.form("shariah_edit_form"):
-        client = st.text_input("Client Name", value=shariah_data.client)
         current_source = st.text_input("Current Source", value=shariah_data.current_source or "")
         after_migration = st.text_input("After Migration", value=shariah_data.after_migration or "")
         delivery_name = st.text_input("Delivery Name", value=shariah_data.delivery_name or "")
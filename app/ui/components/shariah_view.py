@@ -196,15 +196,12 @@ def render_shariah_aggregated_view(service: Optional[ShariahService] = None):
     
     st.subheader("Aggregated Shariah Data")
     
-    # Get aggregated Shariah data
-    aggregated_data = service.get_aggregated_data()
+    # Get aggregated Shariah data as a DataFrame (no per-client model round-trip)
+    df = service.get_aggregated_frame()
     
-    if not aggregated_data:
+    if df.empty:
         st.info("No Shariah data available for aggregation.")
         return
-        
-    # Convert to DataFrame for display
-    df = pd.DataFrame([d.to_dict() for d in aggregated_data])
     
     # Add filters to sidebar
     filter_columns = ['client', 'universe', 'frequencies', 'sources']
@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, Any, List, Optional, Callable
 import logging
+from app.utils.dtypes import to_editable
+from app.repositories.upsert import APPEND, UPSERT, REPLACE
+from app.utils.error_report import ErrorReport
 
 
 def create_page_header(title: str, subtitle: Optional[str] = None):
@@ -113,8 +116,9 @@ def show_editable_data_table(data: pd.DataFrame,
         st.info("No data available to edit")
         return
     
-    # Clone the data to avoid modifying the original
-    df_to_edit = data.copy()
+    # Work on a plain-object copy: categorical and nullable columns from the
+    # dtype policy would reject free-form edits and pd.NA cannot be bound to SQLite
+    df_to_edit = to_editable(data)
     
     # Create a unique key for this editor
     editor_key = f"data_editor_{key}" if key else "data_editor"
@@ -163,7 +167,9 @@ def show_filter_sidebar(data: pd.DataFrame, columns: List[str], key_prefix: str
     """
     st.sidebar.markdown("## Filters")
     
-    filtered_data = data.copy()
+    # Boolean indexing below always returns new frames, so the (potentially
+    # large) session frame is not copied up front
+    filtered_data = data
     has_filters_applied = False
     
     for col in columns:
@@ -223,6 +229,76 @@ def show_success_message(message: str):
     """
     st.success(message)
     
+def show_import_mode_selector(key: str) -> str:
+    """Show the import mode choice for an upload
+    
+    Args:
+        key: Unique key for the widget
+        
+    Returns:
+        str: Selected import mode ("upsert", "append" or "replace")
+    """
+    labels = {
+        UPSERT: "Update existing records (skip unchanged)",
+        APPEND: "Append all rows as new records",
+        REPLACE: "Replace all records with this file"
+    }
+    return st.radio("Import mode", list(labels), format_func=labels.get, key=key, horizontal=True)
+    
+def show_import_result(result: Dict[str, Any], dataset: str):
+    """Show the outcome of an import
+    
+    Args:
+        result: Result dictionary returned by an import service
+        dataset: Dataset label used in the messages (e.g. "ESG")
+    """
+    if not result.get("success"):
+        show_error_message(f"Failed to import {dataset} data: {'; '.join(result.get('errors', []))}")
+        show_error_report(result.get("error_report"), dataset)
+        return
+        
+    summary = (
+        f"{dataset} import complete: {result.get('records_added', 0)} inserted, "
+        f"{result.get('records_updated', 0)} updated, {result.get('records_unchanged', 0)} unchanged, "
+        f"{result.get('records_skipped', 0)} skipped"
+    )
+    if "records_deleted" in result:
+        summary += f", {result['records_deleted']} deleted"
+    show_success_message(summary)
+    show_error_report(result.get("error_report"), dataset)
+    
+def show_error_report(report: Optional[ErrorReport], dataset: str):
+    """Show the rows an import left out: counts per problem, a sample and a download
+    
+    Args:
+        report: Error report of the import (nothing is shown if it is empty)
+        dataset: Dataset label used in the file name (e.g. "ESG")
+    """
+    if report is None or not report.total:
+        return
+        
+    st.warning(f"{report.total:,} problems found in the file")
+    st.dataframe(report.summary(), hide_index=True, use_container_width=True)
+    
+    sample = report.sample_frame()
+    if len(sample) < report.total:
+        st.caption(f"First {len(sample)} of {report.total:,} problems")
+    st.dataframe(sample, hide_index=True, use_container_width=True)
+    
+    # The full report is only read from disk when asked for
+    if st.button("Prepare full error report", key=f"error_report_{report.key}"):
+        data = report.read_bytes()
+        if data is None:
+            st.info("The full error report has expired.")
+        else:
+            st.download_button(
+                label="Download error report (CSV, gzip)",
+                data=data,
+                file_name=f"{dataset.lower()}_import_errors.csv.gz",
+                mime="application/gzip",
+                key=f"error_report_download_{report.key}"
+            )
+    
 def show_loading_spinner(message: str, func: Callable, **kwargs):
     """Show a loading spinner while executing a function
     
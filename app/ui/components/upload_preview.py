@@ -0,0 +1,78 @@
+import streamlit as st
+import pandas as pd
+import logging
+from typing import Dict, List, Optional
+
+from app.config import Config
+from app.utils.data_helpers import normalize_column_names, profile_columns
+
+logger = logging.getLogger(__name__)
+
+
+def map_columns(df: pd.DataFrame, column_mapping: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Rename uploaded columns to database column names
+
+    Args:
+        df: Uploaded rows
+        column_mapping: Template header -> database column overrides
+
+    Returns:
+        pd.DataFrame: Renamed copy of df
+    """
+    return normalize_column_names(df.rename(columns=column_mapping or {}))
+
+
+def column_mapping_table(df: pd.DataFrame, target_columns: List[str],
+                         column_mapping: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Show where each uploaded column goes
+
+    Args:
+        df: Uploaded rows
+        target_columns: Columns the import writes
+        column_mapping: Template header -> database column overrides
+
+    Returns:
+        pd.DataFrame: Uploaded column, database column and whether it is
+        imported, followed by database columns missing from the file
+    """
+    mapped = map_columns(df.head(0), column_mapping).columns
+    rows = [
+        {"File column": str(source), "Database column": target,
+         "Status": "imported" if target in target_columns else "ignored"}
+        for source, target in zip(df.columns, mapped)
+    ]
+    rows += [
+        {"File column": "", "Database column": target, "Status": "missing"}
+        for target in target_columns if target not in set(mapped)
+    ]
+    return pd.DataFrame(rows, columns=["File column", "Database column", "Status"])
+
+
+def render_upload_preview(df: pd.DataFrame, target_columns: List[str],
+                          column_mapping: Optional[Dict[str, str]] = None):
+    """Preview an upload without rendering the whole file
+
+    Shows the first rows, a random sample, per-column profiles and the
+    mapping to database columns.
+
+    Args:
+        df: Uploaded rows
+        target_columns: Columns the import writes
+        column_mapping: Template header -> database column overrides
+    """
+    rows = Config.APP.PREVIEW_ROWS
+    st.caption(f"{len(df):,} rows × {len(df.columns)} columns")
+
+    head_tab, sample_tab, profile_tab, mapping_tab = st.tabs(
+        ["First rows", "Random sample", "Column profile", "Column mapping"]
+    )
+    with head_tab:
+        st.dataframe(df.head(rows), use_container_width=True)
+    with sample_tab:
+        # Fixed seed so the sample does not change on every rerun
+        st.dataframe(df.sample(n=min(rows, len(df)), random_state=0).sort_index(), use_container_width=True)
+    with profile_tab:
+        st.dataframe(profile_columns(df), hide_index=True, use_container_width=True)
+    with mapping_tab:
+        st.dataframe(column_mapping_table(df, target_columns, column_mapping), hide_index=True,
+                     use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import time
+import streamlit as st
+import pandas as pd
+from typing import Any, Dict, List
+
+from app.services.client_service import ClientService
+from app.utils.profiles import MIGRATION_STATUSES
+from app.ui.components.ui_helpers import create_page_header
+
+
+def _render_fields(fields: List[Dict[str, Any]]):
+    """Render the field coverage of a dataset"""
+    if not fields:
+        return
+    st.markdown("**Field coverage**")
+    st.dataframe(
+        pd.DataFrame(fields),
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'field': 'Field',
+            'records': 'Records',
+            'coverage': st.column_config.ProgressColumn('Coverage', min_value=0, max_value=1, format="%.2f")
+        }
+    )
+
+
+def _render_esg(esg: Dict[str, Any]):
+    """Render the ESG part of a client profile"""
+    st.subheader(f"ESG Records ({esg['record_count']})")
+    if not esg['record_count']:
+        st.info("The client has no ESG records.")
+        return
+    col1, col2 = st.columns(2)
+    col1.markdown(f"**Sources:** {', '.join(esg['sources']) or '—'}")
+    col1.markdown(f"**Data types:** {', '.join(esg['data_types']) or '—'}")
+    col2.markdown("**Compliance:** " + ", ".join(f"{value} ({count})" for value, count in esg['compliance'].items()))
+    _render_fields(esg['fields'])
+    st.dataframe(pd.DataFrame(esg['records']), hide_index=True, use_container_width=True)
+
+
+def _render_shariah(shariah: Dict[str, Any]):
+    """Render the Shariah part of a client profile"""
+    st.subheader(f"Shariah Deliveries ({shariah['record_count']})")
+    if not shariah['record_count']:
+        st.info("The client has no Shariah records.")
+        return
+    col1, col2 = st.columns(2)
+    col1.markdown(f"**Current sources:** {', '.join(shariah['sources']) or '—'}")
+    col1.markdown(f"**After migration:** {', '.join(shariah['after_migration']) or '—'}")
+    col2.markdown(f"**Frequencies:** {', '.join(shariah['frequencies']) or '—'}")
+    col2.markdown(f"**Universe:** {shariah['universe_count']:,} securities")
+
+    columns = st.columns(len(MIGRATION_STATUSES))
+    for column, status in zip(columns, MIGRATION_STATUSES):
+        column.metric(status, shariah['migration'].get(status, 0))
+
+    _render_fields(shariah['fields'])
+    records = pd.DataFrame(shariah['records'])
+    first = [col for col in ('id', 'delivery_name', 'migration_status', 'migration_date') if col in records.columns]
+    st.dataframe(records[first + [col for col in records.columns if col not in first]],
+                 hide_index=True, use_container_width=True)
+
+
+def render_client_page():
+    """Render the detail page of one client across the ESG and Shariah datasets"""
+    create_page_header("Client 360", "Everything on file for one client")
+
+    service = ClientService()
+    prefix = st.text_input("Client name", placeholder="Start typing a client name", key="client_360_search")
+    if not prefix.strip():
+        st.info("Type the start of a client's name to open its profile.")
+        return
+
+    matches = service.search_clients(prefix)
+    if matches.empty:
+        st.warning(f"No client name starts with '{prefix}'.")
+        return
+
+    labels = {f"{row.name} (#{row.client_id})": int(row.client_id) for row in matches.itertuples()}
+    label = st.selectbox("Client", list(labels), key="client_360_client")
+
+    start = time.perf_counter()
+    profile = service.get_profile(labels[label])
+    elapsed = time.perf_counter() - start
+    if profile is None:
+        st.error("The client's profile could not be loaded.")
+        return
+
+    st.header(profile['name'])
+    caption = f"Profile built {profile.get('built_at', '')} · opened in {elapsed * 1000:.0f} ms"
+    if len(profile['names']) > 1:
+        caption = f"Also spelled: {', '.join(profile['names'])} · " + caption
+    st.caption(caption)
+
+    identifiers = profile['identifiers']
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("ESG Records", profile['esg']['record_count'])
+    col2.metric("Shariah Records", profile['shariah']['record_count'])
+    col3.metric("ISINs", f"{identifiers['isin']:,}")
+    col4.metric("SEDOLs", f"{identifiers['sedol']:,}")
+    col5.metric("CUSIPs", f"{identifiers['cusip']:,}")
+
+    tab1, tab2 = st.tabs(["ESG", "Shariah"])
+    with tab1:
+        _render_esg(profile['esg'])
+    with tab2:
+        _render_shariah(profile['shariah'])
\ No newline at end of file
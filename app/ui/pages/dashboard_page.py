@@ -5,7 +5,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from app.services.esg_service import ESGService, get_all_esg_data
 from app.services.shariah_service import ShariahService, get_all_shariah_data
+from app.services.identifier_service import IdentifierService
+from app.services.carbon_service import CarbonService
+from app.services.calendar_service import DeliveryCalendarService
 from app.ui.components.ui_helpers import create_page_header
+from app.config import Config
 
 
 def render_dashboard_page():
@@ -20,6 +24,10 @@ def render_dashboard_page():
     esg_df = get_all_esg_data()
     shariah_df = get_all_shariah_data()
     
+    # Per-client aggregates (grouped by client_id, so name variants count once)
+    esg_clients = esg_service.get_aggregated_frame()
+    shariah_clients = shariah_service.get_aggregated_frame()
+    
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -36,17 +44,15 @@ def render_dashboard_page():
         )
     
     with col3:
-        unique_esg_clients = esg_df['client'].nunique() if not esg_df.empty and 'client' in esg_df.columns else 0
         st.metric(
             label="ESG Clients", 
-            value=unique_esg_clients
+            value=len(esg_clients)
         )
     
     with col4:
-        unique_shariah_clients = shariah_df['client'].nunique() if not shariah_df.empty and 'client' in shariah_df.columns else 0
         st.metric(
             label="Shariah Clients", 
-            value=unique_shariah_clients
+            value=len(shariah_clients)
         )
     
     # Create visualization tabs
@@ -79,8 +85,8 @@ def render_dashboard_page():
             
             with col1:
                 # Client counts
-                if 'client' in esg_df.columns:
-                    client_counts = esg_df["client"].value_counts().reset_index()
+                if not esg_clients.empty:
+                    client_counts = esg_clients.nlargest(10, 'record_count')[['client', 'record_count']]
                     client_counts.columns = ['Client', 'Count']
                     
                     fig_clients = px.bar(
@@ -120,22 +126,72 @@ def render_dashboard_page():
                         esg_df['sedol_count'].sum(),
                         esg_df['isin_count'].sum(),
                         esg_df['cusip_count'].sum()
-                    ]
+                    ],
+                    'Measure': 'Per delivery (sum)'
                 }
                 identifier_df = pd.DataFrame(identifier_data)
                 
+                # Securities delivered to several clients count once (from the uploaded identifiers)
+                coverage = IdentifierService(Config.DB.ESG_TABLE).get_coverage()
+                if any(coverage.values()):
+                    identifier_df = pd.concat([identifier_df, pd.DataFrame({
+                        'Type': ['SEDOL', 'ISIN', 'CUSIP'],
+                        'Count': [coverage['sedol'], coverage['isin'], coverage['cusip']],
+                        'Measure': 'Distinct on file'
+                    })], ignore_index=True)
+                
                 fig_identifiers = px.bar(
                     identifier_df,
                     x='Type',
                     y='Count',
                     title='Identifier Coverage',
-                    color='Type',
+                    color='Measure',
+                    barmode='group',
                     text='Count'
                 )
                 fig_identifiers.update_traces(texttemplate='%{text:,}', textposition='inside')
                 st.plotly_chart(fig_identifiers, use_container_width=True)
             else:
                 st.warning("Identifier data is incomplete or missing.")
+            
+            # Carbon metrics of the client portfolios (from the uploaded holdings and issuer emissions)
+            st.subheader("Portfolio Carbon Footprint")
+            carbon = CarbonService().get_portfolio_metrics()
+            if carbon.empty:
+                st.info("Upload issuer emissions and portfolio holdings in the 'Input Data' section "
+                        "to see the carbon metrics of client portfolios.")
+            else:
+                carbon['Portfolio'] = '#' + carbon['record_id'].astype(str) + ' ' + carbon['client'].astype(str)
+                with_waci = carbon.dropna(subset=['waci']).nlargest(20, 'waci')
+                if not with_waci.empty:
+                    fig_waci = px.bar(
+                        with_waci,
+                        x='Portfolio',
+                        y='waci',
+                        title='Weighted Average Carbon Intensity (tCO2e / $M revenue)',
+                        color='intensity_coverage',
+                        color_continuous_scale='Viridis',
+                        labels={'waci': 'WACI', 'intensity_coverage': 'Coverage'}
+                    )
+                    st.plotly_chart(fig_waci, use_container_width=True)
+                
+                st.dataframe(
+                    carbon[['Portfolio', 'data_source', 'holdings', 'matched', 'market_value', 'financed_emissions',
+                            'carbon_footprint', 'waci', 'emissions_coverage', 'intensity_coverage']],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        'data_source': 'Data Source',
+                        'holdings': 'Holdings',
+                        'matched': 'Matched',
+                        'market_value': st.column_config.NumberColumn('Market Value', format="%.0f"),
+                        'financed_emissions': st.column_config.NumberColumn('Financed Emissions (tCO2e)', format="%.1f"),
+                        'carbon_footprint': st.column_config.NumberColumn('Footprint (tCO2e / $M)', format="%.2f"),
+                        'waci': st.column_config.NumberColumn('WACI', format="%.2f"),
+                        'emissions_coverage': st.column_config.ProgressColumn('Emissions Coverage', min_value=0, max_value=1),
+                        'intensity_coverage': st.column_config.ProgressColumn('WACI Coverage', min_value=0, max_value=1)
+                    }
+                )
     
     # Tab 2: Shariah Analytics
     with tab2:
@@ -164,8 +220,8 @@ def render_dashboard_page():
             
             with col1:
                 # Client counts
-                if 'client' in shariah_df.columns:
-                    client_counts = shariah_df["client"].value_counts().reset_index()
+                if not shariah_clients.empty:
+                    client_counts = shariah_clients.nlargest(10, 'record_count')[['client', 'record_count']]
                     client_counts.columns = ['Client', 'Count']
                     
                     fig_clients = px.bar(
@@ -180,10 +236,9 @@ def render_dashboard_page():
             
             with col2:
                 # Universe counts by client
-                if 'universe_count' in shariah_df.columns and 'client' in shariah_df.columns:
-                    universe_by_client = shariah_df.groupby('client')['universe_count'].sum().reset_index()
+                if not shariah_clients.empty:
+                    universe_by_client = shariah_clients.nlargest(10, 'total_universe_count')[['client', 'total_universe_count']]
                     universe_by_client.columns = ['Client', 'Universe Count']
-                    universe_by_client = universe_by_client.sort_values('Universe Count', ascending=False).head(10)
                     
                     fig_universe = px.bar(
                         universe_by_client,
@@ -195,6 +250,79 @@ def render_dashboard_page():
                     )
                     st.plotly_chart(fig_universe, use_container_width=True)
             
+            # Universe overlap between clients (from the uploaded delivery identifiers)
+            st.subheader("Universe Overlap")
+            col1, col2 = st.columns(2)
+            with col1:
+                overlap_type = st.selectbox("Compare on", ["ISIN", "SEDOL", "CUSIP"], key="overlap_id_type").lower()
+            with col2:
+                overlap_measure = st.radio("Show", ["Shared securities", "% of row client's universe"],
+                                           horizontal=True, key="overlap_measure")
+            
+            overlap = IdentifierService(Config.DB.SHARIAH_TABLE).get_universe_overlap(overlap_type)
+            if len(overlap) < 2:
+                st.info("Upload the identifiers of at least two clients' deliveries to compare their universes.")
+            else:
+                # Largest universes first, capped to keep the heatmap readable
+                sizes = pd.Series(np.diag(overlap), index=overlap.index).sort_values(ascending=False)
+                top = sizes.index[:30]
+                shown = overlap.loc[top, top]
+                if overlap_measure != "Shared securities":
+                    shown = (shown.div(sizes[top].where(sizes[top] > 0), axis=0) * 100).round(1)
+                
+                fig_overlap = px.imshow(
+                    shown,
+                    text_auto=True,
+                    aspect='auto',
+                    color_continuous_scale='Viridis',
+                    title=f'Universe Overlap ({overlap_type.upper()})'
+                )
+                st.plotly_chart(fig_overlap, use_container_width=True)
+                if len(sizes) > len(top):
+                    st.caption(f"Showing the {len(top)} largest of {len(sizes)} universes.")
+            
+            # Delivery dates and data source load (from the frequencies and migration plans)
+            st.subheader("Delivery Calendar")
+            calendar_service = DeliveryCalendarService()
+            upcoming = calendar_service.get_upcoming(days=30)
+            if upcoming.empty:
+                st.info("No deliveries scheduled in the next 30 days.")
+            else:
+                st.dataframe(
+                    upcoming[['delivery_date', 'client', 'delivery_name', 'frequency', 'source', 'universe_count']],
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        'delivery_date': 'Date',
+                        'client': 'Client',
+                        'delivery_name': 'Delivery',
+                        'frequency': 'Frequency',
+                        'source': 'Source',
+                        'universe_count': st.column_config.NumberColumn('Securities', format="%d")
+                    }
+                )
+            
+            load = calendar_service.get_source_load()
+            if not load.empty:
+                load['source'] = load['source'].replace('', 'Unknown')
+                fig_load = px.bar(
+                    load,
+                    x='month',
+                    y='securities',
+                    color='source',
+                    facet_col='scenario',
+                    title=f'Projected Securities Delivered per Source (next {Config.APP.CALENDAR_HORIZON_DAYS} days)',
+                    labels={'month': 'Month', 'securities': 'Securities', 'source': 'Source', 'scenario': 'Scenario'},
+                    hover_data=['deliveries'],
+                    color_discrete_sequence=px.colors.qualitative.Pastel
+                )
+                st.plotly_chart(fig_load, use_container_width=True)
+            
+            unscheduled = calendar_service.get_unscheduled()
+            if not unscheduled.empty:
+                st.caption(f"{len(unscheduled)} records have no recognised frequency and are not scheduled: "
+                           + ", ".join(sorted(unscheduled['frequency'].fillna('(empty)').astype(str).unique())))
+            
             # Migration status
             if 'current_source' in shariah_df.columns and 'after_migration' in shariah_df.columns:
                 st.subheader("Migration Analysis")
@@ -202,8 +330,8 @@ def render_dashboard_page():
                 migration_data = shariah_df[['current_source', 'after_migration']].drop_duplicates()
                 
                 for _, row in migration_data.iterrows():
-                    source = row['current_source'] or 'Unknown'
-                    target = row['after_migration'] or 'Unknown'
+                    source = row['current_source'] if not pd.isna(row['current_source']) and row['current_source'] else 'Unknown'
+                    target = row['after_migration'] if not pd.isna(row['after_migration']) and row['after_migration'] else 'Unknown'
                     
                     st.write(f"**Migration Path:** {source} → {target}")
                     
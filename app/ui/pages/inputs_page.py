@@ -5,9 +5,45 @@ from app.services.esg_service import ESGService
 from app.services.shariah_service import ShariahService
 from app.models.esg_model import ESGData
 from app.models.shariah_model import ShariahData
+from app.ui.components.ui_helpers import show_import_mode_selector, confirm_action
+from app.ui.components.import_jobs_view import render_import_jobs, refresh_import_jobs
+from app.ui.components.identifiers_view import render_identifier_upload
+from app.ui.components.screening_view import render_screening
+from app.ui.components.carbon_view import render_carbon_upload
+from app.ui.components.clients_view import render_client_name_input
+from app.services.import_jobs import submit_import_job
+from app.ui.components.upload_preview import render_upload_preview, map_columns
+from app.utils.upload_cache import file_hash, upload_sheets, read_upload
+from app.repositories.upsert import REPLACE, content_columns
+from app.config import Config
 
 logger = logging.getLogger(__name__)
 
+def _read_upload(uploaded_file, key: str) -> pd.DataFrame:
+    """Read an uploaded CSV or Excel file
+    
+    The parsed frame is cached by file hash, so reruns of the page do not
+    read the upload again. Workbooks with several sheets (e.g. one per
+    region) can be imported as a single batch; their sheets are parsed in
+    parallel.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        key: Unique key prefix for the widgets
+        
+    Returns:
+        pd.DataFrame: Uploaded rows (shared with the cache; do not modify in place)
+    """
+    data = uploaded_file.getvalue()
+    digest = file_hash(data)
+    all_sheets = False
+    if not uploaded_file.name.lower().endswith('.csv'):
+        sheets = upload_sheets(data, digest)
+        if len(sheets) > 1:
+            all_sheets = st.checkbox(f"Import all {len(sheets)} sheets ({', '.join(sheets)})",
+                                     value=True, key=f"{key}_all_sheets")
+    return read_upload(uploaded_file.name, data, digest, all_sheets)
+
 def render_inputs_page():
     """Render the data inputs page"""
     st.title("Data Inputs")
@@ -17,11 +53,14 @@ def render_inputs_page():
     shariah_service = ShariahService()
     
     # Create tabs for different data input options
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
         "Add ESG Data", 
         "Add Shariah Data", 
         "Upload ESG Master Data", 
-        "Upload Shariah Data"
+        "Upload Shariah Data",
+        "Upload Identifiers",
+        "Shariah Screening",
+        "Portfolio Emissions"
     ])
     
     # Tab 1: Add ESG Data Form
@@ -29,10 +68,12 @@ def render_inputs_page():
         st.header("Add New ESG Data")
         st.info("Enter ESG data according to the master template format")
         
+        # Client name outside the form, so existing clients are suggested while typing
+        client = render_client_name_input("Client Name*", key="esg_input_client", help="Required")
+        
         # Form for adding ESG data
         with st.form("esg_form"):
             # Required fields
-            client = st.text_input("Client Name*", help="Required")
             fields = st.text_area("Fields*", height=150, help="Required - Enter fields like Carbon footprint, ESG Ratings, etc.")
             
             col1, col2 = st.columns(2)
@@ -95,10 +136,12 @@ def render_inputs_page():
         st.header("Add New Shariah DataFeed Data")
         st.info("Enter Shariah data for client reporting")
         
+        # Client name outside the form, so existing clients are suggested while typing
+        client = render_client_name_input("Client Name*", key="shariah_input_client", help="Required")
+        
         # Form for adding Shariah data
         with st.form("shariah_form"):
             # Required fields
-            client = st.text_input("Client Name*", help="Required")
             
             col1, col2 = st.columns(2)
             with col1:
@@ -211,10 +254,7 @@ def render_inputs_page():
         
         if uploaded_file is not None:
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                df = _read_upload(uploaded_file, "esg_upload")
                 
                 # Rename columns to match database names if needed
                 column_mapping = {
@@ -228,35 +268,34 @@ def render_inputs_page():
                     'Compliance': 'compliance'
                 }
                 
-                # Create a copy to avoid modifying the view
-                df_display = df.copy()
+                render_upload_preview(df, content_columns(Config.DB.ESG_TABLE), column_mapping)
                 
-                # Show the data
-                st.dataframe(df_display)
+                import_mode = show_import_mode_selector("esg_import_mode")
+                confirmed = True
+                if import_mode == REPLACE:
+                    confirmed = confirm_action(
+                        "Delete every ESG record that is not in this file", "esg_replace_confirm"
+                    )
                 
-                if st.button("Import ESG Data", type="primary"):
+                if st.button("Import ESG Data", type="primary", disabled=not confirmed):
+                    # Rename columns for database compatibility
+                    df_upload = map_columns(df, column_mapping)
+                    
                     # Check required columns
-                    expected_columns = ["Client", "Fields"]
-                    missing_columns = [col for col in expected_columns if col not in df.columns]
+                    expected_columns = {"client": "Client", "fields": "Fields"}
+                    missing_columns = [label for col, label in expected_columns.items() if col not in df_upload.columns]
                     
                     if missing_columns:
                         st.error(f"Missing required columns: {', '.join(missing_columns)}")
                     else:
-                        # Rename columns for database compatibility
-                        df_upload = df.copy()
-                        for old_col, new_col in column_mapping.items():
-                            if old_col in df_upload.columns:
-                                df_upload.rename(columns={old_col: new_col}, inplace=True)
-                        
-                        # Import data
-                        result = esg_service.bulk_import_esg_data(df_upload)
-                        if result:
-                            st.success(f"Successfully imported {len(df)} ESG data records")
-                        else:
-                            st.error("Failed to import ESG data")
+                        # Import in the background so large files don't block the page
+                        job_id = submit_import_job("esg", df_upload, import_mode, uploaded_file.name)
+                        st.success(f"Import job #{job_id} queued. Progress is shown below.")
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
                 logger.exception("Error processing ESG file")
+        
+        esg_jobs_active = render_import_jobs("esg", "ESG")
     
     # Tab 4: Upload Shariah Data
     with tab4:
@@ -295,22 +334,39 @@ def render_inputs_page():
         
         if uploaded_file is not None:
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
-                    
-                st.dataframe(df)
+                df = _read_upload(uploaded_file, "shariah_upload")
+                render_upload_preview(df, content_columns(Config.DB.SHARIAH_TABLE))
                 
-                if st.button("Import Shariah Data", type="primary"):
-                    if "client" not in df.columns:
+                import_mode = show_import_mode_selector("shariah_import_mode")
+                confirmed = True
+                if import_mode == REPLACE:
+                    confirmed = confirm_action(
+                        "Delete every Shariah record that is not in this file", "shariah_replace_confirm"
+                    )
+                
+                if st.button("Import Shariah Data", type="primary", disabled=not confirmed):
+                    df_upload = map_columns(df)
+                    if "client" not in df_upload.columns:
                         st.error("CSV must include 'client' column")
                     else:
-                        result = shariah_service.bulk_import_shariah_data(df)
-                        if result:
-                            st.success(f"Successfully imported {len(df)} Shariah data records")
-                        else:
-                            st.error("Failed to import Shariah data")
+                        # Import in the background so large files don't block the page
+                        job_id = submit_import_job("shariah", df_upload, import_mode, uploaded_file.name)
+                        st.success(f"Import job #{job_id} queued. Progress is shown below.")
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
-                logger.exception("Error processing Shariah file") 
\ No newline at end of file
+                logger.exception("Error processing Shariah file")
+        
+        shariah_jobs_active = render_import_jobs("shariah", "Shariah")
+    
+    # Tab 5: Upload the identifiers behind the SEDOL/ISIN/CUSIP counts
+    with tab5:
+        render_identifier_upload()
+
+    with tab6:
+        render_screening()
+
+    with tab7:
+        render_carbon_upload()
+
+    # Progress of active import jobs, once every tab has rendered
+    refresh_import_jobs(esg_jobs_active or shariah_jobs_active)
\ No newline at end of file
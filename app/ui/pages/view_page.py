@@ -1,6 +1,8 @@
 import streamlit as st
 from app.ui.components.esg_view import render_esg_data_view, render_esg_aggregated_view
 from app.ui.components.shariah_view import render_shariah_data_view, render_shariah_aggregated_view
+from app.ui.components.deliveries_view import render_delivery_builder
+from app.ui.components.clients_view import render_client_cross_reference
 from app.ui.components.ui_helpers import create_page_header
 
 
@@ -16,7 +18,8 @@ def render_view_page():
     view_section = st.sidebar.radio("Select View Section", [
         "ESG Data", 
         "Shariah DataFeed Data", 
-        "Aggregated Reports"
+        "Aggregated Reports",
+        "Delivery Files"
     ], key="view_section_radio")
     
     # Update session state when view changes
@@ -35,10 +38,15 @@ def render_view_page():
         
         report_section = st.radio("Select report type", [
             "ESG Aggregated Data", 
-            "Shariah DataFeed Aggregated Data"
+            "Shariah DataFeed Aggregated Data",
+            "ESG ↔ Shariah Clients"
         ], key="aggregated_report_type")
         
         if report_section == "ESG Aggregated Data":
             render_esg_aggregated_view()
         elif report_section == "Shariah DataFeed Aggregated Data":
-            render_shariah_aggregated_view() 
\ No newline at end of file
+            render_shariah_aggregated_view()
+        elif report_section == "ESG ↔ Shariah Clients":
+            render_client_cross_reference()
+    elif view_section == "Delivery Files":
+        render_delivery_builder() 
\ No newline at end of file
@@ -0,0 +1,161 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from app.utils.data_helpers import map_column_aliases
+from app.utils.validation import parse_numbers
+
+logger = logging.getLogger(__name__)
+
+# Issuer emissions (tCO2e) and financials, in the currency of the holdings
+EMISSIONS_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'identifier': ('identifier', 'isin', 'sedol', 'cusip', 'ticker', 'issuer'),
+    'scope1_emissions': ('scope1_emissions', 'scope_1_emissions', 'scope1', 'scope_1'),
+    'scope2_emissions': ('scope2_emissions', 'scope_2_emissions', 'scope2', 'scope_2'),
+    'revenue': ('revenue', 'total_revenue', 'sales'),
+    'evic': ('evic', 'enterprise_value_including_cash', 'enterprise_value')
+}
+
+# Positions of a portfolio
+HOLDINGS_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'identifier': ('identifier', 'isin', 'sedol', 'cusip', 'ticker', 'security'),
+    'market_value': ('market_value', 'value', 'position_value', 'holding_value')
+}
+
+# Metrics per portfolio (intensities per million of revenue or of value invested)
+METRIC_COLUMNS = ['holdings', 'matched', 'market_value', 'financed_emissions', 'carbon_footprint',
+                  'waci', 'emissions_coverage', 'intensity_coverage']
+
+
+def map_emissions_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """Rename the columns of an issuer emissions file (see EMISSIONS_COLUMNS)"""
+    return map_column_aliases(df, EMISSIONS_COLUMNS)
+
+
+def map_holdings_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """Rename the columns of a holdings file (see HOLDINGS_COLUMNS)"""
+    return map_column_aliases(df, HOLDINGS_COLUMNS)
+
+
+def normalize_identifiers(values: pd.Series) -> np.ndarray:
+    """Strip and upper-case identifiers so holdings and issuers match
+
+    Returns:
+        np.ndarray: Fixed-width unicode identifiers ('' for missing values)
+    """
+    text = values.astype(object).where(values.notna(), '')
+    return text.astype(str).str.strip().str.upper().to_numpy(dtype=str)
+
+
+def issuer_arrays(issuers: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Turn issuer emissions into arrays sorted by identifier
+
+    Scope 1 and 2 emissions are added up; an issuer missing either has no
+    emissions. Identifiers are expected to be unique.
+
+    Args:
+        issuers: identifier, scope1_emissions, scope2_emissions, revenue and
+            evic columns
+
+    Returns:
+        Dict[str, np.ndarray]: identifier (sorted), emissions, revenue and
+        evic (float64, NaN where unknown)
+    """
+    identifiers = normalize_identifiers(issuers['identifier'])
+    order = np.argsort(identifiers, kind='stable')
+    numbers = {column: parse_numbers(issuers[column])[0][order]
+               for column in ('scope1_emissions', 'scope2_emissions', 'revenue', 'evic')}
+    return {
+        'identifier': identifiers[order],
+        'emissions': numbers['scope1_emissions'] + numbers['scope2_emissions'],
+        'revenue': numbers['revenue'],
+        'evic': numbers['evic']
+    }
+
+
+def portfolio_metrics(keys: np.ndarray, identifiers: np.ndarray, market_values: np.ndarray,
+                      issuers: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Compute the carbon metrics of many portfolios at once
+
+    Holdings are joined to the issuers by binary search of their distinct
+    identifiers in the sorted issuer identifiers, sorted by portfolio key, and every sum is taken per
+    portfolio with one np.add.reduceat over the group starts:
+
+    - financed emissions: sum of value / EVIC x emissions (tCO2e)
+    - carbon footprint: financed emissions per million invested, over the
+      value with emissions and EVIC
+    - WACI: value-weighted average of emissions per million of revenue, over
+      the value with emissions and revenue
+    - coverage: share of the portfolio's value each metric is based on
+
+    Args:
+        keys: Portfolio of each holding (int64)
+        identifiers: Identifier of each holding (from normalize_identifiers())
+        market_values: Value of each holding (float64; NaN and negative
+            values count as 0)
+        issuers: Output of issuer_arrays()
+
+    Returns:
+        pd.DataFrame: METRIC_COLUMNS indexed by portfolio key (metrics NaN
+        where nothing is covered)
+    """
+    if len(keys) == 0:
+        return pd.DataFrame(columns=METRIC_COLUMNS, index=pd.Index([], dtype=np.int64, name='portfolio'))
+
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    values = np.nan_to_num(market_values[order], nan=0.0).clip(min=0.0)
+
+    # Join to the issuers: position of each holding's identifier, if listed.
+    # Only the distinct identifiers are searched; holdings repeat them across portfolios.
+    issuer_ids = issuers['identifier']
+    codes, distinct = pd.factorize(identifiers)
+    distinct = np.asarray(distinct, dtype=str)
+    if len(issuer_ids):
+        found = np.minimum(np.searchsorted(issuer_ids, distinct), len(issuer_ids) - 1)
+        listed = issuer_ids[found] == distinct
+    else:
+        found = np.zeros(len(distinct), dtype=np.int64)
+        listed = np.zeros(len(distinct), dtype=bool)
+    codes = codes[order]
+    position = found[codes]
+    matched = listed[codes]
+
+    def issuer_column(name: str) -> np.ndarray:
+        column = issuers[name][position] if len(issuer_ids) else np.full(len(keys), np.nan)
+        return np.where(matched, column, np.nan)
+
+    emissions = issuer_column('emissions')
+    revenue = issuer_column('revenue')
+    evic = issuer_column('evic')
+    attributed = ~np.isnan(emissions) & (evic > 0)
+    intensity_known = ~np.isnan(emissions) & (revenue > 0)
+    attributed_value = np.where(attributed, values, 0.0)
+    intensity_value = np.where(intensity_known, values, 0.0)
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sums = np.add.reduceat(np.vstack([
+        np.ones(len(keys)),
+        matched.astype(np.float64),
+        values,
+        attributed_value,
+        np.divide(attributed_value * np.nan_to_num(emissions), evic, out=np.zeros(len(keys)), where=attributed),
+        intensity_value,
+        np.divide(intensity_value * np.nan_to_num(emissions) * 1e6, revenue, out=np.zeros(len(keys)),
+                  where=intensity_known)
+    ]), starts, axis=1)
+    holdings, matched_count, total, covered, financed, intensity_covered, weighted = sums
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = pd.DataFrame({
+            'holdings': holdings.astype(np.int64),
+            'matched': matched_count.astype(np.int64),
+            'market_value': total,
+            'financed_emissions': np.where(covered > 0, financed, np.nan),
+            'carbon_footprint': np.where(covered > 0, financed / covered * 1e6, np.nan),
+            'waci': np.where(intensity_covered > 0, weighted / intensity_covered, np.nan),
+            'emissions_coverage': np.where(total > 0, covered / total, np.nan),
+            'intensity_coverage': np.where(total > 0, intensity_covered / total, np.nan)
+        }, index=pd.Index(keys[starts], name='portfolio'))
+    return metrics
\ No newline at end of file
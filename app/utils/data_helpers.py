@@ -2,7 +2,8 @@ import re
 import pandas as pd
 import logging
 import json
-from typing import List, Dict, Any, Optional, Set, Union
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +33,17 @@ def deduplicate_fields(fields_str: Optional[str]) -> str:
     # Join back with commas
     return ', '.join(unique_fields)
 
+# Compiled once: normalize_name() runs for every client name written
+_NAME_SEPARATORS = re.compile(r'[\W_]+')
+
+@lru_cache(maxsize=65536)
 def normalize_name(name: str) -> str:
     """Normalize a name by removing special characters and converting to lowercase
     
+    Letters and digits of any script are kept; everything else becomes a
+    single space. Results are cached, since the same names are written over
+    and over.
+    
     Args:
         name: Name to normalize
         
@@ -44,13 +53,22 @@ def normalize_name(name: str) -> str:
     if not name:
         return ""
         
-    # Convert to lowercase and replace special chars with spaces
-    normalized = re.sub(r'[^a-zA-Z0-9]', ' ', name.lower())
+    return _NAME_SEPARATORS.sub(' ', name.lower()).strip()
+
+@lru_cache(maxsize=65536)
+def client_key(name: str) -> str:
+    """Get the canonical key of a client name
     
-    # Replace multiple spaces with a single space
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    Spelling variants that differ only in case, spacing or punctuation
+    ("AlRajhi", "Al Rajhi", "Al-Rajhi") share a key.
     
-    return normalized
+    Args:
+        name: Client name
+        
+    Returns:
+        str: Key (empty if the name has no letters or digits)
+    """
+    return normalize_name(name).replace(' ', '')
 
 def parse_json_fields(json_str: Optional[str]) -> Dict[str, Any]:
     """Parse a JSON string into a dictionary
@@ -191,11 +209,35 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     rename_map = {}
     for col in df.columns:
         # Convert to lowercase, replace spaces with underscores
-        new_col = col.lower().replace(' ', '_')
+        # (spreadsheet headers may be numbers or carry stray whitespace)
+        new_col = str(col).strip().lower().replace(' ', '_')
         rename_map[col] = new_col
         
     return df.rename(columns=rename_map)
     
+def map_column_aliases(df: pd.DataFrame, aliases: Dict[str, Tuple[str, ...]]) -> Tuple[pd.DataFrame, List[str]]:
+    """Rename the columns of an uploaded file to the names the application reads
+    
+    Args:
+        df: DataFrame as read from the file
+        aliases: Accepted headers (after normalize_column_names()) per
+            column name, in order of preference
+        
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: DataFrame with the recognised columns
+        renamed (others are dropped) and the names of the columns not found
+    """
+    df = normalize_column_names(df)
+    rename_map = {}
+    missing = []
+    for column, accepted in aliases.items():
+        found = next((alias for alias in accepted if alias in df.columns), None)
+        if found is None:
+            missing.append(column)
+        else:
+            rename_map[found] = column
+    return df[list(rename_map)].rename(columns=rename_map), missing
+    
 def ensure_required_columns(df: pd.DataFrame, required_columns: List[str]) -> bool:
     """Check if DataFrame has all required columns
     
@@ -243,4 +285,29 @@ def validate_dataframe(df: pd.DataFrame, required_columns: List[str]) -> Dict[st
         if null_count > 0:
             results['warnings'].append(f"Column '{col}' has {null_count} missing values")
             
-    return results 
\ No newline at end of file
+    return results 
+            
+def profile_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Profile the columns of a DataFrame
+    
+    Null shares and distinct counts are computed for all columns at once;
+    the type is inferred from the values, so text columns holding numbers
+    or mixed values are reported as such.
+    
+    Args:
+        df: DataFrame to profile
+        
+    Returns:
+        pd.DataFrame: One row per column with its inferred type, null % and
+        distinct value count
+    """
+    if len(df.columns) == 0:
+        return pd.DataFrame(columns=['Column', 'Type', 'Null %', 'Distinct'])
+        
+    null_share = df.isna().mean() * 100 if len(df) else pd.Series(0.0, index=df.columns)
+    return pd.DataFrame({
+        'Column': [str(col) for col in df.columns],
+        'Type': [pd.api.types.infer_dtype(df.iloc[:, i], skipna=True) for i in range(len(df.columns))],
+        'Null %': null_share.round(1).to_numpy(),
+        'Distinct': df.nunique(dropna=True).to_numpy()
+    })
\ No newline at end of file
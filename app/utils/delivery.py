@@ -0,0 +1,138 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.identifiers import CUSIP_COUNTRIES, SEDOL_COUNTRIES, decode_identifiers, validate_identifiers
+
+logger = logging.getLogger(__name__)
+
+# Delivery file formats
+CSV = "csv"
+XLSX = "xlsx"
+FILE_FORMATS = (CSV, XLSX)
+
+# Requested fields (normalized with field_key()) and the column of a delivery
+# frame that fills them; other fields are delivered as empty columns
+FIELD_SOURCES: Dict[str, str] = {
+    'isin': 'isin',
+    'sedol': 'sedol',
+    'cusip': 'cusip',
+    'nation': 'country',
+    'country': 'country',
+    'aaoifi': 'status',
+    'compliance': 'status',
+    'compliance_status': 'status',
+    'shariah_status': 'status',
+    'status': 'status',
+    'debt_ratio': 'debt_ratio',
+    'cash_ratio': 'cash_ratio',
+    'income_ratio': 'income_ratio',
+    'purification_ratio': 'purification_ratio',
+    'purification': 'purification_ratio'
+}
+
+SCREENING_COLUMNS = ['status', 'debt_ratio', 'cash_ratio', 'income_ratio', 'purification_ratio']
+
+
+def field_key(field: str) -> str:
+    """Normalize a requested field name ("Compliance Status" -> "compliance_status")"""
+    return re.sub(r'[^a-z0-9]+', '_', str(field).strip().lower()).strip('_')
+
+
+def split_fields(fields: Optional[str]) -> List[str]:
+    """Get the requested fields of a delivery in order, without duplicates
+
+    Args:
+        fields: Comma-separated fields as stored on the record
+
+    Returns:
+        List[str]: Field names as the client requested them
+    """
+    seen = set()
+    result = []
+    for field in (fields or '').split(','):
+        field = field.strip()
+        if field and field_key(field) not in seen:
+            seen.add(field_key(field))
+            result.append(field)
+    return result
+
+
+def _embedded(isins: pd.Series, id_type: str) -> pd.Series:
+    """Read the CUSIP (US/CA) or SEDOL (GB/IE) embedded in ISINs, None elsewhere"""
+    country = isins.str[:2]
+    if id_type == 'cusip':
+        codes = isins.str[2:11].where(country.isin(CUSIP_COUNTRIES))
+    else:
+        codes = isins.str[4:11].where(country.isin(SEDOL_COUNTRIES) & (isins.str[2:4] == '00'))
+    present = codes.notna().to_numpy()
+    valid = np.zeros(len(codes), dtype=bool)
+    if present.any():
+        valid[present] = validate_identifiers(codes[present].to_numpy(dtype=str), id_type)
+    return codes.where(valid, None)
+
+
+def delivery_frame(identifier_codes: Dict[str, np.ndarray], screening: Optional[pd.DataFrame],
+                   fields: List[str]) -> Tuple[pd.DataFrame, List[str]]:
+    """Build the rows of a delivery file
+
+    The delivery's universe is its uploaded identifiers: one row per ISIN
+    if ISINs were uploaded, otherwise per SEDOL, otherwise per CUSIP. For
+    ISIN rows the embedded CUSIP/SEDOL and the country code are read from
+    the ISIN. Screening results are joined on the row's identifier.
+
+    Args:
+        identifier_codes: Codes per identifier type (see load_identifier_set())
+        screening: Results of the delivery's latest screening run (or None)
+        fields: Requested fields, in delivery order
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: One column per field (named as
+        requested) and the fields no data is available for (delivered empty)
+    """
+    key_type = next((id_type for id_type in ('isin', 'sedol', 'cusip') if len(identifier_codes.get(id_type, ()))), None)
+    if key_type is None:
+        keys = pd.Series([], dtype=object)
+    else:
+        keys = pd.Series(decode_identifiers(identifier_codes[key_type], key_type), dtype=object)
+
+    source = pd.DataFrame({key_type or 'isin': keys})
+    if key_type == 'isin':
+        source['country'] = keys.str[:2]
+        for id_type in ('cusip', 'sedol'):
+            source[id_type] = _embedded(keys, id_type)
+
+    if screening is not None and not screening.empty:
+        results = screening.assign(identifier=screening['identifier'].astype(str).str.strip().str.upper())
+        results = results.drop_duplicates('identifier', keep='last').set_index('identifier')
+        for column in SCREENING_COLUMNS:
+            source[column] = keys.map(results[column]).to_numpy()
+
+    columns = {}
+    missing = []
+    for field in fields:
+        column = FIELD_SOURCES.get(field_key(field))
+        if column in source.columns:
+            columns[field] = source[column].to_numpy()
+        else:
+            columns[field] = np.full(len(source), None, dtype=object)
+            missing.append(field)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(source))), missing
+
+
+def write_delivery(df: pd.DataFrame, path: str, file_format: str):
+    """Write a delivery file
+
+    Args:
+        df: Output of delivery_frame()
+        path: File path (its folder must exist)
+        file_format: CSV or XLSX
+    """
+    if file_format == XLSX:
+        df.to_excel(path, index=False)
+    elif file_format == CSV:
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unknown delivery format: {file_format}")
\ No newline at end of file
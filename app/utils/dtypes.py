@@ -0,0 +1,79 @@
+import pandas as pd
+import logging
+from typing import Dict, Optional
+
+from app.models.schema import INTEGER, COUNT, TOTAL, ENUM, TEXT, TIMESTAMP
+
+logger = logging.getLogger(__name__)
+
+
+def _string_dtype() -> Optional[str]:
+    """Get the dtype used for free-text columns
+
+    Returns:
+        Optional[str]: "string[pyarrow]" when pyarrow is importable, otherwise
+            None (keep Python object columns)
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return "string[pyarrow]"
+    except ImportError:
+        return None
+
+
+STRING_DTYPE = _string_dtype()
+
+# Dtype policy for loaded frames, keyed by schema column kind
+KIND_DTYPES: Dict[str, Optional[str]] = {
+    INTEGER: "int64",
+    COUNT: "Int32",
+    TOTAL: "Int64",
+    ENUM: "category",
+    TEXT: STRING_DTYPE,
+    TIMESTAMP: STRING_DTYPE
+}
+
+
+def dtypes_for(columns: Dict[str, str]) -> Dict[str, str]:
+    """Get the pandas dtypes for a column schema
+
+    Args:
+        columns: Mapping of column name to schema kind
+
+    Returns:
+        Dict[str, str]: Mapping of column name to pandas dtype (columns that
+            stay as Python objects are omitted)
+    """
+    dtypes = {}
+    for column, kind in columns.items():
+        dtype = KIND_DTYPES.get(kind)
+        if dtype is not None:
+            dtypes[column] = dtype
+    return dtypes
+
+
+def to_editable(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a policy-typed DataFrame back to plain Python values for editing
+
+    Categorical columns only accept known categories and nullable columns hold
+    pd.NA, neither of which suits free-form edits or sqlite3 parameters.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        pd.DataFrame: Object-dtype copy with None for missing values
+    """
+    return df.astype(object).where(df.notna(), None)
+
+
+def memory_usage(df: pd.DataFrame) -> int:
+    """Get the deep memory usage of a DataFrame in bytes
+
+    Args:
+        df: DataFrame to measure
+
+    Returns:
+        int: Bytes used including Python string objects
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
\ No newline at end of file
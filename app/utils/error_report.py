@@ -0,0 +1,190 @@
+import os
+import time
+import uuid
+import logging
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from app.config import Config
+from app.utils.validation import RULE_DESCRIPTIONS
+
+logger = logging.getLogger(__name__)
+
+# Columns of a report entry: spreadsheet row number, column, failed rule and offending value
+REPORT_COLUMNS = ['row', 'column', 'rule', 'value']
+
+# Offending values are cut to this many characters
+MAX_VALUE_LENGTH = 200
+
+# Spreadsheet row of the first data row (row 1 holds the headers)
+FIRST_DATA_ROW = 2
+
+
+def error_rows(df: pd.DataFrame, failures: pd.DataFrame) -> pd.DataFrame:
+    """Turn a validation failure table into report entries
+
+    Args:
+        df: Validated rows, indexed by their position in the uploaded file
+            (a RangeIndex or a slice of one)
+        failures: Failure table from app.utils.validation.validate_frame()
+
+    Returns:
+        pd.DataFrame: One entry per failed (row, column, rule), ordered by row
+    """
+    if failures.empty:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+
+    frames = []
+    for column, rule in failures.columns:
+        labels = failures.index[failures[(column, rule)].to_numpy()]
+        if column in df.columns:
+            values = df[column].loc[labels].astype(object)
+            values = values.where(values.notna(), '').astype(str).str.slice(0, MAX_VALUE_LENGTH).to_numpy()
+        else:
+            values = ''
+        frames.append(pd.DataFrame({
+            'row': labels.to_numpy() + FIRST_DATA_ROW,
+            'column': column,
+            'rule': rule,
+            'value': values
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values('row', kind='stable', ignore_index=True)
+
+
+class ErrorReport:
+    """Bounded record of the rows rejected by an import
+
+    Only the number of entries, the counts per column and rule and a sample
+    of the first entries are kept in memory (and in session state). Every
+    entry is appended to a gzip-compressed CSV under
+    Config.APP.ERROR_REPORTS_DIR as it is found, and that file is only read
+    back when a download is requested.
+    """
+
+    def __init__(self, path: Optional[str] = None, sample_size: Optional[int] = None):
+        """Initialize an empty report
+
+        Args:
+            path: File the entries are spilled to (default: a new file in
+                Config.APP.ERROR_REPORTS_DIR)
+            sample_size: Entries kept inline (default: Config.APP.ERROR_SAMPLE_SIZE)
+        """
+        self.path = path or os.path.join(Config.APP.ERROR_REPORTS_DIR, f"{uuid.uuid4().hex}.csv.gz")
+        self.sample_size = sample_size if sample_size is not None else Config.APP.ERROR_SAMPLE_SIZE
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.sample: List[Dict[str, Any]] = []
+
+    @property
+    def key(self) -> str:
+        """Identifier of the report, usable as a widget key"""
+        return os.path.basename(self.path).split('.')[0]
+
+    def record(self, entries: pd.DataFrame):
+        """Update the totals, counts and sample (without spilling)
+
+        Args:
+            entries: Report entries (see error_rows())
+        """
+        if entries.empty:
+            return
+        self.total += len(entries)
+        for (column, rule), count in entries.groupby(['column', 'rule'], sort=False).size().items():
+            label = f"{column}: {rule}"
+            self.counts[label] = self.counts.get(label, 0) + int(count)
+        missing = self.sample_size - len(self.sample)
+        if missing > 0:
+            self.sample.extend(entries.head(missing).to_dict('records'))
+
+    def spill(self, entries: pd.DataFrame):
+        """Append entries to the report file
+
+        Args:
+            entries: Report entries (see error_rows())
+        """
+        if entries.empty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        header = not os.path.exists(self.path)
+        # Appending adds a gzip member; readers decompress consecutive members as one stream
+        entries[REPORT_COLUMNS].to_csv(self.path, mode='a', header=header, index=False, compression='gzip')
+
+    def add(self, entries: pd.DataFrame):
+        """Record entries and append them to the report file
+
+        Args:
+            entries: Report entries (see error_rows())
+        """
+        self.record(entries)
+        self.spill(entries)
+
+    def summary(self) -> pd.DataFrame:
+        """Counts per column and rule
+
+        Returns:
+            pd.DataFrame: Column, problem and number of entries, most frequent first
+        """
+        rows = []
+        for label, count in self.counts.items():
+            column, rule = label.split(': ', 1)
+            rows.append({"Column": column, "Problem": RULE_DESCRIPTIONS.get(rule, rule), "Rows": count})
+        return pd.DataFrame(rows, columns=["Column", "Problem", "Rows"]).sort_values("Rows", ascending=False)
+
+    def sample_frame(self) -> pd.DataFrame:
+        """The inline sample as a DataFrame"""
+        return pd.DataFrame(self.sample, columns=REPORT_COLUMNS)
+
+    def read_bytes(self) -> Optional[bytes]:
+        """Read the compressed report for download
+
+        Returns:
+            Optional[bytes]: gzip-compressed CSV, or None if the file is gone
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Error report {self.path} is not available: {e}")
+            return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {"path": self.path, "total": self.total, "counts": self.counts, "sample": self.sample}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ErrorReport':
+        """Restore a report saved with to_dict()"""
+        report = cls(path=data["path"])
+        report.total = data.get("total", 0)
+        report.counts = dict(data.get("counts", {}))
+        report.sample = list(data.get("sample", []))[:report.sample_size]
+        return report
+
+
+def purge_error_reports(max_age_days: Optional[int] = None) -> int:
+    """Delete spilled reports older than the retention period
+
+    Args:
+        max_age_days: Age limit (default: Config.APP.ERROR_REPORT_RETENTION_DAYS)
+
+    Returns:
+        int: Number of files deleted
+    """
+    max_age_days = max_age_days if max_age_days is not None else Config.APP.ERROR_REPORT_RETENTION_DAYS
+    directory = Config.APP.ERROR_REPORTS_DIR
+    if not os.path.isdir(directory):
+        return 0
+
+    cutoff = time.time() - max_age_days * 86400
+    deleted = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                deleted += 1
+        except OSError as e:
+            logger.warning(f"Could not remove error report {path}: {e}")
+    if deleted:
+        logger.info(f"Removed {deleted} expired error reports")
+    return deleted
\ No newline at end of file
@@ -0,0 +1,320 @@
+import io
+import string
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from app.utils.data_helpers import normalize_column_names
+
+logger = logging.getLogger(__name__)
+
+# Identifier types, in the order the count columns are shown
+ID_TYPES = ('sedol', 'isin', 'cusip')
+
+_ALPHANUMERIC = string.digits + string.ascii_uppercase
+
+# Length and character set per type. An identifier is stored as its
+# characters read as the digits of a number in base len(alphabet), which is
+# lossless and fits an int64 (36**12 < 2**63 for the longest, ISIN).
+ID_FORMATS = {
+    'sedol': (7, _ALPHANUMERIC),
+    'isin': (12, _ALPHANUMERIC),
+    'cusip': (9, _ALPHANUMERIC + '*@#')
+}
+
+# Numeric codes that lose their leading zeros in spreadsheets; they are
+# padded back when the padded code passes the check digit
+ZERO_PADDED_TYPES = ('sedol', 'cusip')
+
+# ISIN countries whose ISINs embed a CUSIP (characters 3-11) or a SEDOL
+# (characters 5-11, after "00")
+CUSIP_COUNTRIES = ('US', 'CA')
+SEDOL_COUNTRIES = ('GB', 'IE')
+
+# Character code -> digit lookup per type (INVALID_DIGIT for characters
+# outside the alphabet; lowercase letters map like uppercase ones)
+INVALID_DIGIT = 255
+_DIGITS = {}
+for _id_type, (_, _alphabet) in ID_FORMATS.items():
+    _DIGITS[_id_type] = np.full(256, INVALID_DIGIT, dtype=np.uint8)
+    for _digit, _char in enumerate(_alphabet):
+        _DIGITS[_id_type][[ord(_char), ord(_char.lower())]] = _digit
+
+_SEDOL_WEIGHTS = np.array([1, 3, 1, 7, 3, 9, 1], dtype=np.int32)
+_SEDOL_VOWELS = np.isin(np.arange(256), [_ALPHANUMERIC.index(vowel) for vowel in 'AEIOU'])
+
+
+def _digit_sum(value: np.ndarray) -> np.ndarray:
+    """Sum of the decimal digits of small non-negative integers"""
+    return value // 10 % 10 + value % 10 + value // 100
+
+
+# Check digit contributions looked up per character instead of computed:
+# CUSIP values (every second one doubled), and ISIN characters (letters
+# expand to two decimal digits) by whether their last digit is doubled.
+# Tables cover every byte, so INVALID_DIGIT rows can be looked up too.
+_VALUES = np.arange(256)
+_UNITS, _TENS = _VALUES % 10, _VALUES // 10 % 10
+_CUSIP_SUMS = np.stack([_digit_sum(_VALUES), _digit_sum(_VALUES * 2)]).astype(np.uint8)
+_ISIN_SUMS = np.stack([
+    _UNITS + _digit_sum(_TENS * 2),
+    _digit_sum(_UNITS * 2) + _TENS
+]).astype(np.uint8)
+
+
+def clean_identifiers(values: pd.Series) -> pd.Series:
+    """Trim and uppercase identifiers, dropping missing and empty values"""
+    text = values.dropna().astype(str).str.strip().str.upper()
+    return text[text != '']
+
+
+def _to_digits(values: np.ndarray, id_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Map identifiers to a matrix of alphabet digits
+
+    The array is viewed as a matrix of character codes (one column per
+    character) without a Python-level loop over the values.
+
+    Args:
+        values: Identifiers as a NumPy str or bytes array
+        id_type: Identifier type
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Digits (uint8, one row per value and
+        one column per character, INVALID_DIGIT for foreign characters) and
+        whether each value has the length and characters of the type
+    """
+    length, _ = ID_FORMATS[id_type]
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind not in 'SU':
+        values = values.astype(str)
+    code_type = np.uint32 if values.dtype.kind == 'U' else np.uint8
+    width = values.itemsize // np.dtype(code_type).itemsize
+
+    if width < length:
+        # Every value is too short
+        return np.zeros((len(values), length), dtype=np.uint8), np.zeros(len(values), dtype=bool)
+    chars = values.view(code_type).reshape(len(values), width)
+
+    # Fixed-width arrays pad shorter values with NUL characters
+    fits = chars[:, length - 1] != 0
+    if width > length:
+        fits &= chars[:, length] == 0
+
+    # Codes above 255 clip to ÿ, which is in no alphabet
+    digits = _DIGITS[id_type][np.minimum(chars[:, :length], 255)]
+    well_formed = fits & (digits != INVALID_DIGIT).all(axis=1)
+    return digits, well_formed
+
+
+def _sedol_valid(digits: np.ndarray) -> np.ndarray:
+    """Weighted sum (1, 3, 1, 7, 3, 9, 1) divisible by 10, no vowels, numeric check digit"""
+    return (
+        ((digits @ _SEDOL_WEIGHTS) % 10 == 0)
+        & (digits[:, 6] < 10)
+        & ~_SEDOL_VOWELS[digits[:, :6]].any(axis=1)
+    )
+
+
+def _cusip_valid(digits: np.ndarray) -> np.ndarray:
+    """Check digit from the digit sums of the values, every second one doubled"""
+    total = _CUSIP_SUMS[np.arange(8) % 2, digits[:, :8]].sum(axis=1, dtype=np.int32)
+    return (digits[:, 8] < 10) & ((10 - total % 10) % 10 == digits[:, 8])
+
+
+def _isin_valid(digits: np.ndarray) -> np.ndarray:
+    """Luhn check over the decimal expansion of the ISIN (letters become 10-35)
+
+    Each letter expands to two decimal digits, so whether a character's
+    last digit is doubled depends on how many digits follow it; the parity
+    is computed for every row at once from a reversed cumulative sum.
+    """
+    expanded = (digits >= 10).astype(np.uint8) + 1
+    # Only the parity matters, so the uint8 sum may wrap
+    right = np.cumsum(expanded[:, ::-1], axis=1, dtype=np.uint8)[:, ::-1] - expanded
+    total = _ISIN_SUMS[right & 1, digits].sum(axis=1, dtype=np.int32)
+    return (total % 10 == 0) & (digits[:, :2] >= 10).all(axis=1) & (digits[:, 11] < 10)
+
+
+_CHECKS = {
+    'sedol': _sedol_valid,
+    'isin': _isin_valid,
+    'cusip': _cusip_valid
+}
+
+
+def validate_identifiers(values: np.ndarray, id_type: str) -> np.ndarray:
+    """Check the format and check digit of identifiers
+
+    Fully vectorized: millions of codes are checked in a fraction of a
+    second (see benchmarks/bench_identifiers.py).
+
+    Args:
+        values: Identifiers as a NumPy str or bytes array (uppercase or
+            lowercase, without surrounding spaces)
+        id_type: Identifier type ("sedol", "isin" or "cusip")
+
+    Returns:
+        np.ndarray: True where the value is a valid identifier of the type
+    """
+    digits, well_formed = _to_digits(values, id_type)
+    return well_formed & _CHECKS[id_type](digits)
+
+
+def _fold(digits: np.ndarray, base: int) -> np.ndarray:
+    """Read rows of digits as int64 numbers in a base"""
+    codes = np.zeros(len(digits), dtype=np.int64)
+    for column in digits.T:
+        codes = codes * base + column
+    return codes
+
+
+def _unfold(codes: np.ndarray, length: int, base: int) -> np.ndarray:
+    """Split int64 numbers into rows of length digits in a base"""
+    rest = np.asarray(codes, dtype=np.int64).copy()
+    digits = np.empty((len(rest), length), dtype=np.int64)
+    for position in range(length - 1, -1, -1):
+        rest, digits[:, position] = np.divmod(rest, base)
+    return digits
+
+
+def encode_identifiers(values: pd.Series, id_type: str) -> Tuple[np.ndarray, pd.Series, int]:
+    """Validate identifiers of one type and encode them as sorted unique integers
+
+    Values failing the format or check digit test are rejected. Numeric
+    SEDOLs and CUSIPs shorter than their type are repaired by restoring
+    their leading zeros when the padded code is valid.
+
+    Args:
+        values: Identifiers (case and surrounding spaces are ignored)
+        id_type: Identifier type ("sedol", "isin" or "cusip")
+
+    Returns:
+        Tuple[np.ndarray, pd.Series, int]: Sorted unique int64 codes, the
+        values that are not a valid identifier of the type, and the number
+        of values repaired
+    """
+    length, alphabet = ID_FORMATS[id_type]
+    text = clean_identifiers(values)
+
+    padded = text
+    short = pd.Series(False, index=text.index)
+    if id_type in ZERO_PADDED_TYPES:
+        short = (text.str.len() < length) & text.str.isdigit()
+        padded = text.mask(short, text.str.zfill(length))
+
+    digits, well_formed = _to_digits(padded.to_numpy(dtype=str), id_type)
+    valid = well_formed & _CHECKS[id_type](digits)
+
+    codes = _fold(digits[valid], len(alphabet))
+    repaired = int((short.to_numpy() & valid).sum())
+    return np.unique(codes), text[~valid], repaired
+
+
+def decode_identifiers(codes: np.ndarray, id_type: str) -> np.ndarray:
+    """Turn codes from encode_identifiers() back into identifiers
+
+    Args:
+        codes: int64 codes
+        id_type: Identifier type the codes were encoded as
+
+    Returns:
+        np.ndarray: Identifiers (str), in the order of codes
+    """
+    length, alphabet = ID_FORMATS[id_type]
+    digits = _unfold(codes, length, len(alphabet))
+    chars = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)[digits]
+    return np.ascontiguousarray(chars).view(f'S{length}').ravel().astype(str)
+
+
+def derive_identifiers(isin_codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """Derive the CUSIPs and SEDOLs embedded in ISINs
+
+    US and CA ISINs carry the security's CUSIP as characters 3-11; GB and
+    IE ISINs carry its SEDOL as characters 5-11 after "00". The country and
+    the embedded code are read from the ISIN codes arithmetically (leading
+    base-36 digits), only the selected codes are split into digits, and
+    derived codes are kept only if their own check digit is valid.
+
+    Args:
+        isin_codes: ISIN codes from encode_identifiers()
+
+    Returns:
+        Dict[str, np.ndarray]: Sorted unique "cusip" and "sedol" codes
+    """
+    length, alphabet = ID_FORMATS['isin']
+    base = len(alphabet)
+    isin_codes = np.asarray(isin_codes, dtype=np.int64)
+
+    def prefixes(countries: Tuple[str, ...]) -> List[int]:
+        return [_ALPHANUMERIC.index(country[0]) * base + _ALPHANUMERIC.index(country[1]) for country in countries]
+
+    country = isin_codes // base ** (length - 2)
+    # Drop the ISIN check digit, keep the characters after the country (and "00")
+    cusips = _unfold(isin_codes[np.isin(country, prefixes(CUSIP_COUNTRIES))] // base, 9, base)
+    local = np.isin(country, prefixes(SEDOL_COUNTRIES)) & (isin_codes // base ** 8 % base ** 2 == 0)
+    sedols = _unfold(isin_codes[local] // base, 7, base)
+
+    return {
+        'cusip': np.unique(_fold(cusips[_cusip_valid(cusips)], len(ID_FORMATS['cusip'][1]))),
+        'sedol': np.unique(_fold(sedols[_sedol_valid(sedols)], len(ID_FORMATS['sedol'][1])))
+    }
+
+
+def pack_codes(codes: np.ndarray) -> bytes:
+    """Serialize codes as little-endian int64 for storage"""
+    return np.asarray(codes, dtype='<i8').tobytes()
+
+
+def unpack_codes(blob: bytes) -> np.ndarray:
+    """Read codes serialized by pack_codes() (read-only array)"""
+    return np.frombuffer(blob or b'', dtype='<i8')
+
+
+def split_by_type(values: pd.Series) -> Tuple[Dict[str, pd.Series], pd.Series]:
+    """Sort a mixed list of identifiers into types by their length
+
+    SEDOLs have 7 characters, CUSIPs 9 and ISINs 12.
+
+    Args:
+        values: Identifiers of any type
+
+    Returns:
+        Tuple[Dict[str, pd.Series], pd.Series]: Identifiers per type (types
+        without any left out), and the values of no known length
+    """
+    text = clean_identifiers(values)
+    lengths = text.str.len()
+    by_type = {}
+    for id_type, (length, _) in ID_FORMATS.items():
+        matched = text[lengths == length]
+        if not matched.empty:
+            by_type[id_type] = matched
+    known = lengths.isin([length for length, _ in ID_FORMATS.values()])
+    return by_type, text[~known]
+
+
+def read_identifier_file(data: bytes) -> Tuple[Dict[str, pd.Series], pd.Series]:
+    """Read the identifiers of a delivery from a CSV file
+
+    A file with ``sedol``, ``isin`` and/or ``cusip`` columns is read column
+    by column. Otherwise the first column is taken as a mixed list and each
+    value is typed by its length (see split_by_type()). Either way the file
+    needs a header row. Values are read as text, so leading zeros are kept.
+
+    Args:
+        data: CSV file contents
+
+    Returns:
+        Tuple[Dict[str, pd.Series], pd.Series]: Identifiers per type, and
+        the values whose type could not be determined
+    """
+    df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    df = normalize_column_names(df)
+
+    typed = [id_type for id_type in ID_TYPES if id_type in df.columns]
+    if typed:
+        return {id_type: df[id_type] for id_type in typed}, pd.Series([], dtype=object)
+    if df.columns.empty:
+        raise ValueError("The file has no columns")
+    return split_by_type(df.iloc[:, 0])
\ No newline at end of file
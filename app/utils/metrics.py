@@ -0,0 +1,439 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "clients_reporting_"
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RATE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Format a label set as {name="value",...}"""
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on scrape"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric"):
+        """Register a metric
+
+        Args:
+            metric: Metric to expose
+        """
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error(f"Error rendering metric {metric.name}: {e}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[MetricsRegistry] = REGISTRY):
+        """Initialize the metric
+
+        Args:
+            name: Metric name (the application prefix is added automatically)
+            documentation: Help text
+            labelnames: Names of the labels this metric is partitioned by
+            registry: Registry to expose the metric on
+        """
+        self.name = METRIC_PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        """Build the series key for a label set"""
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        """HELP and TYPE lines for this metric"""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+
+    def render(self) -> List[str]:
+        """Render the metric as exposition lines"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    metric_type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Increment the counter
+
+        Args:
+            amount: Amount to add
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = self._header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge that is either set explicitly or computed at scrape time"""
+
+    metric_type = "gauge"
+
+    def __init__(self, *args, function: Optional[Callable[[], float]] = None, **kwargs):
+        """Initialize the gauge
+
+        Args:
+            function: Optional callback evaluated on every scrape instead of stored values
+        """
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def set(self, value: float, **labels):
+        """Set the gauge value
+
+        Args:
+            value: New value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        if self._function is not None:
+            lines.append(f"{self.name} {_format_value(self._function())}")
+            return lines
+
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds"""
+
+    metric_type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        """Initialize the histogram
+
+        Args:
+            buckets: Sorted bucket upper bounds (+Inf is added automatically)
+        """
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [per-bucket counts (non-cumulative, last slot is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record an observation
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Time the enclosed block and observe its duration in seconds
+
+        Args:
+            **labels: Label values
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        lines = self._header()
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, extra=("le", bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def _database_file_size() -> float:
+    """Size of the SQLite database file in bytes"""
+    try:
+        return float(os.path.getsize(Config.DATABASE_PATH))
+    except OSError:
+        return 0.0
+
+
+# Application metrics
+PAGE_RENDER_SECONDS = Histogram(
+    "page_render_seconds", "Time spent rendering a page", ["page"]
+)
+PAGE_RENDER_ERRORS = Counter(
+    "page_render_errors_total", "Page renders that raised an exception", ["page"]
+)
+SQL_QUERY_SECONDS = Histogram(
+    "sql_query_seconds", "SQLite statement execution time", ["statement"]
+)
+IMPORT_ROWS = Counter(
+    "import_rows_total", "Rows processed by data imports", ["dataset", "outcome"]
+)
+IMPORT_ROWS_PER_SECOND = Histogram(
+    "import_rows_per_second", "Import throughput per import run", ["dataset"], buckets=RATE_BUCKETS
+)
+IMPORT_SECONDS = Histogram(
+    "import_seconds", "Duration of an import run", ["dataset"]
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache name and result", ["cache", "result"]
+)
+DB_SIZE_BYTES = Gauge(
+    "db_size_bytes", "Size of the SQLite database file", function=_database_file_size
+)
+
+
+def record_import(dataset: str, rows_imported: int, rows_rejected: int, seconds: float,
+                  rows_unchanged: int = 0):
+    """Record the outcome of an import run
+
+    Args:
+        dataset: Dataset name (e.g. "esg", "shariah")
+        rows_imported: Number of rows written
+        rows_rejected: Number of rows skipped or failed
+        seconds: Wall-clock duration of the import
+        rows_unchanged: Number of rows skipped by an upsert because they matched the stored row
+    """
+    IMPORT_ROWS.inc(rows_imported, dataset=dataset, outcome="imported")
+    IMPORT_ROWS.inc(rows_rejected, dataset=dataset, outcome="rejected")
+    if rows_unchanged:
+        IMPORT_ROWS.inc(rows_unchanged, dataset=dataset, outcome="unchanged")
+    IMPORT_SECONDS.observe(seconds, dataset=dataset)
+    if seconds > 0:
+        IMPORT_ROWS_PER_SECOND.observe(rows_imported / seconds, dataset=dataset)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Record a cache hit or miss
+
+    Args:
+        cache: Cache name
+        hit: True for a hit, False for a miss
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+_STATEMENT_TYPES = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+def _statement_type(sql: str) -> str:
+    """Classify a SQL statement by its leading keyword"""
+    keyword = sql.lstrip()[:6].upper()
+    if keyword in _STATEMENT_TYPES:
+        return keyword
+    if keyword.startswith("WITH"):
+        return "WITH"
+    return "OTHER"
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """SQLite cursor that records statement execution time"""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            SQL_QUERY_SECONDS.observe(time.perf_counter() - start, statement=_statement_type(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            SQL_QUERY_SECONDS.observe(time.perf_counter() - start, statement=_statement_type(sql))
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """SQLite connection whose cursors record statement execution time"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_factory() -> type:
+    """Get the sqlite3 connection class to use
+
+    Query timing is only installed when the metrics endpoint is enabled, so
+    the default configuration keeps the plain sqlite3 connection.
+
+    Returns:
+        type: sqlite3.Connection subclass
+    """
+    return InstrumentedConnection if Config.APP.METRICS_ENABLED else sqlite3.Connection
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """HTTP handler serving the registry on /metrics"""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are frequent; keep them out of the application log
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> bool:
+    """Start the /metrics endpoint on a background daemon thread
+
+    Safe to call more than once; only the first call starts a server.
+
+    Args:
+        host: Interface to bind (default: from config)
+        port: Port to bind (default: from config)
+
+    Returns:
+        bool: True if the server is running
+    """
+    global _server
+
+    with _server_lock:
+        if _server is not None:
+            return True
+
+        host = host or Config.APP.METRICS_HOST
+        port = port if port is not None else Config.APP.METRICS_PORT
+
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+            return False
+
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+        thread.start()
+        _server = server
+
+    logger.info(f"Metrics endpoint listening on http://{host}:{server.server_address[1]}/metrics")
+    return True
+
+
+def stop_metrics_server():
+    """Stop the metrics endpoint if it is running"""
+    global _server
+
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
\ No newline at end of file
@@ -0,0 +1,110 @@
+import logging
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keys sharing this many leading characters are always compared
+PREFIX_LENGTH = 3
+
+# Share of a key's trigrams another key must contain to be compared
+MIN_TRIGRAM_OVERLAP = 0.5
+
+
+def trigrams(key: str) -> Set[str]:
+    """Split a key into overlapping three-character blocks
+
+    The key is padded so its first and last characters also start and end
+    a block ("rajhi" -> "  r", " ra", "raj", "ajh", "jhi", "hi ").
+
+    Args:
+        key: Normalized name key
+
+    Returns:
+        Set[str]: Trigrams of the key
+    """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Score two keys between 0 (nothing in common) and 1 (identical)"""
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class NameIndex:
+    """Blocking index for fuzzy name matching
+
+    Comparing every name with every other one is quadratic. The index keeps
+    inverted lists by prefix and by trigram so a lookup only scores the few
+    keys that share a prefix or enough trigrams with the query.
+    """
+
+    def __init__(self, prefix_length: int = PREFIX_LENGTH, min_overlap: float = MIN_TRIGRAM_OVERLAP):
+        """Initialize an empty index
+
+        Args:
+            prefix_length: Leading characters forming the prefix block
+            min_overlap: Share of the query's trigrams a candidate must contain
+        """
+        self.prefix_length = prefix_length
+        self.min_overlap = min_overlap
+        self.ids: Dict[str, int] = {}
+        self._prefixes: Dict[str, Set[str]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, key: str, item_id: int):
+        """Index a key
+
+        Args:
+            key: Normalized name key
+            item_id: ID the key belongs to (several keys may share an ID)
+        """
+        if not key:
+            return
+        self.ids[key] = item_id
+        self._prefixes[key[:self.prefix_length]].add(key)
+        for gram in trigrams(key):
+            self._trigrams[gram].add(key)
+
+    def candidates(self, key: str) -> Set[str]:
+        """Get the indexed keys worth comparing with a key
+
+        Args:
+            key: Normalized name key
+
+        Returns:
+            Set[str]: Keys sharing the prefix block or enough trigrams (the
+            key itself excluded)
+        """
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        needed = self.min_overlap * len(grams)
+
+        found = {other for other, count in shared.items() if count >= needed}
+        found |= self._prefixes.get(key[:self.prefix_length], set())
+        found.discard(key)
+        return found
+
+    def matches(self, key: str, threshold: float) -> List[Tuple[str, int, float]]:
+        """Find indexed keys similar to a key
+
+        Args:
+            key: Normalized name key
+            threshold: Minimum similarity() score
+
+        Returns:
+            List[Tuple[str, int, float]]: (key, ID, score), best match first
+        """
+        scored = []
+        for other in self.candidates(key):
+            score = similarity(key, other)
+            if score >= threshold:
+                scored.append((other, self.ids[other], score))
+        return sorted(scored, key=lambda match: (-match[2], match[0]))
\ No newline at end of file
@@ -0,0 +1,83 @@
+import logging
+import numpy as np
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Masks of the SWAR popcount (bit pairs, nibbles, bytes) and the byte summing multiplier
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+# Bitmaps compared with the rest at once (bounds the temporary AND result)
+_BLOCK_WORDS = 1 << 22
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count the set bits of each row of 64-bit words
+
+    Uses np.bitwise_count where NumPy has it (2.0+), otherwise the SWAR
+    bit-twiddling popcount applied to whole arrays: bits are summed in
+    pairs, then nibbles, then bytes, and a multiplication adds the bytes.
+
+    Args:
+        words: uint64 array (..., n_words)
+
+    Returns:
+        np.ndarray: Set bits per row (int64)
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    x = words - ((words >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).sum(axis=-1, dtype=np.int64)
+
+
+def build_bitmaps(sets: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Turn sets of codes into bitmaps over a shared security index
+
+    The index is the sorted union of every set; bit i of a bitmap is set
+    when the set contains the i-th security of the index.
+
+    Args:
+        sets: Sorted unique int64 codes per member
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Bitmaps (uint64, one row per set and
+        one word per 64 securities) and the index (sorted codes)
+    """
+    index = np.unique(np.concatenate(sets)) if sets else np.empty(0, dtype=np.int64)
+    words = max((len(index) + 63) // 64, 1)
+    bitmaps = np.zeros((len(sets), words * 8), dtype=np.uint8)
+    for row, codes in enumerate(sets):
+        bits = np.zeros(words * 64, dtype=bool)
+        bits[np.searchsorted(index, codes)] = True
+        bitmaps[row] = np.packbits(bits, bitorder='little')
+    return bitmaps.view(np.uint64), index
+
+
+def overlap_matrix(bitmaps: np.ndarray) -> np.ndarray:
+    """Count the securities each pair of bitmaps shares
+
+    Each bitmap is ANDed with the ones after it in blocks and the results
+    are popcounted; the matrix is symmetric and its diagonal holds the size
+    of each set.
+
+    Args:
+        bitmaps: Bitmaps from build_bitmaps()
+
+    Returns:
+        np.ndarray: Shared securities per pair (int64, n x n)
+    """
+    n, words = bitmaps.shape
+    matrix = np.zeros((n, n), dtype=np.int64)
+    block = max(_BLOCK_WORDS // max(words, 1), 1)
+    for row in range(n):
+        for start in range(row, n, block):
+            stop = min(start + block, n)
+            matrix[row, start:stop] = popcount(bitmaps[row] & bitmaps[start:stop])
+    upper = np.triu_indices(n, 1)
+    matrix[upper[::-1]] = matrix[upper]
+    return matrix
\ No newline at end of file
@@ -0,0 +1,29 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Imported once by the fork server, so the workers forked from it start with them
+_PRELOAD = ["pandas"]
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create a process pool that is safe to start from the app process
+
+    Workers are forked from a fork server rather than from the calling
+    process: the Streamlit process runs other threads (script runs, the
+    import worker, the metrics server), and a fork copies any lock one of
+    them holds at that moment, such as the logging lock, leaving the child
+    deadlocked on it. Workers re-run the entry script as __mp_main__ and
+    import the modules of their tasks, neither of which calls init_app().
+
+    Args:
+        max_workers: Worker processes
+
+    Returns:
+        ProcessPoolExecutor: The pool (use it as a context manager)
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(_PRELOAD)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
\ No newline at end of file
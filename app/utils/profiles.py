@@ -0,0 +1,153 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+from app.utils.delivery import field_key, split_fields
+from app.utils.schedule import parse_migration_dates
+
+logger = logging.getLogger(__name__)
+
+# Migration status of a Shariah record
+NO_MIGRATION = "No migration"
+PLANNED = "Planned"
+MIGRATED = "Migrated"
+UNSCHEDULED = "Unscheduled"
+MIGRATION_STATUSES = (NO_MIGRATION, PLANNED, MIGRATED, UNSCHEDULED)
+
+ID_COUNTS = {'isin': 'isin_count', 'sedol': 'sedol_count', 'cusip': 'cusip_count'}
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as JSON-ready dictionaries (missing values as None)"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _values(values: pd.Series) -> List[str]:
+    """Distinct non-empty values, sorted"""
+    values = values.dropna().astype(str).str.strip()
+    return sorted(set(values[values != '']))
+
+
+def _identifiers(df: pd.DataFrame) -> Dict[str, int]:
+    """Sum the identifier counts of records"""
+    return {id_type: int(pd.to_numeric(df[column], errors='coerce').fillna(0).sum())
+            for id_type, column in ID_COUNTS.items()}
+
+
+def field_coverage(fields: pd.Series) -> List[Dict[str, Any]]:
+    """Count the records requesting each field
+
+    Fields are matched case-insensitively and shown with their most common
+    spelling.
+
+    Args:
+        fields: Comma-separated fields per record
+
+    Returns:
+        List[Dict[str, Any]]: field, records and coverage (share of the
+        records), most requested first
+    """
+    requested = [field for value in fields for field in split_fields(value)]
+    if not requested:
+        return []
+    names = pd.Series(requested)
+    keys = names.map(field_key)
+    spelling = names.groupby([keys, names]).size().sort_values(ascending=False, kind='stable')
+    spelling = spelling.reset_index(level=1).groupby(level=0).head(1).iloc[:, 0]
+    counts = keys.value_counts(sort=False)
+    coverage = pd.DataFrame({'field': spelling.reindex(counts.index).to_numpy(), 'records': counts.to_numpy()})
+    coverage['coverage'] = coverage['records'] / len(fields)
+    coverage = coverage.sort_values(['records', 'field'], ascending=[False, True], kind='stable')
+    return _records(coverage)
+
+
+def migration_status(shariah: pd.DataFrame, today: np.datetime64) -> pd.DataFrame:
+    """Get the migration status and date of Shariah records
+
+    A record migrates when its after-migration source is set and differs
+    from its current one. The migration is "Migrated" once its date (see
+    parse_migration_dates()) has passed, "Planned" before and "Unscheduled"
+    when the plan has no readable date.
+
+    Args:
+        shariah: current_source, after_migration and migration_plan columns
+        today: Date the status is for (datetime64[D])
+
+    Returns:
+        pd.DataFrame: migration_status and migration_date (ISO text or None),
+        same index as shariah
+    """
+    current = shariah['current_source'].fillna('').astype(str).str.strip().str.lower()
+    after = shariah['after_migration'].fillna('').astype(str).str.strip().str.lower()
+    dates = parse_migration_dates(shariah['migration_plan'], today)
+    migrates = ((after != '') & (after != current)).to_numpy()
+    status = np.select(
+        [~migrates, np.isnat(dates), dates <= today],
+        [NO_MIGRATION, UNSCHEDULED, MIGRATED],
+        PLANNED
+    )
+    iso = np.where(migrates & ~np.isnat(dates), dates.astype(str), None)
+    return pd.DataFrame({'migration_status': status, 'migration_date': iso}, index=shariah.index)
+
+
+def build_profiles(clients: pd.DataFrame, esg: pd.DataFrame, shariah: pd.DataFrame,
+                   today: np.datetime64) -> Dict[int, Dict[str, Any]]:
+    """Build the profile document of clients
+
+    Args:
+        clients: client_id, name and variant (one row per spelling on file)
+        esg: ESG records of the clients (view columns, with client_id)
+        shariah: Shariah records of the clients (view columns, with client_id)
+        today: Date the migration statuses are for (datetime64[D])
+
+    Returns:
+        Dict[int, Dict[str, Any]]: Profile by client ID, JSON-serializable,
+        with the client's "name", spelling variants ("names"), its "esg" and
+        "shariah" records and summaries (sources, field coverage,
+        identifier totals; migration statuses for Shariah) and its combined
+        "identifiers"
+    """
+    if not shariah.empty:
+        shariah = pd.concat([shariah, migration_status(shariah, today)], axis=1)
+    esg_groups = dict(tuple(esg.groupby('client_id', sort=False)))
+    shariah_groups = dict(tuple(shariah.groupby('client_id', sort=False)))
+
+    profiles = {}
+    for client_id, names in clients.groupby('client_id', sort=False):
+        client_id = int(client_id)
+        client_esg = esg_groups.get(client_id, esg.iloc[:0])
+        client_shariah = shariah_groups.get(client_id, shariah.iloc[:0])
+        esg_identifiers = _identifiers(client_esg)
+        shariah_identifiers = _identifiers(client_shariah)
+
+        statuses = (client_shariah['migration_status'].value_counts()
+                    if 'migration_status' in client_shariah else pd.Series(dtype=int))
+        profiles[client_id] = {
+            "client_id": client_id,
+            "name": names['name'].iloc[0],
+            "names": _values(names['variant']),
+            "esg": {
+                "record_count": len(client_esg),
+                "sources": _values(client_esg['data_source']),
+                "data_types": _values(client_esg['data_type']),
+                "compliance": {str(value): int(count) for value, count
+                               in client_esg['compliance'].fillna('Unknown').value_counts().items()},
+                "fields": field_coverage(client_esg['fields']),
+                "identifiers": esg_identifiers,
+                "records": _records(client_esg.drop(columns='client_id'))
+            },
+            "shariah": {
+                "record_count": len(client_shariah),
+                "sources": _values(client_shariah['current_source']),
+                "after_migration": _values(client_shariah['after_migration']),
+                "frequencies": _values(client_shariah['frequency']),
+                "universe_count": int(pd.to_numeric(client_shariah['universe_count'], errors='coerce').fillna(0).sum()),
+                "migration": {status: int(statuses.get(status, 0)) for status in MIGRATION_STATUSES},
+                "fields": field_coverage(client_shariah['fields']),
+                "identifiers": shariah_identifiers,
+                "records": _records(client_shariah.drop(columns='client_id'))
+            },
+            "identifiers": {id_type: esg_identifiers[id_type] + shariah_identifiers[id_type] for id_type in ID_COUNTS}
+        }
+    return profiles
\ No newline at end of file
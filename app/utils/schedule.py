@@ -0,0 +1,200 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Months in which the periodic frequencies deliver (on the 1st)
+PERIOD_MONTHS: Dict[str, Tuple[int, ...]] = {
+    'monthly': tuple(range(1, 13)),
+    'quarterly': (1, 4, 7, 10),
+    'semi-annually': (1, 7),
+    'annually': (1,)
+}
+
+# Daily deliveries fall on business days, weekly ones on Mondays
+DAILY = 'daily'
+WEEKLY = 'weekly'
+FREQUENCIES = (DAILY, WEEKLY) + tuple(PERIOD_MONTHS)
+
+# Other spellings (lower case, words joined with "-")
+_FREQUENCY_ALIASES = {
+    'business-daily': DAILY,
+    'week': WEEKLY,
+    'month': 'monthly',
+    'quarter': 'quarterly',
+    'semi-annual': 'semi-annually',
+    'semiannual': 'semi-annually',
+    'semiannually': 'semi-annually',
+    'bi-annual': 'semi-annually',
+    'bi-annually': 'semi-annually',
+    'biannually': 'semi-annually',
+    'annual': 'annually',
+    'yearly': 'annually'
+}
+
+_MONTHS = {name: number for number, names in enumerate(
+    [('jan', 'january'), ('feb', 'february'), ('mar', 'march'), ('apr', 'april'), ('may',), ('jun', 'june'),
+     ('jul', 'july'), ('aug', 'august'), ('sep', 'sept', 'september'), ('oct', 'october'),
+     ('nov', 'november'), ('dec', 'december')], start=1) for name in names}
+_MONTH = '|'.join(sorted(_MONTHS, key=len, reverse=True))
+
+# "1st of February", "1 Feb 2026", "February 1st, 2026" (not "February 2026":
+# the day is one or two digits on their own, the month a whole word)
+_DAY_MONTH = re.compile(rf'(?<!\d)(?P<day>\d{{1,2}})(?!\d)(?:st|nd|rd|th)?\s*(?:of\s+)?\b(?P<month>{_MONTH})\b\.?(?:,?\s+(?P<year>\d{{4}}))?')
+_MONTH_DAY = re.compile(rf'\b(?P<month>{_MONTH})\b\.?\s+(?P<day>\d{{1,2}})(?!\d)(?:st|nd|rd|th)?(?:,?\s+(?P<year>\d{{4}}))?')
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """Stripped strings, '' for missing values"""
+    return values.astype(object).where(values.notna(), '').astype(str).str.strip()
+
+
+def unify_sources(*columns: pd.Series) -> List[pd.Series]:
+    """Spell each data source the same way in every column
+
+    Names differing only in case ("Factset", "FactSet") become the most
+    common spelling among them.
+
+    Args:
+        columns: Source names (missing values become '')
+
+    Returns:
+        List[pd.Series]: The columns with unified names
+    """
+    columns = [_text(column) for column in columns]
+    names = pd.concat(columns, ignore_index=True)
+    names = names[names != '']
+    if names.empty:
+        return columns
+    counts = names.groupby([names.str.lower(), names]).size().sort_values(ascending=False, kind='stable')
+    spelling = counts.reset_index(level=1).groupby(level=0).head(1).iloc[:, 0]
+    return [column.str.lower().map(spelling).fillna(column) for column in columns]
+
+
+def normalize_frequency(values: pd.Series) -> pd.Series:
+    """Lower-case frequencies, with alternative spellings ("Semi-Annual", "Yearly") unified
+
+    Returns:
+        pd.Series: One of FREQUENCIES, or None for anything else
+    """
+    text = _text(values).str.lower().str.replace(r'[\s_]+', '-', regex=True)
+    text = text.replace(_FREQUENCY_ALIASES)
+    return text.where(text.isin(FREQUENCIES), None)
+
+
+def parse_migration_dates(plans: pd.Series, today: np.datetime64) -> np.ndarray:
+    """Turn free-text migration plans into dates
+
+    Plans naming a day and month without a year ("1st of February") fall in
+    the year of today, so a date that has passed this year stays the
+    migration date rather than moving to next year; plans with a year or
+    ISO dates are taken as they are.
+
+    Args:
+        plans: Migration plan text per record
+        today: Day the plans are read on (datetime64[D])
+
+    Returns:
+        np.ndarray: datetime64[D] per record (NaT where no date can be read)
+    """
+    text = _text(plans).str.lower()
+    parts = text.str.extract(_DAY_MONTH)
+    other = text.str.extract(_MONTH_DAY)
+    parts = parts.where(parts['day'].notna(), other[parts.columns])
+
+    frame = pd.DataFrame({
+        'year': pd.to_numeric(parts['year'], errors='coerce').fillna(int(str(np.datetime64(today, 'Y')))),
+        'month': parts['month'].map(_MONTHS),
+        'day': pd.to_numeric(parts['day'], errors='coerce')
+    })
+    dates = pd.to_datetime(frame, errors='coerce').to_numpy(dtype='datetime64[D]')
+
+    # Anything else that reads as a date ("2026-02-01")
+    unparsed = np.isnat(dates) & (text != '').to_numpy()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(text[unparsed], errors='coerce', format='mixed').to_numpy(dtype='datetime64[D]')
+    return dates
+
+
+def schedule_dates(frequency: str, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """Get the delivery dates of a frequency within [start, end)
+
+    Args:
+        frequency: One of FREQUENCIES
+        start: First day (datetime64[D])
+        end: Day after the last one
+
+    Returns:
+        np.ndarray: Sorted datetime64[D] dates
+    """
+    if frequency == DAILY:
+        days = np.arange(start, end, dtype='datetime64[D]')
+        return days[np.is_busday(days)]
+    if frequency == WEEKLY:
+        first = np.busday_offset(start, 0, roll='forward', weekmask='Mon')
+        return np.arange(first, end, 7, dtype='datetime64[D]')
+    months = np.arange(np.datetime64(start, 'M'), np.datetime64(end, 'M') + 1, dtype='datetime64[M]')
+    months = months[np.isin(months.astype(np.int64) % 12 + 1, PERIOD_MONTHS[frequency])]
+    days = months.astype('datetime64[D]')
+    return days[(days >= start) & (days < end)]
+
+
+def build_calendar(records: pd.DataFrame, start: np.datetime64, end: np.datetime64) -> pd.DataFrame:
+    """Expand records into their delivery dates over a horizon
+
+    The dates of each frequency are generated once and repeated for every
+    record of that frequency; the source of each delivery is the record's
+    current source before its migration date and its after-migration source
+    from then on. Source names are unified across records (see
+    unify_sources()).
+
+    Args:
+        records: record_id, frequency, current_source, after_migration,
+            migration_plan and universe_count columns
+        start: First day of the horizon (datetime64[D])
+        end: Day after the last one
+
+    Returns:
+        pd.DataFrame: record_id, delivery_date (datetime64[D]), current_source,
+        planned_source and universe_count, by date then record
+    """
+    frequency = normalize_frequency(records['frequency']).to_numpy()
+    migration = parse_migration_dates(records['migration_plan'], start)
+    current, after = unify_sources(records['current_source'], records['after_migration'])
+    universe = pd.to_numeric(records['universe_count'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    record_ids = records['record_id'].to_numpy(dtype=np.int64)
+
+    rows = []
+    for name in FREQUENCIES:
+        members = np.flatnonzero(frequency == name)
+        dates = schedule_dates(name, start, end)
+        if not len(members) or not len(dates):
+            continue
+        # Every member x every date of the frequency
+        position = np.repeat(members, len(dates))
+        rows.append((position, np.tile(dates, len(members))))
+
+    if not rows:
+        return pd.DataFrame({'record_id': np.empty(0, dtype=np.int64),
+                             'delivery_date': np.empty(0, dtype='datetime64[D]'),
+                             'current_source': np.empty(0, dtype=object),
+                             'planned_source': np.empty(0, dtype=object),
+                             'universe_count': np.empty(0, dtype=np.int64)})
+
+    position = np.concatenate([position for position, _ in rows])
+    dates = np.concatenate([dates for _, dates in rows])
+    current_source = current.to_numpy(dtype=object)[position]
+    after_source = after.to_numpy(dtype=object)[position]
+    # NaT never compares as reached: records without a readable plan keep their source
+    migrated = (dates >= migration[position]) & (after_source != '')
+    calendar = pd.DataFrame({
+        'record_id': record_ids[position],
+        'delivery_date': dates,
+        'current_source': current_source,
+        'planned_source': np.where(migrated, after_source, current_source),
+        'universe_count': universe[position]
+    })
+    return calendar.sort_values(['delivery_date', 'record_id'], kind='stable', ignore_index=True)
\ No newline at end of file
@@ -0,0 +1,112 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from app.utils.data_helpers import map_column_aliases
+from app.utils.validation import parse_numbers
+
+logger = logging.getLogger(__name__)
+
+# Screening outcome per security
+PASS = "PASS"
+FAIL = "FAIL"
+NO_DATA = "NO_DATA"
+
+# Financials columns and the headers accepted for them (after normalize_column_names)
+FINANCIAL_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'identifier': ('identifier', 'isin', 'sedol', 'cusip', 'ticker', 'security'),
+    'market_cap': ('market_cap', 'market_capitalisation', 'market_capitalization', 'mcap'),
+    'total_debt': ('total_debt', 'debt', 'interest_bearing_debt'),
+    'cash': ('cash', 'cash_and_equivalents', 'cash_and_interest_bearing_securities'),
+    'interest_income': ('interest_income',),
+    'non_compliant_revenue': ('non_compliant_revenue', 'non_permissible_revenue', 'impermissible_revenue'),
+    'total_revenue': ('total_revenue', 'revenue')
+}
+
+# Ratio columns of the screening results
+RATIO_COLUMNS = ['debt_ratio', 'cash_ratio', 'income_ratio', 'purification_ratio']
+
+
+def map_financial_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """Rename the columns of a financials file to the names screen_financials() reads
+
+    Args:
+        df: Financials as read from the file
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: Frame with the recognised columns
+        renamed (others are dropped) and the names of the columns not found
+    """
+    return map_column_aliases(df, FINANCIAL_COLUMNS)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divide column by column, NaN where the denominator is not positive"""
+    valid = denominator > 0
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=valid)
+
+
+def screen_financials(df: pd.DataFrame, debt_limit: float, cash_limit: float,
+                      income_limit: float) -> pd.DataFrame:
+    """Apply AAOIFI-style ratio screens to a universe of securities
+
+    Every screen is a column operation over the whole universe:
+
+    - debt ratio: total debt / market cap
+    - cash ratio: cash and interest-bearing securities / market cap
+    - income ratio: (non-compliant revenue + interest income) / total revenue
+
+    A screen passes when its ratio does not exceed the limit. The
+    purification ratio is the share of revenue (clipped to 0-1) to be given
+    away from dividends. A security fails when any screen fails; it has
+    NO_DATA when no screen fails but a ratio cannot be computed (missing or
+    unreadable values, market cap not positive, no revenue but impermissible
+    income).
+
+    Args:
+        df: Financials with the columns of FINANCIAL_COLUMNS (see
+            map_financial_columns())
+        debt_limit: Highest debt ratio that passes
+        cash_limit: Highest cash ratio that passes
+        income_limit: Highest income ratio that passes
+
+    Returns:
+        pd.DataFrame: identifier, the ratio columns, debt_pass, cash_pass and
+        income_pass (nullable booleans) and status, one row per security
+    """
+    values = {column: parse_numbers(df[column])[0] for column in FINANCIAL_COLUMNS if column != 'identifier'}
+    market_cap = values['market_cap']
+    impermissible = values['non_compliant_revenue'] + values['interest_income']
+    revenue = values['total_revenue']
+
+    debt_ratio = _ratio(values['total_debt'], market_cap)
+    cash_ratio = _ratio(values['cash'], market_cap)
+    income_ratio = _ratio(impermissible, revenue)
+    # Without revenue there is nothing to purify unless impermissible income is reported
+    income_ratio[(revenue == 0) & (impermissible == 0)] = 0.0
+
+    screens = {}
+    for name, ratio, limit in (('debt', debt_ratio, debt_limit), ('cash', cash_ratio, cash_limit),
+                               ('income', income_ratio, income_limit)):
+        known = ~np.isnan(ratio)
+        screens[name] = (known, known & (ratio <= limit))
+
+    failed = np.zeros(len(df), dtype=bool)
+    unknown = np.zeros(len(df), dtype=bool)
+    for known, passed in screens.values():
+        failed |= known & ~passed
+        unknown |= ~known
+    status = np.select([failed, unknown], [FAIL, NO_DATA], PASS)
+
+    result = pd.DataFrame({
+        'identifier': df['identifier'].astype(str).str.strip().to_numpy(),
+        'debt_ratio': debt_ratio,
+        'cash_ratio': cash_ratio,
+        'income_ratio': income_ratio,
+        'purification_ratio': np.clip(income_ratio, 0.0, 1.0)
+    })
+    for name, (known, passed) in screens.items():
+        result[f'{name}_pass'] = pd.arrays.BooleanArray(passed, ~known)
+    result['status'] = status
+    return result
\ No newline at end of file
@@ -0,0 +1,55 @@
+import logging
+from bisect import bisect_left
+from typing import Any, Hashable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sorts after every character a key can contain
+_KEY_END = '\U0010ffff'
+
+
+class PrefixIndex:
+    """Sorted array of normalized keys for prefix lookups
+
+    The keys are sorted once; the keys starting with a prefix form one
+    contiguous run of the array, found with two binary searches, so a
+    lookup costs O(log n) plus the items it returns.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Hashable]]):
+        """Build the index
+
+        Args:
+            entries: (key, item) pairs; several keys may share an item
+        """
+        pairs = sorted((key, item) for key, item in entries if key)
+        self.keys: List[str] = [key for key, _ in pairs]
+        self.items: List[Hashable] = [item for _, item in pairs]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def search(self, prefix: str, limit: int = 10) -> List[Any]:
+        """Get the items with a key starting with a prefix
+
+        Args:
+            prefix: Normalized key prefix (an empty prefix matches nothing)
+            limit: Maximum number of items
+
+        Returns:
+            List[Any]: Distinct items in key order
+        """
+        if not prefix:
+            return []
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + _KEY_END, start)
+        found = []
+        seen = set()
+        for position in range(start, end):
+            item = self.items[position]
+            if item not in seen:
+                seen.add(item)
+                found.append(item)
+                if len(found) == limit:
+                    break
+        return found
\ No newline at end of file
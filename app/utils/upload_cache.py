@@ -0,0 +1,91 @@
+import io
+import hashlib
+import logging
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+from app.config import Config
+from app.utils.metrics import record_cache_lookup
+from app.utils.workbook import list_sheets, read_workbook
+
+logger = logging.getLogger(__name__)
+
+# Metrics label of the cache
+CACHE_NAME = "upload"
+
+_entries: "OrderedDict[str, Any]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def file_hash(data: bytes) -> str:
+    """Get the content hash identifying an uploaded file
+
+    Args:
+        data: File contents
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cached(key: str, build: Callable[[], Any]) -> Any:
+    """Get a cached value, building and storing it on a miss
+
+    Entries are shared by all sessions and evicted least recently used
+    first once Config.APP.UPLOAD_CACHE_ENTRIES is reached. Cached frames
+    must not be modified in place.
+    """
+    with _lock:
+        if key in _entries:
+            _entries.move_to_end(key)
+            record_cache_lookup(CACHE_NAME, True)
+            return _entries[key]
+
+    record_cache_lookup(CACHE_NAME, False)
+    value = build()
+
+    with _lock:
+        _entries[key] = value
+        _entries.move_to_end(key)
+        while len(_entries) > max(Config.APP.UPLOAD_CACHE_ENTRIES, 1):
+            _entries.popitem(last=False)
+    return value
+
+
+def upload_sheets(data: bytes, digest: str) -> List[str]:
+    """Get the sheet names of an uploaded workbook (cached by file hash)
+
+    Args:
+        data: Workbook contents
+        digest: file_hash() of data
+
+    Returns:
+        List[str]: Sheet names in workbook order
+    """
+    return _cached(f"{digest}:sheets", lambda: list_sheets(data))
+
+
+def read_upload(file_name: str, data: bytes, digest: str, all_sheets: bool = False) -> pd.DataFrame:
+    """Parse an uploaded CSV or Excel file (cached by file hash)
+
+    Reruns of the page get the parsed frame back without reading the upload
+    again.
+
+    Args:
+        file_name: Uploaded file name (its extension selects the parser)
+        data: File contents
+        digest: file_hash() of data
+        all_sheets: For workbooks, read every sheet into one batch instead
+            of only the first sheet
+
+    Returns:
+        pd.DataFrame: Parsed rows (shared; do not modify in place)
+    """
+    if file_name.lower().endswith('.csv'):
+        return _cached(f"{digest}:csv", lambda: pd.read_csv(io.BytesIO(data)))
+    if all_sheets:
+        return _cached(f"{digest}:all_sheets", lambda: read_workbook(data))
+    return _cached(f"{digest}:first_sheet", lambda: pd.read_excel(io.BytesIO(data)))
\ No newline at end of file
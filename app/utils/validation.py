@@ -0,0 +1,233 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.models.schema import INTEGER, COUNT, TOTAL
+from app.utils.dtypes import STRING_DTYPE
+
+logger = logging.getLogger(__name__)
+
+# Rules a value can fail
+MISSING = "missing"            # required field is empty
+NOT_A_NUMBER = "not_a_number"  # count that cannot be read as a number
+NOT_ALLOWED = "not_allowed"    # enumerated field outside its allowed values
+DUPLICATE_KEY = "duplicate_key"  # natural key repeated later in the same file
+KEY_TAKEN = "key_taken"          # appended row whose natural key another record already has
+
+RULE_DESCRIPTIONS = {
+    MISSING: "is required",
+    NOT_A_NUMBER: "is not a number",
+    NOT_ALLOWED: "is not an allowed value",
+    DUPLICATE_KEY: "is repeated by a later row (the later row was kept)",
+    KEY_TAKEN: "is already taken by another record (appended as a duplicate)"
+}
+
+# Spreadsheet placeholders read as "no value" in numeric columns
+MISSING_NUMBER_TOKENS = frozenset({'', '-', '--', 'n/a', 'na', 'nan', 'none', 'null'})
+
+_NUMERIC_KINDS = (INTEGER, COUNT, TOTAL)
+
+# Thousands separators and whitespace, then currency/unit prefixes and suffixes
+_SEPARATORS = r"[,\s_']"
+_AFFIXES = r"^[^\d.+-]+|[^\d.]+$"
+
+
+def _strings(values) -> pd.Series:
+    """Wrap text values in a Series whose str methods run vectorized
+
+    Uses the Arrow string dtype when pyarrow is installed (the str methods
+    then run in Arrow compute kernels rather than per Python object).
+    """
+    return pd.Series(values, dtype=STRING_DTYPE or object)
+
+
+def parse_numbers(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Read a column as float64 numbers, vectorized
+
+    Numbers pass straight through. Text columns are parsed once per
+    distinct value, and only values that do not parse as they are get
+    cleaned with str.replace (thousands separators, whitespace, currency or
+    unit affixes such as "$1,200" or "30 000 ISINs").
+
+    Args:
+        series: Raw column
+
+    Returns:
+        Tuple of the float64 values (NaN for missing values, placeholders
+        like "N/A" and unreadable values) and a mask of the values that
+        could not be read as numbers
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        numbers = series.to_numpy(dtype="float64", na_value=np.nan)
+        invalid = np.zeros(len(series), dtype=bool)
+    else:
+        # Parse each distinct value once; missing values get code -1
+        codes, uniques = pd.factorize(series.astype(object))
+        parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        unknown = np.isnan(parsed)
+        retry = np.flatnonzero(unknown)
+        if len(retry):
+            text = _strings(uniques[retry].astype(str)).str.strip()
+            placeholder = text.str.lower().isin(MISSING_NUMBER_TOKENS).to_numpy(dtype=bool)
+            cleaned = text.str.replace(_SEPARATORS, '', regex=True).str.replace(_AFFIXES, '', regex=True)
+            parsed[retry] = pd.to_numeric(cleaned.astype(object), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            unknown[retry[placeholder]] = False
+        unknown &= np.isnan(parsed)
+        # Extra last slot for code -1
+        numbers = np.append(parsed, np.nan)[codes]
+        invalid = np.append(unknown, False)[codes]
+    return numbers, invalid
+
+
+def clean_numeric(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Convert a column to int64 counts, vectorized
+
+    Values are read with parse_numbers(). Missing values and placeholders
+    like "N/A" become 0; decimals are truncated.
+
+    Args:
+        series: Raw column
+
+    Returns:
+        Tuple of the int64 values and a mask of values that could not be read
+        as numbers (also stored as 0)
+    """
+    numbers, invalid = parse_numbers(series)
+    values = np.trunc(np.nan_to_num(numbers, nan=0.0, posinf=0.0, neginf=0.0)).astype(np.int64)
+    return pd.Series(values, index=series.index), pd.Series(invalid, index=series.index)
+
+
+def clean_text(series: pd.Series) -> pd.Series:
+    """Strip text values, turning empty strings into None
+
+    Args:
+        series: Raw column
+
+    Returns:
+        pd.Series: Object column of stripped strings or None
+    """
+    # Strip each distinct value once; missing values get code -1
+    codes, uniques = pd.factorize(series.astype(object))
+    stripped = _strings(uniques.astype(str)).str.strip().to_numpy(dtype=object, na_value=None)
+    stripped[stripped == ''] = None
+    return pd.Series(np.append(stripped, None)[codes], index=series.index)
+
+
+def required_mask(values: pd.Series) -> pd.Series:
+    """Flag empty values of a required field
+
+    Args:
+        values: Cleaned column (output of clean_text)
+
+    Returns:
+        pd.Series: True where the value is missing
+    """
+    return values.isna()
+
+
+def allowed_values_mask(values: pd.Series, allowed: Iterable[str]) -> Tuple[pd.Series, pd.Series]:
+    """Check an enumerated column against its allowed values
+
+    Matching is case-insensitive and values are rewritten in the canonical
+    spelling. The check runs once per distinct value (pd.factorize), not
+    once per row.
+
+    Args:
+        values: Cleaned column (output of clean_text)
+        allowed: Allowed values in their canonical spelling
+
+    Returns:
+        Tuple of the canonical values (None where missing or not allowed) and
+        a mask of present values that are not allowed
+    """
+    canonical = {value.lower(): value for value in allowed}
+    codes, uniques = pd.factorize(values)
+    mapped = [canonical.get(str(value).lower()) for value in uniques]
+    # Code -1 (missing) takes the extra last slot
+    lookup = np.array(mapped + [None], dtype=object)
+    unknown = np.array([value is None for value in mapped] + [False])
+    return (pd.Series(lookup[codes], index=values.index),
+            pd.Series(unknown[codes], index=values.index))
+
+
+def validate_frame(df: pd.DataFrame, columns: Dict[str, str], required: Iterable[str] = (),
+                   allowed_values: Optional[Dict[str, Iterable[str]]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Clean and validate a batch of rows column by column
+
+    Every column in the schema is cleaned (counts via clean_numeric, text
+    via clean_text; absent columns are filled as missing) and checked
+    against the rules that apply to it. Nothing is evaluated per row.
+
+    Args:
+        df: Raw rows with database column names
+        columns: Column schema of the rows to produce (name -> kind)
+        required: Columns that must have a value
+        allowed_values: Allowed values per enumerated column
+
+    Returns:
+        Tuple of:
+            - the cleaned rows (one column per schema column, same index as df)
+            - the failures: one boolean column per (column, rule) that failed
+              at least once, holding only the rows that failed a rule; an
+              empty frame means every row is valid
+    """
+    allowed_values = allowed_values or {}
+    required = set(required)
+    cleaned = {}
+    failures = {}
+
+    for col, kind in columns.items():
+        if kind in _NUMERIC_KINDS:
+            if col in df.columns:
+                cleaned[col], invalid = clean_numeric(df[col])
+                failures[(col, NOT_A_NUMBER)] = invalid
+            else:
+                cleaned[col] = pd.Series(0, index=df.index, dtype=np.int64)
+            continue
+
+        values = clean_text(df[col]) if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if col in required:
+            failures[(col, MISSING)] = required_mask(values)
+        if col in allowed_values:
+            values, unknown = allowed_values_mask(values, allowed_values[col])
+            failures[(col, NOT_ALLOWED)] = unknown
+        cleaned[col] = values
+
+    # Assembled from arrays so repeated index labels are never aligned
+    cleaned = pd.DataFrame({col: values.to_numpy() for col, values in cleaned.items()}, index=df.index)
+    failed = {rule: mask.to_numpy() for rule, mask in failures.items() if mask.any()}
+    if not failed:
+        return cleaned, pd.DataFrame(index=df.index[:0])
+
+    masks = pd.DataFrame(failed, index=df.index)
+    masks.columns = pd.MultiIndex.from_tuples(masks.columns, names=['column', 'rule'])
+    return cleaned, masks[masks.any(axis=1).to_numpy()]
+
+
+def rejection_counts(failures: pd.DataFrame) -> Dict[Tuple[str, str], int]:
+    """Count failing rows per (column, rule)
+
+    Args:
+        failures: Failure table from validate_frame()
+
+    Returns:
+        Dict[Tuple[str, str], int]: Rows failing each rule
+    """
+    if failures.empty:
+        return {}
+    return {rule: int(count) for rule, count in failures.sum().items() if count}
+
+
+def describe_rejections(failures: pd.DataFrame) -> str:
+    """Summarize a failure table in one line, e.g. "12 rows: client is required"
+
+    Args:
+        failures: Failure table from validate_frame()
+
+    Returns:
+        str: Summary, or an empty string when nothing failed
+    """
+    counts = rejection_counts(failures)
+    reasons = "; ".join(f"{column} {RULE_DESCRIPTIONS[rule]} ({count})" for (column, rule), count in counts.items())
+    return f"{len(failures)} rows rejected: {reasons}" if counts else ""
\ No newline at end of file
@@ -0,0 +1,90 @@
+import io
+import os
+import logging
+import pandas as pd
+from typing import List, Optional, Tuple, Union
+
+from app.config import Config
+from app.utils.data_helpers import normalize_column_names
+from app.utils.processes import process_pool
+
+logger = logging.getLogger(__name__)
+
+# Column added to merged workbooks to record where each row came from
+SOURCE_SHEET_COLUMN = "source_sheet"
+
+WorkbookSource = Union[str, bytes]
+
+
+def _open(source: WorkbookSource):
+    """Get something pandas/openpyxl can read from a path or raw bytes"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def list_sheets(source: WorkbookSource) -> List[str]:
+    """List the worksheet names of an .xlsx workbook
+
+    Args:
+        source: Workbook path or file contents
+
+    Returns:
+        List[str]: Sheet names in workbook order
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(_open(source), read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _parse_sheet(task: Tuple[WorkbookSource, str]) -> pd.DataFrame:
+    """Parse one sheet and normalize its headers (runs in a worker process)
+
+    Args:
+        task: Tuple of the workbook source and the sheet name
+
+    Returns:
+        pd.DataFrame: Sheet rows with normalized column names and the sheet name
+    """
+    source, sheet = task
+    df = pd.read_excel(_open(source), sheet_name=sheet, engine="openpyxl")
+    df = normalize_column_names(df.dropna(how="all"))
+    df[SOURCE_SHEET_COLUMN] = sheet
+    return df
+
+
+def read_workbook(source: WorkbookSource, sheets: Optional[List[str]] = None,
+                  max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Read every sheet of a workbook into one import batch
+
+    Sheets are parsed in a process pool (openpyxl parsing is CPU bound and
+    holds the GIL), each with its headers mapped through
+    normalize_column_names, and concatenated in workbook order.
+
+    Args:
+        source: Workbook path or file contents
+        sheets: Sheets to read (default: all)
+        max_workers: Worker processes (default: Config.APP.WORKBOOK_MAX_WORKERS,
+            or one per CPU)
+
+    Returns:
+        pd.DataFrame: Rows of all sheets with a source_sheet column
+    """
+    sheets = sheets if sheets is not None else list_sheets(source)
+    if not sheets:
+        return pd.DataFrame()
+
+    max_workers = max_workers or Config.APP.WORKBOOK_MAX_WORKERS or os.cpu_count() or 1
+    workers = min(max_workers, len(sheets))
+    tasks = [(source, sheet) for sheet in sheets]
+
+    if workers <= 1:
+        frames = [_parse_sheet(task) for task in tasks]
+    else:
+        logger.info(f"Parsing {len(sheets)} sheets with {workers} processes")
+        with process_pool(workers) as executor:
+            frames = list(executor.map(_parse_sheet, tasks))
+
+    return pd.concat(frames, ignore_index=True, sort=False)
\ No newline at end of file
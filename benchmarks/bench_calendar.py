@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.schedule import build_calendar, normalize_frequency, parse_migration_dates, schedule_dates
+
+
+def synthetic_records(records: int) -> pd.DataFrame:
+    """Build Shariah records with mixed frequencies, sources and migration plans"""
+    rng = np.random.default_rng(0)
+    months = np.array(["January", "February", "March", "June", "September"])
+    return pd.DataFrame({
+        'record_id': np.arange(1, records + 1),
+        'frequency': rng.choice(["Daily", "Weekly", "Monthly", "Quarterly", "Semi-Annual", "Annually"], records),
+        'current_source': rng.choice(["FactSet", "Reuters", "Factset"], records),
+        'after_migration': rng.choice(["FactSet", "Reuters", ""], records),
+        'migration_plan': np.char.add("1st of ", rng.choice(months, records)),
+        'universe_count': rng.integers(100, 40_000, records)
+    })
+
+
+def loop_calendar(records: pd.DataFrame, start: np.datetime64, end: np.datetime64) -> int:
+    """Previous approach: expand the records one by one"""
+    frequency = normalize_frequency(records['frequency'])
+    migration = parse_migration_dates(records['migration_plan'], start)
+    rows = []
+    for position, (_, record) in enumerate(records.iterrows()):
+        if frequency.iloc[position] is None:
+            continue
+        for date in schedule_dates(frequency.iloc[position], start, end):
+            migrated = date >= migration[position] and record['after_migration'] != ''
+            rows.append((record['record_id'], date, record['current_source'],
+                         record['after_migration'] if migrated else record['current_source'],
+                         record['universe_count']))
+    return len(rows)
+
+
+def measure(run: Callable[[], int]) -> Dict[str, Any]:
+    """Time one run"""
+    start = time.perf_counter()
+    deliveries = run()
+    return {"seconds": time.perf_counter() - start, "deliveries": deliveries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-record and vectorized delivery calendar expansion")
+    parser.add_argument("--records", type=int, default=2_000, help="Number of Shariah records")
+    parser.add_argument("--days", type=int, default=365, help="Horizon in days")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records)
+    start = np.datetime64('today', 'D')
+    end = start + args.days
+
+    cases = (
+        ("per-record loop", lambda: loop_calendar(records, start, end)),
+        ("build_calendar (repeat/tile per frequency)", lambda: len(build_calendar(records, start, end)))
+    )
+    rows = [{"case": name, "records": args.records, **measure(run)} for name, run in cases]
+
+    report = pd.DataFrame(rows)
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.carbon import issuer_arrays, portfolio_metrics
+
+
+def synthetic_data(portfolios: int, holdings: int, issuers: int):
+    """Build issuer emissions and holdings spread over portfolios, about 10% unmatched
+
+    Returns:
+        Tuple of the issuers frame and the portfolio keys, identifiers and
+        market values of the holdings
+    """
+    rng = np.random.default_rng(0)
+    identifiers = np.char.add("ISS", np.arange(issuers).astype(str))
+    emissions = pd.DataFrame({
+        'identifier': identifiers,
+        'scope1_emissions': rng.lognormal(10, 2, issuers),
+        'scope2_emissions': rng.lognormal(8, 2, issuers),
+        'revenue': rng.lognormal(20, 2, issuers),
+        'evic': rng.lognormal(22, 2, issuers)
+    })
+    keys = rng.integers(0, portfolios, holdings)
+    held = np.char.add("ISS", rng.integers(0, int(issuers * 1.1), holdings).astype(str))
+    values = rng.lognormal(13, 2, holdings)
+    return emissions, keys, held, values
+
+
+def pandas_metrics(emissions: pd.DataFrame, keys: np.ndarray, identifiers: np.ndarray, values: np.ndarray) -> int:
+    """Previous approach: merge the frames and aggregate with groupby().apply()"""
+    issuers = emissions.assign(emissions=emissions['scope1_emissions'] + emissions['scope2_emissions'])
+    merged = pd.DataFrame({'portfolio': keys, 'identifier': identifiers, 'market_value': values}).merge(
+        issuers[['identifier', 'emissions', 'revenue', 'evic']], on='identifier', how='left')
+
+    def metrics(group: pd.DataFrame) -> pd.Series:
+        attributed = group.dropna(subset=['emissions', 'evic'])
+        intensity = group.dropna(subset=['emissions', 'revenue'])
+        weights = intensity['market_value'] / intensity['market_value'].sum()
+        return pd.Series({
+            'financed_emissions': (attributed['market_value'] / attributed['evic'] * attributed['emissions']).sum(),
+            'waci': (weights * intensity['emissions'] / intensity['revenue'] * 1e6).sum()
+        })
+
+    return len(merged.groupby('portfolio').apply(metrics))
+
+
+def measure(run: Callable[[], int]) -> Dict[str, Any]:
+    """Time one run"""
+    start = time.perf_counter()
+    portfolios = run()
+    return {"seconds": time.perf_counter() - start, "portfolios": portfolios}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pandas groupby and sorted-key portfolio carbon metrics")
+    parser.add_argument("--portfolios", type=int, default=500, help="Number of portfolios")
+    parser.add_argument("--holdings", type=int, default=1_000_000, help="Number of holdings over all portfolios")
+    parser.add_argument("--issuers", type=int, default=50_000, help="Number of issuers with emissions")
+    args = parser.parse_args()
+
+    emissions, keys, identifiers, values = synthetic_data(args.portfolios, args.holdings, args.issuers)
+    arrays = issuer_arrays(emissions)
+
+    cases = (
+        ("pandas merge + groupby().apply()", lambda: pandas_metrics(emissions, keys, identifiers, values)),
+        ("issuer_arrays (once per emissions version)", lambda: len(issuer_arrays(emissions)['identifier'])),
+        ("portfolio_metrics (searchsorted + reduceat)",
+         lambda: len(portfolio_metrics(keys, identifiers, values, arrays)))
+    )
+    rows = [{"case": name, "holdings": args.holdings, **measure(run)} for name, run in cases]
+
+    report = pd.DataFrame(rows)
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.config import Config
+from app.database import init_db, get_connection
+from app.models.schema import COMPLIANCE_VALUES, FREQUENCY_VALUES
+from app.repositories.dimensions import dimension_columns, category_counts
+from app.repositories.upsert import append_frame
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def synthetic_rows(rows: int) -> pd.DataFrame:
+    """Build Shariah rows with the repetitive categorical values of real deliveries
+
+    Args:
+        rows: Number of rows
+
+    Returns:
+        pd.DataFrame: Rows with database column names
+    """
+    rng = np.random.default_rng(0)
+    sources = ["FactSet", "Reuters", "FactSet, Reuters", "Bloomberg"]
+    return pd.DataFrame({
+        "client": np.char.add("Client ", rng.integers(0, 5000, rows).astype(str)),
+        "fields": rng.choice(["ISIN, Ticker, Name", "Name, ISIN, Ticker, Sector, Market Cap"], rows),
+        "data_type": rng.choice(["Numeric", "Text", "%, Numeric, Numeric"], rows),
+        "data_source": rng.choice(sources, rows),
+        "sedol_count": rng.integers(0, 30000, rows),
+        "isin_count": rng.integers(0, 30000, rows),
+        "cusip_count": rng.integers(0, 30000, rows),
+        "compliance": rng.choice(COMPLIANCE_VALUES, rows),
+        "frequency": rng.choice(FREQUENCY_VALUES, rows),
+        "current_source": rng.choice(sources, rows),
+        "after_migration": rng.choice(sources, rows),
+        "delivery_name": np.char.add("Delivery ", np.arange(rows).astype(str)),
+        "universe": rng.choice(["Global", "SAUDI", "MENA & US"], rows),
+        "universe_count": rng.integers(0, 40000, rows),
+        "migration_plan": rng.choice(["", "1st of January", "1st of February"], rows)
+    })
+
+
+def text_database(path: str, encoded_path: str):
+    """Copy the rows into the previous layout: the same columns and indexes, text values in every row"""
+    conn = sqlite3.connect(path)
+    conn.execute("ATTACH DATABASE ? AS encoded", (encoded_path,))
+    conn.execute("CREATE TABLE shariah_datafeed AS SELECT * FROM encoded.shariah_datafeed")
+    conn.execute("CREATE UNIQUE INDEX idx_natural_key ON shariah_datafeed (natural_key)")
+    conn.execute("CREATE INDEX idx_client_id ON shariah_datafeed (client_id)")
+    conn.commit()
+    conn.execute("DETACH DATABASE encoded")
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def encoded_database(path: str, df: pd.DataFrame):
+    """Load rows into the store table (enumerated values as lookup keys)"""
+    Config.DATABASE_PATH = path
+    init_db()
+    conn = get_connection()
+    append_frame(conn, Config.DB.SHARIAH_TABLE, df)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def text_breakdowns(path: str) -> None:
+    """Previous summaries: GROUP BY on the text columns"""
+    conn = sqlite3.connect(path)
+    for col in dimension_columns(Config.DB.SHARIAH_TABLE):
+        conn.execute(f"SELECT {col}, COUNT(*) FROM shariah_datafeed GROUP BY {col}").fetchall()
+    conn.close()
+
+
+def encoded_breakdowns(path: str) -> None:
+    """Current summaries: GROUP BY on the integer keys (category_counts)"""
+    conn = sqlite3.connect(path)
+    for col in dimension_columns(Config.DB.SHARIAH_TABLE):
+        category_counts(conn, Config.DB.SHARIAH_TABLE, col)
+    conn.close()
+
+
+def measure(breakdowns: Callable[[str], None], path: str, repeat: int) -> Dict[str, Any]:
+    """Time the categorical breakdowns (best of repeat runs) and size the file"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        breakdowns(path)
+        timings.append(time.perf_counter() - start)
+    return {"file_mb": os.path.getsize(path) / 1e6, "breakdown_seconds": min(timings)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare text and dictionary-encoded categorical columns")
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of Shariah rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Breakdown runs per layout (best is kept)")
+    args = parser.parse_args()
+
+    df = synthetic_rows(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        text_path = os.path.join(tmp_dir, "text.db")
+        encoded_path = os.path.join(tmp_dir, "encoded.db")
+        encoded_database(encoded_path, df)
+        text_database(text_path, encoded_path)
+
+        report = pd.DataFrame([
+            {"layout": "text columns", **measure(text_breakdowns, text_path, args.repeat)},
+            {"layout": "lookup keys", **measure(encoded_breakdowns, encoded_path, args.repeat)}
+        ])
+
+    pd.set_option("display.width", 120)
+    print(f"{args.rows:,} rows, {len(dimension_columns(Config.DB.SHARIAH_TABLE))} categorical breakdowns")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,138 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.esg_model import ESGData
+
+
+@dataclass
+class LegacyESGData:
+    """Copy of the previous dataclass-based ESGData, kept as the baseline"""
+    client: str
+    fields: str
+    data_type: Optional[str] = None
+    data_source: Optional[str] = None
+    sedol_count: Optional[int] = None
+    isin_count: Optional[int] = None
+    cusip_count: Optional[int] = None
+    compliance: Optional[str] = None
+    id: Optional[int] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LegacyESGData':
+        for field_name in ['sedol_count', 'isin_count', 'cusip_count', 'id']:
+            if field_name in data and data[field_name] is not None:
+                try:
+                    data[field_name] = int(data[field_name])
+                except (ValueError, TypeError):
+                    data[field_name] = None
+        return cls(
+            id=data.get('id'),
+            client=data.get('client', ''),
+            fields=data.get('fields', ''),
+            data_type=data.get('data_type'),
+            data_source=data.get('data_source'),
+            sedol_count=data.get('sedol_count'),
+            isin_count=data.get('isin_count'),
+            cusip_count=data.get('cusip_count'),
+            compliance=data.get('compliance'),
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at')
+        )
+
+
+def synthetic_frame(rows: int) -> pd.DataFrame:
+    """Build an ESG-shaped DataFrame as produced by an upload
+
+    Args:
+        rows: Number of rows
+
+    Returns:
+        pd.DataFrame: Synthetic ESG records
+    """
+    idx = np.arange(rows)
+    counts = np.where(idx % 7 == 0, np.nan, 30000.0)
+    return pd.DataFrame({
+        'id': idx + 1,
+        'client': [f"Client {i % 5000}" for i in range(rows)],
+        'fields': "NPIN, Carbonfoot print, Metric Intensity",
+        'data_type': "%, Numeric, Numeric",
+        'data_source': np.array(["FactSet", "Reuters", "FactSet, Reuters"])[idx % 3],
+        'sedol_count': counts,
+        'isin_count': 30000,
+        'cusip_count': 0,
+        'compliance': np.array(["Pass", "Fail", "Yes", "No"])[idx % 4]
+    })
+
+
+def measure(build: Callable[[List[Dict[str, Any]]], List[Any]], df: pd.DataFrame) -> Dict[str, float]:
+    """Time a build and measure the memory retained by its result
+
+    Records are rebuilt for each run (outside the timing) since the legacy
+    converter mutates its input.
+
+    Args:
+        build: Callable returning the built models from a list of records
+        df: Source frame
+
+    Returns:
+        Dict[str, float]: Seconds and retained MB
+    """
+    records = df.to_dict('records')
+    gc.collect()
+    start = time.perf_counter()
+    models = build(records)
+    seconds = time.perf_counter() - start
+    del models
+
+    records = df.to_dict('records')
+    gc.collect()
+    tracemalloc.start()
+    models = build(records)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models, records
+    return {"seconds": seconds, "retained_mb": retained / 1024 / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model construction against the previous dataclass models")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of models to build")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+
+    cases = {
+        "legacy dataclass from_dict": lambda records: [LegacyESGData.from_dict(r) for r in records],
+        "slotted from_dict": lambda records: [ESGData.from_dict(r) for r in records],
+        "slotted from_records": lambda records: ESGData.from_records(records),
+        "slotted from_frame": lambda records: ESGData.from_frame(df)
+    }
+
+    rows = []
+    for name, build in cases.items():
+        result = measure(build, df)
+        rows.append({"case": name, "rows": args.rows, **result})
+
+    report = pd.DataFrame(rows)
+    report["bytes_per_model"] = report["retained_mb"] * 1024 * 1024 / args.rows
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.data_helpers import client_key
+from app.utils.typeahead import PrefixIndex
+
+
+def synthetic_names(clients: int) -> List[str]:
+    """Build client names from random words"""
+    rng = np.random.default_rng(0)
+    words = np.array(["Al", "Capital", "Bank", "Asset", "Global", "Rajhi", "Invest", "Gulf", "Trust", "Partners",
+                      "Saudi", "Emirates", "Islamic", "Fund", "Holdings", "Securities", "Alpha", "Noor", "Amana"])
+    picks = rng.integers(0, len(words), (clients, 3))
+    return [f"{' '.join(words[row])} {number}" for number, row in enumerate(picks)]
+
+
+def sql_lookup(conn: sqlite3.Connection, prefix: str, limit: int) -> List[str]:
+    """Previous approach: case-insensitive LIKE over the names"""
+    rows = conn.execute("SELECT name FROM clients WHERE name LIKE ? ORDER BY name LIMIT ?", (f"{prefix}%", limit))
+    return [row[0] for row in rows]
+
+
+def key_range_lookup(conn: sqlite3.Connection, prefix: str, limit: int) -> List[str]:
+    """Range scan of the indexed name keys"""
+    key = client_key(prefix)
+    rows = conn.execute("SELECT name FROM clients WHERE name_key >= ? AND name_key < ? || char(1114111) LIMIT ?",
+                        (key, key, limit))
+    return [row[0] for row in rows]
+
+
+def measure(lookup: Callable[[str], List[str]], prefixes: List[str]) -> Dict[str, Any]:
+    """Time the lookups of the prefixes"""
+    start = time.perf_counter()
+    found = sum(len(lookup(prefix)) for prefix in prefixes)
+    seconds = time.perf_counter() - start
+    return {"ms_per_lookup": seconds / len(prefixes) * 1000, "suggestions": found}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQL and in-memory prefix lookups of client names")
+    parser.add_argument("--clients", type=int, default=100_000, help="Number of client names")
+    parser.add_argument("--lookups", type=int, default=1_000, help="Number of prefixes looked up")
+    parser.add_argument("--limit", type=int, default=10, help="Suggestions per lookup")
+    args = parser.parse_args()
+
+    names = synthetic_names(args.clients)
+    rng = np.random.default_rng(1)
+    prefixes = [names[i][:length] for i, length in zip(rng.integers(0, len(names), args.lookups),
+                                                        rng.integers(1, 12, args.lookups))]
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE clients (id INTEGER PRIMARY KEY, name TEXT, name_key TEXT)")
+    conn.executemany("INSERT INTO clients (name, name_key) VALUES (?, ?)",
+                     ((name, client_key(name)) for name in names))
+    conn.execute("CREATE INDEX idx_clients_key ON clients (name_key)")
+
+    # Keys are stored normalized, so building the index is a sort
+    entries = [(client_key(name), name) for name in names]
+    start = time.perf_counter()
+    index = PrefixIndex(entries)
+    build_seconds = time.perf_counter() - start
+
+    rows = [
+        {"case": "SQL LIKE", **measure(lambda prefix: sql_lookup(conn, prefix, args.limit), prefixes)},
+        {"case": "SQL key range (indexed)", **measure(lambda prefix: key_range_lookup(conn, prefix, args.limit), prefixes)},
+        {"case": "PrefixIndex (bisect)",
+         **measure(lambda prefix: index.search(client_key(prefix), args.limit), prefixes)}
+    ]
+
+    report = pd.DataFrame(rows)
+    pd.set_option("display.width", 120)
+    print(f"{args.clients:,} clients, PrefixIndex built in {build_seconds:.3f}s")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.models.esg_model import ESGData
+from app.models.schema import ESG_COLUMNS, ESG_REQUIRED, ESG_ALLOWED_VALUES, COMPLIANCE_VALUES
+from app.utils.data_helpers import clean_numeric_value
+from app.utils.validation import validate_frame, rejection_counts
+
+COUNT_COLUMNS = ('sedol_count', 'isin_count', 'cusip_count')
+
+
+def synthetic_upload(rows: int) -> pd.DataFrame:
+    """Build an ESG upload as read from a spreadsheet, with some dirty values
+
+    Counts are text with thousands separators, placeholders and the odd
+    typo; a few rows miss a client or carry an unknown compliance value.
+
+    Args:
+        rows: Number of rows
+
+    Returns:
+        pd.DataFrame: Raw upload
+    """
+    rng = np.random.default_rng(0)
+    counts = lambda: np.where(rng.random(rows) < 0.02, rng.choice(["N/A", "-", "12O"], rows),
+                              np.char.add(rng.integers(0, 99, rows).astype(str), ",000"))
+    return pd.DataFrame({
+        "client": np.where(rng.random(rows) < 0.01, "", np.char.add("Client ", rng.integers(0, 5000, rows).astype(str))),
+        "fields": rng.choice(["NPIN", "NPIN, Carbon footprint", "E, S, G"], rows),
+        "data_type": rng.choice(["Numeric", "Text", "%"], rows),
+        "data_source": rng.choice(["FactSet", "Reuters", "MSCI"], rows),
+        "sedol_count": counts(),
+        "isin_count": counts(),
+        "cusip_count": counts(),
+        "compliance": rng.choice(list(COMPLIANCE_VALUES[:4]) + ["pass", "Unclear"], rows)
+    }).astype(object)
+
+
+def scalar_validation(df: pd.DataFrame) -> int:
+    """Previous approach: one regex per count and one model per row
+
+    Returns:
+        int: Rows rejected
+    """
+    allowed = {value.lower() for value in COMPLIANCE_VALUES}
+    rejected = 0
+    for record in df.to_dict('records'):
+        for col in COUNT_COLUMNS:
+            record[col] = clean_numeric_value(record[col])
+        compliance = record.get('compliance')
+        if not ESGData.from_dict(record).is_valid() or (compliance and compliance.lower() not in allowed):
+            rejected += 1
+    return rejected
+
+
+def columnar_validation(df: pd.DataFrame) -> int:
+    """Vectorized validation module
+
+    Returns:
+        int: Rows rejected
+    """
+    _, failures = validate_frame(df, ESG_COLUMNS, ESG_REQUIRED, ESG_ALLOWED_VALUES)
+    rejection_counts(failures)
+    return len(failures)
+
+
+def measure(validate: Callable[[pd.DataFrame], int], df: pd.DataFrame) -> Dict[str, Any]:
+    """Time one validation run"""
+    start = time.perf_counter()
+    rejected = validate(df)
+    return {"seconds": time.perf_counter() - start, "rejected": rejected}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scalar and columnar validation of an upload")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of uploaded rows")
+    args = parser.parse_args()
+
+    df = synthetic_upload(args.rows)
+
+    rows = []
+    for name, validate in (("scalar (regex per value)", scalar_validation),
+                           ("columnar (validate_frame)", columnar_validation)):
+        rows.append({"case": name, "rows": args.rows, **measure(validate, df)})
+
+    report = pd.DataFrame(rows)
+    report["rows_per_second"] = args.rows / report["seconds"]
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.utils.workbook import read_workbook
+
+
+def synthetic_workbook(sheets: int, rows: int) -> bytes:
+    """Build an .xlsx workbook with one ESG-shaped sheet per region
+
+    Args:
+        sheets: Number of sheets
+        rows: Rows per sheet
+
+    Returns:
+        bytes: Workbook contents
+    """
+    rng = np.random.default_rng(0)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for i in range(sheets):
+            pd.DataFrame({
+                "Client": [f"Client {n}" for n in rng.integers(0, 500, rows)],
+                "Fields": [f"Field {n}" for n in rng.integers(0, 50, rows)],
+                "Data Type": rng.choice(["Numeric", "Text", "Boolean"], rows),
+                "Data Source": rng.choice(["MSCI", "Sustainalytics", "ISS"], rows),
+                "SEDOL Count": rng.integers(0, 10_000, rows),
+                "ISIN Count": rng.integers(0, 10_000, rows),
+                "CUSIP Count": rng.integers(0, 10_000, rows),
+                "Compliance": rng.choice(["Compliant", "Non-Compliant", "Pending"], rows)
+            }).to_excel(writer, sheet_name=f"Region {i + 1}", index=False)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and process-pool parsing of a multi-sheet workbook")
+    parser.add_argument("--sheets", type=int, default=8, help="Number of sheets")
+    parser.add_argument("--rows", type=int, default=20_000, help="Rows per sheet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for the parallel run")
+    args = parser.parse_args()
+
+    data = synthetic_workbook(args.sheets, args.rows)
+
+    rows = []
+    for name, workers in (("sequential", 1), ("process pool", args.workers)):
+        start = time.perf_counter()
+        df = read_workbook(data, max_workers=workers)
+        rows.append({"case": name, "workers": workers, "rows": len(df), "seconds": time.perf_counter() - start})
+
+    report = pd.DataFrame(rows)
+    report["speedup"] = report["seconds"].iloc[0] / report["seconds"]
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.config import Config
+from app.database import init_db
+from app.repositories.esg_repository import ESGRepository
+from app.repositories.shariah_repository import ShariahRepository
+from app.utils.dtypes import memory_usage
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def populate_synthetic(db_path: str, rows: int):
+    """Fill a scratch database with synthetic ESG and Shariah rows
+
+    Args:
+        db_path: Path of the scratch database
+        rows: Number of rows per table
+    """
+    sources = ["FactSet", "Reuters", "FactSet, Reuters"]
+    compliance = ["Pass", "Fail", "Yes", "No"]
+    frequencies = ["Daily", "Weekly", "Monthly", "Quarterly"]
+
+    conn = sqlite3.connect(db_path)
+    conn.executemany(f"""
+        INSERT INTO {Config.DB.ESG_TABLE} (client, fields, data_type, data_source,
+            sedol_count, isin_count, cusip_count, compliance)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        (f"Client {i % 5000}", "NPIN, Carbonfoot print, Metric Intensity", "%, Numeric, Numeric",
+         sources[i % 3], None if i % 7 == 0 else 30000, 30000, 0, compliance[i % 4])
+        for i in range(rows)
+    ))
+    conn.executemany(f"""
+        INSERT INTO {Config.DB.SHARIAH_TABLE} (client, current_source, after_migration, delivery_name,
+            fields, universe, universe_count, frequency, migration_plan, sedol_count, isin_count, cusip_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        (f"Client {i % 5000}", "Reuters", "Factset" if i % 2 else None, f"Delivery {i}",
+         "ISIN, Ticker, Name", "Global", 23000, frequencies[i % 4], None, None if i % 5 == 0 else 10, 10, 10)
+        for i in range(rows)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def build_report(db_path: str) -> pd.DataFrame:
+    """Compare per-session frame memory before and after the dtype policy
+
+    "Before" mirrors the previous load path: pd.read_sql object frames plus
+    the full copy show_filter_sidebar made of each displayed frame.
+
+    Args:
+        db_path: Database to load from
+
+    Returns:
+        pd.DataFrame: One row per dataset plus a per-session total
+    """
+    conn = sqlite3.connect(db_path)
+    legacy = {
+        "esg": pd.read_sql(f"SELECT * FROM {Config.DB.ESG_TABLE}", conn),
+        "shariah": pd.read_sql(f"SELECT * FROM {Config.DB.SHARIAH_TABLE}", conn)
+    }
+    conn.close()
+
+    typed = {
+        "esg": ESGRepository(db_path).get_all(),
+        "shariah": ShariahRepository(db_path).get_all()
+    }
+
+    rows = []
+    for name in legacy:
+        before = memory_usage(legacy[name]) * 2  # loaded frame + filter sidebar copy
+        after = memory_usage(typed[name])
+        rows.append({"dataset": name, "rows": len(typed[name]), "bytes_before": before, "bytes_after": after})
+
+    report = pd.DataFrame(rows)
+    total = {"dataset": "per session", "rows": report["rows"].sum(),
+             "bytes_before": report["bytes_before"].sum(), "bytes_after": report["bytes_after"].sum()}
+    report = pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+    report["saving_pct"] = (1 - report["bytes_after"] / report["bytes_before"].where(report["bytes_before"] > 0)) * 100
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-session DataFrame memory before/after the dtype policy")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Measure a scratch database with this many synthetic rows per table")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "memory_report.db")
+            Config.DATABASE_PATH = db_path
+            init_db()
+            populate_synthetic(db_path, args.synthetic)
+            report = build_report(db_path)
+    else:
+        report = build_report(Config.DATABASE_PATH)
+
+    pd.set_option("display.width", 120)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
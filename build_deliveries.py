@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+def main():
+    """
+    Build the delivery file of each Shariah client delivery whose inputs changed
+    """
+    parser = argparse.ArgumentParser(description="Build per-client Shariah delivery files")
+    parser.add_argument("--dir", help="Output folder (default: DELIVERY_DIR, data/deliveries)")
+    parser.add_argument("--format", choices=["csv", "xlsx"], help="File format (default: DELIVERY_FORMAT, csv)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: DELIVERY_MAX_WORKERS, one per CPU)")
+    parser.add_argument("--record", type=int, action="append", help="Only build this record's delivery (repeatable)")
+    parser.add_argument("--force", action="store_true", help="Rebuild deliveries whose inputs did not change")
+    args = parser.parse_args()
+    
+    # init_app() sets up logging and the database
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import init_app
+    init_app()
+    from app.services.delivery_builder import DeliveryBuilder
+    
+    builder = DeliveryBuilder(output_dir=args.dir, file_format=args.format, max_workers=args.workers)
+    manifest = builder.build(record_ids=args.record, force=args.force)
+    for delivery in manifest["deliveries"]:
+        detail = delivery.get("error") or (f"{delivery['rows']} rows" if delivery.get("rows") is not None else "")
+        print(f"{delivery['status']:>8}  #{delivery['record_id']} {delivery['client']} · {delivery['delivery_name']}  {detail}")
+    print(f"\nRun {manifest['run_id']}: {manifest['built']} built, {manifest['skipped']} unchanged, "
+          f"{manifest['failed']} failed in {manifest['seconds']:.2f}s")
+    sys.exit(1 if manifest["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+def main():
+    """
+    Run the drop-folder ingestion daemon (no Streamlit UI needed)
+    """
+    parser = argparse.ArgumentParser(description="Import ESG and Shariah files dropped into a watched folder")
+    parser.add_argument("--dir", help="Drop folder (default: INGEST_DIR, data/inbox)")
+    parser.add_argument("--mode", choices=["append", "upsert", "replace"], help="Import mode (default: INGEST_MODE, upsert)")
+    parser.add_argument("--workers", type=int, help="Worker threads (default: INGEST_WORKERS, 2)")
+    parser.add_argument("--interval", type=float, help="Seconds between scans (default: INGEST_POLL_SECONDS, 10)")
+    parser.add_argument("--once", action="store_true", help="Ingest the pending files and exit")
+    args = parser.parse_args()
+    
+    # init_app() sets up logging and the database
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import init_app
+    init_app()
+    from app.services.ingestion import DropFolderIngestor
+    
+    ingestor = DropFolderIngestor(root=args.dir, mode=args.mode, workers=args.workers)
+    if args.once:
+        outcomes = ingestor.run_once()
+        sys.exit(1 if outcomes["failed"] else 0)
+    ingestor.watch(args.interval)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nIngestion stopped.")
\ No newline at end of file
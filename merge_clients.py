@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+
+def main():
+    """
+    Find client names that are variants of one client and merge them
+    """
+    parser = argparse.ArgumentParser(description="Merge clients whose names are spelling variants of each other")
+    parser.add_argument("--threshold", type=float, help="Minimum name similarity, 0-1 (default: CLIENT_MATCH_THRESHOLD, 0.85)")
+    parser.add_argument("--apply", action="store_true", help="Merge the groups found (default: only list them)")
+    args = parser.parse_args()
+    
+    # init_app() sets up logging and the database (and links existing rows to clients)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app import init_app
+    init_app()
+    from app.database import get_connection
+    from app.repositories.clients import find_duplicate_clients, merge_clients
+    
+    conn = get_connection()
+    try:
+        groups = find_duplicate_clients(conn, args.threshold)
+        if not groups:
+            print("No client name variants found.")
+            return
+        
+        moved = 0
+        for group in groups:
+            keep = group.iloc[0]
+            print(f"{keep['name']} (#{keep['id']}, {keep['records']} records)")
+            for _, variant in group.iloc[1:].iterrows():
+                print(f"    <- {variant['name']} (#{variant['id']}, {variant['records']} records)")
+            if args.apply:
+                moved += merge_clients(conn, int(keep['id']), group['id'].iloc[1:].tolist())
+        
+        if args.apply:
+            conn.commit()
+            print(f"\nMerged {len(groups)} groups ({moved} records moved).")
+        else:
+            print(f"\n{len(groups)} groups found. Run with --apply to merge them.")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -8,13 +8,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Initialize the database with tables and sample data
 from app.database import init_db, init_sample_data
 
-# Initialize database
-init_db()
-init_sample_data()
-
 # Import and run the main application
 from app.main import main
 
-# Execute the main function
+# Execute the main function (not when process pool workers re-run this script)
 if __name__ == "__main__":
+    # Initialize database
+    init_db()
+    init_sample_data()
     main() 
\ No newline at end of file
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# The database and log paths are read when app.config is imported: use
+# throwaway files so test runs leave the tree untouched
+_TMP_DIR = tempfile.mkdtemp(prefix="esg_tests_")
+os.environ["DB_NAME"] = os.path.join(_TMP_DIR, "test.db")
+os.environ["LOG_FILE"] = os.path.join(_TMP_DIR, "app.log")
+
+from app import init_app  # noqa: E402
+
+init_app()
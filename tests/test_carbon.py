@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.carbon import issuer_arrays, normalize_identifiers, portfolio_metrics
+
+
+def test_portfolio_metrics():
+    issuers = issuer_arrays(pd.DataFrame({
+        'identifier': ['Y', 'X', 'Z'],
+        'scope1_emissions': [200, 60, 10],
+        'scope2_emissions': [100, 40, None],
+        'revenue': [1000, 500, 100],
+        'evic': [3000, 1000, 100]
+    }))
+    keys = np.array([2, 1, 1, 1, 1], dtype=np.int64)
+    identifiers = normalize_identifiers(pd.Series(['w', ' x', 'Y', 'z', 'W']))
+    values = np.array([80.0, 100.0, 300.0, 50.0, 50.0])
+
+    metrics = portfolio_metrics(keys, identifiers, values, issuers)
+
+    # Portfolio 1: X (100 tCO2e) and Y (300 tCO2e) are covered; Z has no scope 2, W is not listed
+    one = metrics.loc[1]
+    assert (one['holdings'], one['matched'], one['market_value']) == (4, 3, 500.0)
+    # 100 / 1000 x 100 + 300 / 3000 x 300
+    assert one['financed_emissions'] == pytest.approx(40.0)
+    # 40 tCO2e per 400 invested, per million
+    assert one['carbon_footprint'] == pytest.approx(100_000.0)
+    # (100 x 200,000 + 300 x 300,000) / 400 per million of revenue
+    assert one['waci'] == pytest.approx(275_000.0)
+    assert (one['emissions_coverage'], one['intensity_coverage']) == pytest.approx((0.8, 0.8))
+
+    two = metrics.loc[2]
+    assert (two['holdings'], two['matched'], two['market_value']) == (1, 0, 80.0)
+    assert np.isnan(two['financed_emissions']) and np.isnan(two['waci'])
+    assert two['emissions_coverage'] == 0.0
\ No newline at end of file
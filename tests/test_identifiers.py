@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.identifiers import decode_identifiers, derive_identifiers, encode_identifiers, validate_identifiers
+
+
+def _valid(values, id_type):
+    return validate_identifiers(np.array(values), id_type).tolist()
+
+
+def test_check_digits():
+    assert _valid(['US0378331005', 'GB0002634946', 'US0378331006', 'GB0002634947'], 'isin') == [True, True, False, False]
+    assert _valid(['037833100', '037833101'], 'cusip') == [True, False]
+    assert _valid(['0263494', 'B0YBKJ7', '0263495'], 'sedol') == [True, True, False]
+
+
+def test_derive_identifiers_from_isins():
+    codes, invalid, _ = encode_identifiers(pd.Series(['US0378331005', 'GB0002634946']), 'isin')
+    assert invalid.empty
+    derived = derive_identifiers(codes)
+    assert decode_identifiers(derived['cusip'], 'cusip').tolist() == ['037833100']
+    assert decode_identifiers(derived['sedol'], 'sedol').tolist() == ['0263494']
+
+
+def test_leading_zeros_are_restored():
+    codes, invalid, repaired = encode_identifiers(pd.Series(['37833100', ' 037833100 ', '37833101']), 'cusip')
+    assert decode_identifiers(codes, 'cusip').tolist() == ['037833100']
+    assert invalid.tolist() == ['37833101']
+    assert repaired == 1
\ No newline at end of file
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from app.models.esg_model import ESGData
+from app.models.schema import ESG_COLUMNS
+from app.utils.dtypes import dtypes_for
+
+
+def test_from_dict_treats_na_as_missing():
+    record = ESGData.from_dict({'client': 'a', 'fields': 'b', 'sedol_count': pd.NA, 'isin_count': 3})
+    assert record.sedol_count is None
+    assert record.isin_count == 3
+
+
+def test_from_records_of_typed_frame_has_no_nan():
+    df = pd.DataFrame({
+        'client': ['a', 'b'],
+        'fields': ['x', 'y'],
+        'sedol_count': [1, None],
+        'compliance': ['Yes', None]
+    })
+    df = df.astype({col: dtype for col, dtype in dtypes_for(ESG_COLUMNS).items() if col in df.columns})
+    records = ESGData.from_records(df.to_dict('records'))
+    assert [r.compliance for r in records] == ['Yes', None]
+    assert [r.sedol_count for r in records] == [1, None]
+    assert records[1].to_dict() == {'client': 'b', 'fields': 'y'}
\ No newline at end of file
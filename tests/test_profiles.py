@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from app.database import get_connection
+from app.repositories.client_profiles import load_profile
+from app.utils.profiles import migration_status, MIGRATED, PLANNED, NO_MIGRATION, UNSCHEDULED
+
+
+def test_migration_status_of_yearless_plans():
+    shariah = pd.DataFrame({
+        'current_source': ['Old', 'Old', 'Old', 'Old'],
+        'after_migration': ['New', 'New', 'Old', 'New'],
+        'migration_plan': ['1st of October', 'December 1', '1st of October', 'soon']
+    })
+    status = migration_status(shariah, np.datetime64('2026-10-19'))
+    assert status['migration_status'].tolist() == [MIGRATED, PLANNED, NO_MIGRATION, UNSCHEDULED]
+    assert status['migration_date'].tolist() == ['2026-10-01', '2026-12-01', None, None]
+
+
+def test_profile_built_before_today_is_outdated():
+    conn = get_connection()
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO client_profiles (client_id, profile, stale, built_at)
+            VALUES (-1, '{}', 0, CURRENT_TIMESTAMP), (-2, '{}', 0, datetime('now', '-1 day'))
+        """)
+        assert load_profile(conn, -1) == ({}, False)
+        assert load_profile(conn, -2) == ({}, True)
+    finally:
+        conn.rollback()
+        conn.close()
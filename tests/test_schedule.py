@@ -0,0 +1,11 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.schedule import parse_migration_dates
+
+
+def test_parse_migration_dates():
+    plans = pd.Series(['February 2026', '1st of February', 'Feb 3, 2027', '3 Feb 2027', 'Mayday 5', None])
+    dates = parse_migration_dates(plans, np.datetime64('2026-10-19'))
+    # "February 2026" names no day: not the 20th of February
+    assert dates.astype(str).tolist() == ['2026-02-01', '2026-02-01', '2027-02-03', '2027-02-03', 'NaT', 'NaT']
\ No newline at end of file
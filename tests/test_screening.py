@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.screening import FAIL, NO_DATA, PASS, screen_financials
+
+
+def test_screen_financials():
+    df = pd.DataFrame({
+        'identifier': [' A ', 'B', 'C', 'D', 'E'],
+        'market_cap': [100, 100, 0, 200, '1,000'],
+        'total_debt': [20, 40, 10, 20, 500],
+        'cash': [10, 10, 10, 20, 0],
+        'interest_income': [1, 0, 1, 0, 0],
+        'non_compliant_revenue': [1, 0, 0, 0, None],
+        'total_revenue': [100, 50, 100, 0, None]
+    })
+    result = screen_financials(df, debt_limit=0.33, cash_limit=0.33, income_limit=0.05)
+
+    assert result['identifier'].tolist() == ['A', 'B', 'C', 'D', 'E']
+    np.testing.assert_allclose(result['debt_ratio'], [0.2, 0.4, np.nan, 0.1, 0.5])
+    np.testing.assert_allclose(result['cash_ratio'], [0.1, 0.1, np.nan, 0.1, 0.0])
+    # D has no revenue and no impermissible income: nothing to purify
+    np.testing.assert_allclose(result['income_ratio'], [0.02, 0.0, 0.01, 0.0, np.nan])
+    np.testing.assert_allclose(result['purification_ratio'], [0.02, 0.0, 0.01, 0.0, np.nan])
+    assert result['debt_pass'].tolist() == [True, False, pd.NA, True, False]
+    # A failed screen decides the status even when another ratio is unknown
+    assert result['status'].tolist() == [PASS, FAIL, NO_DATA, PASS, FAIL]
\ No newline at end of file
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from app.config import Config
+from app.database import get_connection
+from app.repositories.dimensions import store_table
+from app.repositories.upsert import ensure_upsert_schema, upsert_frame
+from app.services.client_service import ClientService
+
+TABLE = Config.DB.ESG_TABLE
+
+
+def _rows(clients):
+    return pd.DataFrame({
+        'client': clients,
+        'data_source': 'MSCI',
+        'data_type': 'ESG Ratings',
+        'fields': [f"field {i}" for i in range(len(clients))],
+        'isin_count': range(1, len(clients) + 1)
+    })
+
+
+@pytest.fixture
+def conn():
+    conn = get_connection()
+    conn.execute(f"DELETE FROM {TABLE}")
+    conn.execute("DELETE FROM client_profiles")
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_upsert_counts_ignore_profile_trigger_writes(conn):
+    first = _rows(['Alpha', 'Beta', 'Gamma'])
+    counts = upsert_frame(conn, TABLE, first)
+    conn.commit()
+    assert (counts['inserted'], counts['updated'], counts['unchanged']) == (3, 0, 0)
+
+    # Stored profiles make every write to the clients' records fire a trigger
+    client_ids = [row[0] for row in conn.execute(f"SELECT DISTINCT client_id FROM {TABLE}")]
+    for client_id in client_ids:
+        assert ClientService().get_profile(client_id) is not None
+    assert conn.execute("SELECT COUNT(*) FROM client_profiles").fetchone()[0] == 3
+
+    second = pd.concat([first, _rows(['Alpha', 'Delta']).assign(fields=['new a', 'new d'])], ignore_index=True)
+    counts = upsert_frame(conn, TABLE, second)
+    conn.commit()
+    assert (counts['inserted'], counts['updated'], counts['unchanged']) == (2, 0, 3)
+
+
+def test_upsert_counts_updates_with_profiles(conn):
+    upsert_frame(conn, TABLE, _rows(['Alpha', 'Beta']))
+    conn.commit()
+    for (client_id,) in conn.execute(f"SELECT DISTINCT client_id FROM {TABLE}").fetchall():
+        ClientService().get_profile(client_id)
+
+    counts = upsert_frame(conn, TABLE, _rows(['Alpha', 'Beta']).assign(isin_count=[5, 2]))
+    conn.commit()
+    assert (counts['inserted'], counts['updated'], counts['unchanged']) == (0, 1, 1)
+    assert conn.execute("SELECT COUNT(*) FROM client_profiles WHERE stale = 1").fetchone()[0] == 1
+
+
+
+def test_legacy_table_gets_timestamps():
+    legacy = sqlite3.connect(":memory:")
+    store = store_table(TABLE)
+    legacy.execute(f"CREATE TABLE {store} (id INTEGER PRIMARY KEY AUTOINCREMENT, client TEXT NOT NULL, fields TEXT NOT NULL)")
+    legacy.execute(f"INSERT INTO {store} (client, fields) VALUES ('Alpha', 'a')")
+
+    ensure_upsert_schema(legacy, TABLE)
+    legacy.execute(f"INSERT INTO {store} (client, fields) VALUES ('Beta', 'b')")
+    stamps = legacy.execute(f"SELECT created_at, updated_at FROM {store}").fetchall()
+    assert len(stamps) == 2 and all(value is not None for row in stamps for value in row)